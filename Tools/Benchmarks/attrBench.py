@@ -0,0 +1,131 @@
+# coding=ascii
+
+"""
+!@Brief Benchmark of attr numeric getter.
+        Compare legacy MScriptUtil pointer read, one child plug read per component
+        and attr one call api 2.0 read on float3 / double3 / double4 plugs.
+
+        Run in mayapy:
+            mayapy -m isartdigital.Tools.Benchmarks.attrBench
+"""
+
+# ===========================================
+#    Import Modules
+# ===========================================
+
+import timeit
+
+from maya import cmds, OpenMaya
+
+from isartdigital.Tools.Core import apiUtils, attr
+
+
+# ===========================================
+#    Func
+# ===========================================
+
+def _legacy_read(mp_attr):
+
+    """
+    !@Brief Read compound numeric plug like attr did before child plug read.
+            One MScriptUtil and pointer per component.
+
+    @type mp_attr: OpenMaya.MPlug
+    @param mp_attr: Attribute plug object.
+
+    @rtype: tuple
+    @return: Attribute values.
+    """
+
+    i_type = OpenMaya.MFnNumericAttribute(mp_attr.attribute()).unitType()
+    mfn_data = OpenMaya.MFnNumericData(mp_attr.asMObject())
+
+    if i_type == OpenMaya.MFnNumericData.k3Float:
+        a_msu = [OpenMaya.MScriptUtil() for _ in range(3)]
+        a_ptr = [msu.asFloatPtr() for msu in a_msu]
+        mfn_data.getData3Float(*a_ptr)
+        return tuple(OpenMaya.MScriptUtil.getFloat(ptr) for ptr in a_ptr)
+
+    a_msu = [OpenMaya.MScriptUtil() for _ in range(4 if i_type == OpenMaya.MFnNumericData.k4Double else 3)]
+    a_ptr = [msu.asDoublePtr() for msu in a_msu]
+    if i_type == OpenMaya.MFnNumericData.k4Double:
+        mfn_data.getData4Double(*a_ptr)
+    else:
+        mfn_data.getData3Double(*a_ptr)
+
+    return tuple(OpenMaya.MScriptUtil.getDouble(ptr) for ptr in a_ptr)
+
+
+def _child_read(mp_attr):
+
+    """
+    !@Brief Read compound numeric plug with one child plug read per component.
+
+    @type mp_attr: OpenMaya.MPlug
+    @param mp_attr: Attribute plug object.
+
+    @rtype: tuple
+    @return: Attribute values.
+    """
+
+    return tuple(mp_attr.child(i).asDouble() for i in range(mp_attr.numChildren()))
+
+
+def _build_plugs():
+
+    """
+    !@Brief Create node with float3 / double3 / double4 attributes.
+
+    @rtype: dict
+    @return: Plug by type name.
+    """
+
+    s_node = cmds.createNode("transform", name="ATTR_BENCH", skipSelect=True)
+    mo_node = apiUtils.get_object(s_node)
+
+    d_plugs = dict()
+    for s_type, i_type in [
+            ("float3", OpenMaya.MFnNumericData.k3Float),
+            ("double3", OpenMaya.MFnNumericData.k3Double),
+            ("double4", OpenMaya.MFnNumericData.k4Double)]:
+        mo_attr = OpenMaya.MFnNumericAttribute().create("bench_{0}".format(s_type), "b{0}".format(s_type), i_type)
+        OpenMaya.MFnDependencyNode(mo_node).addAttribute(mo_attr)
+        d_plugs[s_type] = OpenMaya.MPlug(mo_node, mo_attr)
+
+    return d_plugs
+
+
+def run(i_iterations=10000):
+
+    """
+    !@Brief Run benchmark and print per read cost.
+
+    @type i_iterations: int
+    @param i_iterations: Number of reads per plug.
+
+    @rtype: dict
+    @return: (legacy, child, attr) cost in micro second by type name.
+    """
+
+    d_plugs = _build_plugs()
+
+    d_results = dict()
+    for s_type in sorted(d_plugs):
+        mp_attr = d_plugs[s_type]
+        #   First read resolve descriptor and api 2.0 plug, keep it out of timing.
+        attr.get(mp_attr)
+        f_legacy = timeit.timeit(lambda: _legacy_read(mp_attr), number=i_iterations)
+        f_child = timeit.timeit(lambda: _child_read(mp_attr), number=i_iterations)
+        f_attr = timeit.timeit(lambda: attr.get(mp_attr), number=i_iterations)
+        d_results[s_type] = tuple(f / i_iterations * 1e6 for f in (f_legacy, f_child, f_attr))
+        print ("{0:<8} legacy {1:8.2f} us | child {2:8.2f} us | attr {3:8.2f} us".format(s_type, *d_results[s_type]))
+
+    cmds.delete("ATTR_BENCH")
+
+    return d_results
+
+
+if __name__ == "__main__":
+    from maya import standalone
+    standalone.initialize()
+    run()
@@ -0,0 +1,121 @@
+# coding=ascii
+
+"""
+!@Brief Benchmark of matrix conversions.
+        Compare per matrix conversion (nested mm(i, j) lists, one MScriptUtil call by item)
+        with Tools.Core.matrix batch conversions on 10k matrices.
+
+        Run in mayapy:
+            mayapy -m isartdigital.Tools.Benchmarks.matrixBench
+"""
+
+# ===========================================
+#    Import Modules
+# ===========================================
+
+import time
+
+import numpy
+
+from maya import cmds, OpenMaya
+
+from isartdigital.Tools.Core import apiUtils, matrix
+
+
+# ===========================================
+#    Func
+# ===========================================
+
+def _legacy_to_stack(a_matrices):
+
+    """
+    !@Brief Build stack like matrix did before batch conversions. One nested list by matrix.
+
+    @rtype: numpy.ndarray
+    @return: Matrix stack.
+    """
+
+    a_stack = numpy.empty((len(a_matrices), 4, 4), dtype=numpy.float64)
+    for i, mm in enumerate(a_matrices):
+        a_stack[i] = [[mm(j, k) for k in range(4)] for j in range(4)]
+
+    return a_stack
+
+
+def _legacy_to_mmatrices(a_stack):
+
+    """
+    !@Brief Get MMatrix like matrix did before batch conversions. One ravel / tolist by matrix.
+
+    @rtype: list(OpenMaya.MMatrix)
+    @return: Matrices.
+    """
+
+    return [matrix.to_mmatrix(a_stack[i]) for i in range(len(a_stack))]
+
+
+def _time(function, *args):
+
+    """
+    !@Brief Time one call.
+
+    @rtype: tuple(float, object)
+    @return: Time in seconds and result.
+    """
+
+    f_start = time.time()
+    result = function(*args)
+
+    return time.time() - f_start, result
+
+
+def run(i_matrices=10000):
+
+    """
+    !@Brief Run benchmark and print conversion times.
+
+    @type i_matrices: int
+    @param i_matrices: Number of matrices converted.
+
+    @rtype: dict
+    @return: Times in seconds.
+    """
+
+    a_stack = numpy.random.rand(i_matrices, 4, 4)
+    d_times = dict()
+
+    d_times['legacy to_mmatrix'], a_matrices = _time(_legacy_to_mmatrices, a_stack)
+    d_times['to_mmatrices'], a_matrices = _time(matrix.to_mmatrices, a_stack)
+    d_times['legacy to_stack'], _ = _time(_legacy_to_stack, a_matrices)
+    d_times['to_stack'], a_result = _time(matrix.to_stack, a_matrices)
+    assert numpy.allclose(a_result, a_stack)
+
+    d_times['to_mmatrix_array'], mma_matrices = _time(matrix.to_mmatrix_array, a_stack)
+    d_times['to_stack (MMatrixArray)'], _ = _time(matrix.to_stack, mma_matrices)
+
+    d_times['to_flat'], a_flat = _time(matrix.to_flat, a_stack)
+    d_times['from_flat'], _ = _time(matrix.from_flat, a_flat)
+
+    #   Matrix array plug, like skinCluster.bindPreMatrix
+    cmds.file(new=True, force=True)
+    s_node = cmds.createNode('network')
+    cmds.addAttr(s_node, longName='benchMatrix', dataType='matrix', multi=True)
+    mp_array = apiUtils.get_plug('{0}.benchMatrix'.format(s_node))
+    a_indices = list(range(i_matrices))
+    mdg_mod = OpenMaya.MDGModifier()
+    d_times['queue_plug_array'], _ = _time(matrix.queue_plug_array, mdg_mod, mp_array, a_indices, a_stack)
+    mdg_mod.doIt()
+    d_times['read_plug_array'], (_, a_result) = _time(matrix.read_plug_array, mp_array)
+    assert numpy.allclose(a_result, a_stack)
+
+    print ("{0} matrices".format(i_matrices))
+    for s_name in sorted(d_times):
+        print ("{0:<24} {1:8.3f}s {2:12.0f} matrices/s".format(s_name, d_times[s_name], i_matrices / max(d_times[s_name], 1e-9)))
+
+    return d_times
+
+
+if __name__ == "__main__":
+    from maya import standalone
+    standalone.initialize()
+    run()
@@ -0,0 +1,100 @@
+# coding=ascii
+
+"""
+!@Brief Benchmark of node creation.
+        Compare nodeUtils.create per node with nodeUtils.create_many on joint chains.
+
+        Run in mayapy:
+            mayapy -m isartdigital.Tools.Benchmarks.nodeBench
+"""
+
+# ===========================================
+#    Import Modules
+# ===========================================
+
+import time
+
+from maya import cmds, OpenMaya
+
+from isartdigital.Tools.Core import nodeUtils
+
+
+# ===========================================
+#    Func
+# ===========================================
+
+def _specs(i_nodes, i_chains=10):
+
+    """
+    !@Brief Build specs of i_chains joint chains.
+
+    @rtype: list(tuple)
+    @return: (type, name, parent index) specs.
+    """
+
+    a_specs = list()
+    i_per_chain = max(1, i_nodes // i_chains)
+    for i in range(i_chains):
+        for j in range(i_per_chain):
+            a_specs.append(("joint", "chain{0}_joint{1}".format(i, j), len(a_specs) - 1 if j else None))
+
+    return a_specs
+
+
+def _per_node(a_specs, s_namespace):
+
+    """
+    !@Brief Create nodes one by one with nodeUtils.create.
+
+    @rtype: list(OpenMaya.MObject)
+    @return: Nodes created.
+    """
+
+    a_nodes = list()
+    for s_type, s_name, i_parent in a_specs:
+        mo_parent = a_nodes[i_parent] if i_parent is not None else None
+        a_nodes.append(nodeUtils.create(s_type, s_name, mo_parent=mo_parent, s_namespace=s_namespace))
+
+    return a_nodes
+
+
+def run(i_nodes=2000):
+
+    """
+    !@Brief Run benchmark and print creation times.
+
+    @type i_nodes: int
+    @param i_nodes: Number of nodes created.
+
+    @rtype: dict
+    @return: Times in seconds.
+    """
+
+    a_specs = _specs(i_nodes)
+
+    cmds.file(new=True, force=True)
+    f_start = time.time()
+    a_single = _per_node(a_specs, "SINGLE")
+    f_single = time.time() - f_start
+
+    cmds.file(new=True, force=True)
+    f_start = time.time()
+    mdag_mod = OpenMaya.MDagModifier()
+    a_many = nodeUtils.create_many(a_specs, s_namespace="MANY", mdag_mod=mdag_mod)
+    f_many = time.time() - f_start
+
+    f_start = time.time()
+    mdag_mod.undoIt()
+    f_undo = time.time() - f_start
+
+    print ("{0} nodes".format(len(a_specs)))
+    print ("create      {0:8.3f}s ({1} nodes)".format(f_single, len(a_single)))
+    print ("create_many {0:8.3f}s ({1} nodes, undo {2:.3f}s)".format(f_many, len(a_many), f_undo))
+
+    return {"create": f_single, "create_many": f_many, "undo": f_undo}
+
+
+if __name__ == "__main__":
+    from maya import standalone
+    standalone.initialize()
+    run()
@@ -0,0 +1,143 @@
+# coding=ascii
+
+"""
+!@Brief Benchmark of retarget joint matching on synthetic 1000 joints hierarchy.
+        Compare legacy list lookup with SkeletonIndex.
+
+        Run in mayapy:
+            mayapy -m isartdigital.Tools.Benchmarks.retargetBench
+"""
+
+# ===========================================
+#    Import Modules
+# ===========================================
+
+import time
+
+from maya import cmds, OpenMaya
+
+from isartdigital.Tools.Core import apiUtils, nodeUtils
+from isartdigital.Tools.Rig import retarget
+
+
+# ===========================================
+#    Func
+# ===========================================
+
+def _build_skeleton(s_namespace, i_joints, i_branches=10):
+
+    """
+    !@Brief Build synthetic skeleton: i_branches chains under one root.
+
+    @type s_namespace: str
+    @param s_namespace: Skeleton namespace.
+    @type i_joints: int
+    @param i_joints: Number of joints.
+    @type i_branches: int
+    @param i_branches: Number of chains.
+
+    @rtype: OpenMaya.MObject
+    @return: Root joint.
+    """
+
+    if not cmds.namespace(exists=s_namespace):
+        cmds.namespace(add=s_namespace)
+
+    cmds.select(clear=True)
+    s_root = cmds.joint(name="{0}:root".format(s_namespace))
+    i_per_branch = max(1, (i_joints - 1) // i_branches)
+    for i in range(i_branches):
+        cmds.select(s_root)
+        for j in range(i_per_branch):
+            cmds.joint(name="{0}:branch{1}_joint{2}".format(s_namespace, i, j), position=(i, j, 0))
+
+    return apiUtils.get_object(s_root)
+
+
+def _legacy_match(mo_driver, mo_driven):
+
+    """
+    !@Brief Joint matching like retarget.hierarchy did before SkeletonIndex.
+
+    @rtype: list
+    @return: (driver, driven) pairs.
+    """
+
+    moa_driver = apiUtils.get_children(mo_driver, mfn_type=OpenMaya.MFn.kJoint, b_all_descendents=True, b_shape=False)
+    a_src = [nodeUtils.name(moa_driver[i], b_full=False, b_namespace=False) for i in range(moa_driver.length())]
+    moa_driven = apiUtils.get_children(mo_driven, mfn_type=OpenMaya.MFn.kJoint, b_all_descendents=True, b_shape=False)
+
+    a_pairs = list()
+    for i in range(moa_driven.length()):
+        s_short = nodeUtils.name(moa_driven[i], b_full=False, b_namespace=False)
+        if s_short in a_src:
+            a_pairs.append((moa_driver[a_src.index(s_short)], moa_driven[i]))
+
+    return a_pairs
+
+
+def _index_match(driver_index, mo_driven):
+
+    """
+    !@Brief Joint matching with SkeletonIndex.
+
+    @rtype: list
+    @return: (driver, driven) pairs.
+    """
+
+    moa_driven = apiUtils.get_children(mo_driven, mfn_type=OpenMaya.MFn.kJoint, b_all_descendents=True, b_shape=False)
+
+    a_pairs = list()
+    for i in range(moa_driven.length()):
+        mo_source = driver_index.find(OpenMaya.MFnDependencyNode(moa_driven[i]).name())
+        if mo_source is not None:
+            a_pairs.append((mo_source, moa_driven[i]))
+
+    return a_pairs
+
+
+def run(i_joints=1000, i_passes=5):
+
+    """
+    !@Brief Run benchmark and print matching times.
+
+    @type i_joints: int
+    @param i_joints: Number of joints per skeleton.
+    @type i_passes: int
+    @param i_passes: Number of retarget passes on same source skeleton.
+
+    @rtype: dict
+    @return: Legacy and index match time per pass and index build time, in seconds.
+    """
+
+    cmds.file(new=True, force=True)
+    mo_driver = _build_skeleton("SRC", i_joints)
+    mo_driven = _build_skeleton("DST", i_joints)
+
+    f_start = time.time()
+    for _ in range(i_passes):
+        i_legacy = len(_legacy_match(mo_driver, mo_driven))
+    f_legacy = (time.time() - f_start) / i_passes
+
+    #   Index is built once and reused by all passes, build and match are timed apart
+    f_start = time.time()
+    driver_index = retarget.SkeletonIndex(mo_driver)
+    f_build = time.time() - f_start
+
+    f_start = time.time()
+    for _ in range(i_passes):
+        i_index = len(_index_match(driver_index, mo_driven))
+    f_index = (time.time() - f_start) / i_passes
+
+    print ("{0} joints, {1} passes".format(i_joints, i_passes))
+    print ("legacy        {0:8.3f}s per pass ({1} matched)".format(f_legacy, i_legacy))
+    print ("SkeletonIndex {0:8.3f}s per pass ({1} matched)".format(f_index, i_index))
+    print ("SkeletonIndex {0:8.3f}s build, once".format(f_build))
+
+    return {"legacy": f_legacy, "index": f_index, "build": f_build}
+
+
+if __name__ == "__main__":
+    from maya import standalone
+    standalone.initialize()
+    run()
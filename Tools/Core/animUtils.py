@@ -9,23 +9,36 @@
 #    Import modules
 # ======================================
 
+import time
+import collections
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from maya import cmds, OpenMaya, OpenMayaAnim
 
 import apiUtils
 import nodeUtils
+import perfUtils
+import undoUtils
 
 
 # ======================================
 #    Bake
 # ======================================
 
-def bake(a_nodes, **kwargs):
+def _node_names(a_nodes):
 
     """
-    !@Brief Bake nodes from given time range.
+    !@Brief Get names of nodes to bake.
 
     @type a_nodes: list(str) / OpenMaya.MObjectArray
     @param a_nodes: List of nodes.
+
+    @rtype: list(str)
+    @return: Node names.
     """
 
     if isinstance(a_nodes, (list, tuple, OpenMaya.MObjectArray)) is False:
@@ -40,28 +53,1335 @@ def bake(a_nodes, **kwargs):
             a_tmp.append(OpenMaya.MFnDagNode(a_nodes[i]).fullPathName())
         a_nodes = a_tmp
 
+    return list(a_nodes)
+
+
+def _channels(a_nodes):
+
+    """
+    !@Brief Get unlocked keyable scalar channels of nodes.
+
+    @type a_nodes: list(str)
+    @param a_nodes: Node names.
+
+    @rtype: list(str)
+    @return: Channels "node.attribute".
+    """
+
+    a_channels = list()
+    for s_node in a_nodes:
+        for s_attr in cmds.listAttr(s_node, keyable=True, scalar=True, unlocked=True) or list():
+            a_channels.append("{0}.{1}".format(s_node, s_attr))
+
+    return a_channels
+
+
+def _ranges(a_values):
+
+    """
+    !@Brief Get first value and max - min of each column of sampled values.
+
+    @type a_values: numpy.ndarray / list
+    @param a_values: Values of shape (frames, channels).
+
+    @rtype: tuple(list(float), list(float))
+    @return: First values and ranges.
+    """
+
+    if numpy is not None:
+        return a_values[0].tolist(), (a_values.max(axis=0) - a_values.min(axis=0)).tolist()
+
+    a_columns = list(zip(*a_values))
+    return list(a_values[0]), [max(a_column) - min(a_column) for a_column in a_columns]
+
+
+def split_static(a_channels, a_frames, f_tolerance=1e-6, i_stride=16):
+
+    """
+    !@Brief Classify channels as static or animated on frames.
+            Coarse pass on 1 frame of i_stride discards most of animated channels,
+            remaining channels are checked on all frames.
+
+    @type a_channels: list(str)
+    @param a_channels: Channels "node.attribute".
+    @type a_frames: TimeRange / list(float)
+    @param a_frames: Range or frames in ui unit. Frames are checked from min to max.
+    @type f_tolerance: float
+    @param f_tolerance: Max variation of static channel in internal unit.
+    @type i_stride: int
+    @param i_stride: Stride of coarse pass.
+
+    @rtype: tuple(list(str), list(tuple(str, float)))
+    @return: Animated channels, (static channel, value in internal unit).
+    """
+
+    if isinstance(a_frames, TimeRange) is False:
+        a_frames = TimeRange(min(a_frames), max(a_frames)) if a_frames else None
+    if not a_channels or a_frames is None:
+        return list(a_channels), list()
+
+    #   Coarse pass
+    a_coarse = list(a_frames.stride(i_stride))
+    _, a_ranges = _ranges(sample(a_channels, a_frames=a_coarse))
+    a_candidates = [s_channel for s_channel, f_range in zip(a_channels, a_ranges) if f_range <= f_tolerance]
+
+    #   Full pass on candidates
+    d_static = dict()
+    if a_candidates:
+        a_first, a_ranges = _ranges(sample(a_candidates, a_frames=a_frames))
+        for s_channel, f_value, f_range in zip(a_candidates, a_first, a_ranges):
+            if f_range <= f_tolerance:
+                d_static[s_channel] = f_value
+
+    a_animated = [s_channel for s_channel in a_channels if s_channel not in d_static]
+    a_static = [(s_channel, d_static[s_channel]) for s_channel in a_channels if s_channel in d_static]
+
+    return a_animated, a_static
+
+
+def _is_settable(mp_channel):
+
+    """
+    !@Brief Check if channel can be disconnected alone. Channel driven by its compound parent can't.
+
+    @type mp_channel: OpenMaya.MPlug
+    @param mp_channel: Channel.
+
+    @rtype: bool
+    @return: True if compound parent has no input.
+    """
+
+    if mp_channel.isChild() is False:
+        return True
+
+    mpa_sources = OpenMaya.MPlugArray()
+    mp_channel.parent().connectedTo(mpa_sources, True, False)
+
+    return mpa_sources.length() == 0
+
+
+def _split_settable(a_channels, a_frames, f_tolerance):
+
+    """
+    !@Brief Split channels in animated and static. Static channels that can't be set alone are animated.
+
+    @rtype: tuple(list(str), list(tuple(str, float)))
+    @return: Animated channels, (static channel, value in internal unit).
+    """
+
+    a_animated, a_static = split_static(a_channels, a_frames, f_tolerance=f_tolerance)
+    a_plugs = apiUtils.get_plugs([s_channel for s_channel, _ in a_static])
+    set_compound = set(s_channel for (s_channel, _), mp_channel in zip(a_static, a_plugs) if _is_settable(mp_channel) is False)
+    a_animated += [s_channel for s_channel, _ in a_static if s_channel in set_compound]
+    a_static = [(s_channel, f_value) for s_channel, f_value in a_static if s_channel not in set_compound]
+
+    return a_animated, a_static
+
+
+def _set_static(a_static):
+
+    """
+    !@Brief Disconnect inputs of static channels and set their value once.
+
+    @type a_static: list(tuple(str, float))
+    @param a_static: (channel, value in internal unit).
+    """
+
+    mdg_mod = OpenMaya.MDGModifier()
+    for (_, f_value), mp_channel in zip(a_static, apiUtils.get_plugs([s_channel for s_channel, _ in a_static])):
+        mpa_sources = OpenMaya.MPlugArray()
+        mp_channel.connectedTo(mpa_sources, True, False)
+        for i in range(mpa_sources.length()):
+            mdg_mod.disconnect(mpa_sources[i], mp_channel)
+        mdg_mod.newPlugValueDouble(mp_channel, f_value)
+    undoUtils.do_it(mdg_mod)
+
+
+def bake(a_nodes, **kwargs):
+
+    """
+    !@Brief Bake nodes from given time range.
+            With b_skip_static, channels that don't move on time range are not baked, they are set once.
+
+    @type a_nodes: list(str) / OpenMaya.MObjectArray
+    @param a_nodes: List of nodes.
+
+    @rtype: dict
+    @return: {'animated': list(str), 'static': list(str), 'reduce': dict / None, 'timings': perfUtils.Timings}
+
+    Optional kwargs:
+        f_start, f_end, b_full: Time range.
+        s_evaluation: Evaluation mode during bake, see perfUtils.PerfContext. Default is "parallel".
+        b_undo: True bake in one undo chunk, False disable undo. Default is True.
+        b_skip_static: Detect static channels, set them once instead of baking them
+                       (their input connection is removed). Default is False.
+        f_static_tolerance: Max variation of static channel in internal unit.
+        b_reduce: Reduce baked curves with reduce_keys.
+        f_translate_tolerance, f_rotate_tolerance, f_tolerance: Tolerances given to reduce_keys.
+        b_linear: Set linear tangents on reduced curves, see reduce_keys. Default is True.
+    """
+
+    a_nodes = _node_names(a_nodes)
+
+    d_report = {'animated': list(), 'static': list(), 'reduce': None, 'timings': None}
+
     # ==================================
     #   Get timeline data
 
-    mt_start = get_time(kwargs.get("f_start"), b_full=kwargs.get("b_full", True))
-    mt_end = get_time(kwargs.get("f_end"), b_full=kwargs.get("b_full", True), b_end=True)
+    time_range = TimeRange.from_times(kwargs.get("f_start"), kwargs.get("f_end"), b_full=kwargs.get("b_full", True))
+
+    with perfUtils.PerfContext(
+        "bake",
+        s_evaluation=kwargs.get("s_evaluation", "parallel"),
+        b_undo=kwargs.get("b_undo", True)
+    ) as perf:
+
+        # ==================================
+        #   Static channels
+
+        a_bake = a_nodes
+        a_static = list()
+        if kwargs.get("b_skip_static", False) is True:
+            with perf.phase("static"):
+                a_animated, a_static = _split_settable(
+                    _channels(a_nodes), time_range, kwargs.get("f_static_tolerance", 1e-6)
+                )
+                d_report['animated'] = a_animated
+                d_report['static'] = [s_channel for s_channel, _ in a_static]
+                a_bake = a_animated
+
+        # ==================================
+        #   bake
+
+        with perf.phase("bake"):
+            if a_bake:
+                cmds.bakeResults(
+                    a_bake,
+                    time=(time_range.start, time_range.end),
+                    sampleBy=1,
+                    simulation=True
+                )
+
+        if a_static:
+            with perf.phase("set_static"):
+                _set_static(a_static)
+
+        if kwargs.get("b_reduce", False) is True:
+            with perf.phase("reduce"):
+                d_report['reduce'] = reduce_keys(
+                    a_nodes,
+                    f_translate_tolerance=kwargs.get("f_translate_tolerance", 0.01),
+                    f_rotate_tolerance=kwargs.get("f_rotate_tolerance", 0.05),
+                    f_tolerance=kwargs.get("f_tolerance", 0.001),
+                    b_linear=kwargs.get("b_linear", True)
+                )
+
+    d_report['timings'] = perf.timings
+
+    return d_report
+
+
+# ======================================
+#    Bake scheduler
+# ======================================
+
+def _unique(a_items):
+
+    """
+    !@Brief Remove duplicates, keep order.
+
+    @rtype: list
+    @return: Unique items.
+    """
+
+    set_seen = set()
+    a_unique = list()
+    for item in a_items:
+        if item not in set_seen:
+            set_seen.add(item)
+            a_unique.append(item)
+
+    return a_unique
+
+
+def _merge_ranges(a_ranges):
+
+    """
+    !@Brief Merge overlapping and adjacent frame ranges.
+
+    @type a_ranges: list(tuple(float, float))
+    @param a_ranges: (start, end) of ranges, end included.
+
+    @rtype: tuple(tuple(float, float))
+    @return: Sorted disjoint ranges.
+    """
+
+    a_merged = list()
+    for f_start, f_end in sorted(a_ranges):
+        if a_merged and f_start <= a_merged[-1][1] + 1:
+            a_merged[-1][1] = max(a_merged[-1][1], f_end)
+        else:
+            a_merged.append([f_start, f_end])
+
+    return tuple((f_start, f_end) for f_start, f_end in a_merged)
+
+
+class BakeJob(object):
+
+    """
+    !@Brief Nodes to bake on time range. Filled by BakeScheduler.run with its result.
+    """
+
+    def __init__(self, s_name, a_nodes, f_start, f_end, on_done=None):
+
+        self.name = s_name
+        self.nodes = a_nodes
+        self.start = f_start
+        self.end = f_end
+        self.on_done = on_done
+
+        self.animated = list()
+        self.static = list()
+        self.frames_done = 0.0
+        self.time = 0.0
+
+    @property
+    def frame_count(self):
+
+        """
+        !@Brief Number of frames of job.
+
+        @rtype: int
+        @return: Frame count.
+        """
+
+        return int(self.end - self.start) + 1
+
+    @property
+    def progress(self):
+
+        """
+        !@Brief Baked part of job.
+
+        @rtype: float
+        @return: Progress between 0 and 1.
+        """
+
+        return float(self.frames_done) / self.frame_count
+
+    def as_dict(self):
+
+        """
+        !@Brief Get job result as dict.
+
+        @rtype: dict
+        @return: Job result.
+        """
+
+        return {
+            "name": self.name,
+            "start": self.start,
+            "end": self.end,
+            "animated": len(self.animated),
+            "static": len(self.static),
+            "progress": self.progress,
+            "time": self.time
+        }
+
+
+class BakeResults(object):
+
+    """
+    !@Brief Result of BakeScheduler.run.
+    """
+
+    def __init__(self, a_jobs, a_ranges):
+
+        self.jobs = collections.OrderedDict((job.name, job) for job in a_jobs)
+        self.ranges = [(f_start, f_end, [job.name for job in a_range_jobs]) for f_start, f_end, a_range_jobs in a_ranges]
+        self.reduce = None
+        self.timings = None
+
+    def __getitem__(self, s_name):
+
+        return self.jobs[s_name]
+
+    def __iter__(self):
+
+        return iter(self.jobs.values())
+
+    def __len__(self):
+
+        return len(self.jobs)
+
+    def as_dict(self):
+
+        """
+        !@Brief Get results as dict.
+
+        @rtype: dict
+        @return: Jobs, sub ranges and timings.
+        """
+
+        return {
+            "jobs": [job.as_dict() for job in self.jobs.values()],
+            "ranges": self.ranges,
+            "timings": self.timings.as_dict() if self.timings else None
+        }
+
+
+class BakeScheduler(object):
+
+    """
+    !@Brief Bake many node sets in few passes.
+            Each node (or channel) is baked once on union of ranges of jobs that contain it,
+            nodes with same union are baked together. Sub ranges (jobs split on range boundaries)
+            are only reported in results.
+
+            scheduler = BakeScheduler()
+            scheduler.add(a_hero, s_name="hero")
+            scheduler.add(a_crowd, f_start=20, f_end=80, s_name="crowd")
+            results = scheduler.run()
+    """
+
+    def __init__(self):
+
+        self.jobs = list()
+
+    def __len__(self):
+
+        return len(self.jobs)
+
+    def add(self, a_nodes, f_start=None, f_end=None, b_full=True, s_name=None, on_done=None):
+
+        """
+        !@Brief Add nodes to bake.
+
+        @type a_nodes: list(str) / OpenMaya.MObjectArray
+        @param a_nodes: List of nodes.
+        @type f_start: float
+        @param f_start: Start frame. Animation start if None.
+        @type f_end: float
+        @param f_end: End frame. Animation end if None.
+        @type b_full: bool
+        @param b_full: If is True use animation range else playback range.
+        @type s_name: str
+        @param s_name: Job name. Default is "job_<index>".
+        @type on_done: function
+        @param on_done: Called without argument once job is baked.
+
+        @rtype: BakeJob
+        @return: New job.
+        """
+
+        if s_name is None:
+            s_name = "job_{0}".format(len(self.jobs))
+        if s_name in [job.name for job in self.jobs]:
+            raise ValueError("Job {0} already exists.".format(s_name))
+
+        time_range = TimeRange.from_times(f_start, f_end, b_full=b_full)
+        job = BakeJob(s_name, _node_names(a_nodes), time_range.start, time_range.end, on_done=on_done)
+        self.jobs.append(job)
+
+        return job
+
+    def sub_ranges(self):
+
+        """
+        !@Brief Split jobs time ranges on all start and end of jobs.
+
+        @rtype: list(tuple(float, float, list(BakeJob)))
+        @return: (start, end, jobs covering sub range). Frames without job are skipped.
+        """
+
+        a_bounds = sorted(set([job.start for job in self.jobs] + [job.end + 1 for job in self.jobs]))
+
+        a_ranges = list()
+        for f_start, f_next in zip(a_bounds[:-1], a_bounds[1:]):
+            a_jobs = [job for job in self.jobs if job.start <= f_start and f_next - 1 <= job.end]
+            if a_jobs:
+                a_ranges.append((f_start, f_next - 1, a_jobs))
+
+        return a_ranges
+
+    def __classify(self, f_tolerance):
+
+        """
+        !@Brief Split channels of jobs in animated and static.
+                Jobs with same range are sampled together. Channel animated in one job is animated for all.
+
+        @rtype: list(tuple(str, float))
+        @return: Static channels and their value.
+        """
+
+        d_groups = collections.OrderedDict()
+        for job in self.jobs:
+            d_groups.setdefault((job.start, job.end), list()).append(job)
+
+        d_static = collections.OrderedDict()
+        set_animated = set()
+        for (f_start, f_end), a_jobs in d_groups.items():
+            f_time = time.time()
+            d_job_channels = dict((job.name, _channels(job.nodes)) for job in a_jobs)
+            a_animated, a_static = _split_settable(
+                _unique([s_channel for job in a_jobs for s_channel in d_job_channels[job.name]]),
+                TimeRange(f_start, f_end), f_tolerance
+            )
+            set_animated.update(a_animated)
+            d_static.update(a_static)
+            for job in a_jobs:
+                job.animated = d_job_channels[job.name]
+                job.time += (time.time() - f_time) / len(a_jobs)
+
+        for job in self.jobs:
+            job.static = [s_channel for s_channel in job.animated if s_channel in d_static and s_channel not in set_animated]
+            set_static = set(job.static)
+            job.animated = [s_channel for s_channel in job.animated if s_channel not in set_static]
+
+        return [(s_channel, f_value) for s_channel, f_value in d_static.items() if s_channel not in set_animated]
+
+    def run(self, progress=None, **kwargs):
+
+        """
+        !@Brief Bake all jobs.
+
+        @type progress: function
+        @param progress: Called with (BakeJob, progress between 0 and 1) after each bake that contains nodes of job.
+
+        @rtype: BakeResults
+        @return: Result of each job, sub ranges and timings.
+
+        Optional kwargs: s_evaluation, b_undo, b_skip_static, f_static_tolerance, b_reduce,
+        tolerances of reduce and b_linear, see bake.
+        """
+
+        a_ranges = self.sub_ranges()
+        results = BakeResults(self.jobs, a_ranges)
+
+        for job in self.jobs:
+            job.animated = list()
+            job.static = list()
+            job.frames_done = 0.0
+            job.time = 0.0
+
+        with perfUtils.PerfContext(
+            "bake_scheduler",
+            s_evaluation=kwargs.get("s_evaluation", "parallel"),
+            b_undo=kwargs.get("b_undo", True)
+        ) as perf:
+
+            #   Static channels
+            a_static = list()
+            if kwargs.get("b_skip_static", False) is True:
+                with perf.phase("static"):
+                    a_static = self.__classify(kwargs.get("f_static_tolerance", 1e-6))
+            else:
+                for job in self.jobs:
+                    job.animated = list(job.nodes)
+
+            #   Bake each item once on union of its jobs ranges
+            with perf.phase("bake"):
+                d_item_jobs = collections.OrderedDict()
+                for job in self.jobs:
+                    for item in job.animated:
+                        d_item_jobs.setdefault(item, list()).append(job)
+                d_groups = collections.OrderedDict()
+                for item, a_jobs in d_item_jobs.items():
+                    d_groups.setdefault(_merge_ranges([(job.start, job.end) for job in a_jobs]), list()).append(item)
+
+                d_job_items = dict((job.name, float(len(job.animated))) for job in self.jobs)
+                for a_union, a_bake in d_groups.items():
+                    set_bake = set(a_bake)
+                    for f_start, f_end in a_union:
+                        f_time = time.time()
+                        cmds.bakeResults(
+                            a_bake,
+                            time=(f_start, f_end),
+                            sampleBy=1,
+                            simulation=True,
+                            preserveOutsideKeys=True
+                        )
+                        f_time = time.time() - f_time
+                        #   Progress of job is its baked frames weighted by its part of items
+                        a_weights = list()
+                        for job in self.jobs:
+                            i_overlap = int(min(f_end, job.end) - max(f_start, job.start)) + 1
+                            i_items = len([item for item in job.animated if item in set_bake])
+                            if i_overlap > 0 and i_items:
+                                a_weights.append((job, i_overlap, i_items))
+                        for job, i_overlap, i_items in a_weights:
+                            job.time += f_time / len(a_weights)
+                            job.frames_done += i_overlap * i_items / d_job_items[job.name]
+                            if progress is not None:
+                                progress(job, job.progress)
+                for job in self.jobs:
+                    if not job.animated:
+                        job.frames_done = float(job.frame_count)
+                        if progress is not None:
+                            progress(job, job.progress)
+
+            if a_static:
+                with perf.phase("set_static"):
+                    _set_static(a_static)
+
+            if kwargs.get("b_reduce", False) is True:
+                with perf.phase("reduce"):
+                    results.reduce = reduce_keys(
+                        _unique([s_node for job in self.jobs for s_node in job.nodes]),
+                        f_translate_tolerance=kwargs.get("f_translate_tolerance", 0.01),
+                        f_rotate_tolerance=kwargs.get("f_rotate_tolerance", 0.05),
+                        f_tolerance=kwargs.get("f_tolerance", 0.001),
+                        b_linear=kwargs.get("b_linear", True)
+                    )
+
+            with perf.phase("on_done"):
+                for job in self.jobs:
+                    if job.on_done is not None:
+                        job.on_done()
+
+        results.timings = perf.timings
+
+        return results
+
+
+# ======================================
+#    Key reduction
+# ======================================
+
+def _anim_curves(a_items):
+
+    """
+    !@Brief Get anim curves of nodes. Anim curves given are kept.
+
+    @type a_items: list(str) / OpenMaya.MObjectArray
+    @param a_items: Nodes or anim curves.
+
+    @rtype: list(OpenMaya.MObject)
+    @return: Anim curves.
+    """
+
+    if isinstance(a_items, OpenMaya.MObjectArray) is True:
+        a_items = [a_items[i] for i in range(a_items.length())]
+
+    a_names = list()
+    for item in a_items:
+        if isinstance(item, OpenMaya.MObject) is True:
+            if item.hasFn(OpenMaya.MFn.kDagNode) is True:
+                item = OpenMaya.MFnDagNode(item).fullPathName()
+            else:
+                item = OpenMaya.MFnDependencyNode(item).name()
+        a_names.append(item)
+
+    if not a_names:
+        return list()
+
+    a_curves = cmds.ls(a_names, type="animCurve") or list()
+    a_curves += cmds.listConnections(
+        a_names, source=True, destination=False, type="animCurve", skipConversionNodes=True
+    ) or list()
+
+    return apiUtils.get_objects(sorted(set(a_curves)))
+
+
+def _curve_tolerance(mo_curve, f_translate_tolerance, f_rotate_tolerance, f_tolerance):
+
+    """
+    !@Brief Get tolerance of anim curve in internal unit.
+
+    @rtype: float
+    @return: Tolerance in cm for TL curves, radians for TA curves, raw value else.
+    """
+
+    if mo_curve.hasFn(OpenMaya.MFn.kAnimCurveTimeToDistance) is True:
+        return OpenMaya.MDistance(f_translate_tolerance, OpenMaya.MDistance.uiUnit()).asCentimeters()
+    if mo_curve.hasFn(OpenMaya.MFn.kAnimCurveTimeToAngular) is True:
+        return OpenMaya.MAngle(f_rotate_tolerance, OpenMaya.MAngle.kDegrees).asRadians()
+
+    return f_tolerance
+
+
+def _reduce_mask(a_times, a_values, a_tolerances):
+
+    """
+    !@Brief Find keys to keep on curves with same key times.
+            Top-down split on all curves at once: each pass computes error of every key against
+            line between its kept neighbours, and keeps key of max error of each segment over tolerance.
+
+    @type a_times: numpy.ndarray
+    @param a_times: Key times of shape (keys,).
+    @type a_values: numpy.ndarray
+    @param a_values: Key values of shape (curves, keys).
+    @type a_tolerances: numpy.ndarray
+    @param a_tolerances: Tolerance of each curve of shape (curves,).
+
+    @rtype: numpy.ndarray
+    @return: Boolean mask of kept keys of shape (curves, keys).
+    """
+
+    i_curves, i_keys = a_values.shape
+    a_keep = numpy.zeros((i_curves, i_keys), dtype=bool)
+    a_keep[:, 0] = True
+    a_keep[:, -1] = True
+
+    a_index = numpy.arange(i_keys)
+    a_rows = numpy.arange(i_curves)[:, None]
+    while True:
+        a_prev = numpy.maximum.accumulate(numpy.where(a_keep, a_index, 0), axis=1)
+        a_next = numpy.minimum.accumulate(numpy.where(a_keep, a_index, i_keys - 1)[:, ::-1], axis=1)[:, ::-1]
+
+        a_t0 = a_times[a_prev]
+        a_span = a_times[a_next] - a_t0
+        a_weight = numpy.where(a_span > 0.0, (a_times - a_t0) / numpy.where(a_span > 0.0, a_span, 1.0), 0.0)
+        a_v0 = a_values[a_rows, a_prev]
+        a_error = numpy.abs(a_values - (a_v0 + (a_values[a_rows, a_next] - a_v0) * a_weight)) - a_tolerances[:, None]
+
+        a_curve, a_key = numpy.nonzero(a_error > 0.0)
+        if not len(a_curve):
+            return a_keep
+
+        #   Max error of each segment
+        a_segment = a_curve * i_keys + a_prev[a_curve, a_key]
+        a_order = numpy.lexsort((a_error[a_curve, a_key], a_segment))
+        a_sorted = a_segment[a_order]
+        a_last = a_order[numpy.append(a_sorted[1:] != a_sorted[:-1], True)]
+        a_keep[a_curve[a_last], a_key[a_last]] = True
+
+
+def _reduce_list(a_times, a_values, f_tolerance):
+
+    """
+    !@Brief Find keys to keep on one curve without numpy.
+
+    @rtype: list(bool)
+    @return: Kept keys.
+    """
+
+    a_keep = [False] * len(a_values)
+    a_keep[0] = a_keep[-1] = True
+
+    a_stack = [(0, len(a_values) - 1)]
+    while a_stack:
+        i_start, i_end = a_stack.pop()
+        f_span = a_times[i_end] - a_times[i_start]
+        i_max, f_max = None, f_tolerance
+        for i in range(i_start + 1, i_end):
+            f_weight = (a_times[i] - a_times[i_start]) / f_span if f_span > 0.0 else 0.0
+            f_error = abs(a_values[i] - (a_values[i_start] + (a_values[i_end] - a_values[i_start]) * f_weight))
+            if f_error > f_max:
+                i_max, f_max = i, f_error
+        if i_max is not None:
+            a_keep[i_max] = True
+            a_stack.extend([(i_start, i_max), (i_max, i_end)])
+
+    return a_keep
+
+
+def _rewrite_keys(mfn_curve, a_times, a_values, a_keep, i_in, i_out, i_unit, mac_change):
+
+    """
+    !@Brief Replace all keys of curve by kept keys with one addKeys.
+
+    @type mfn_curve: OpenMayaAnim.MFnAnimCurve
+    @param mfn_curve: Curve.
+    @type a_times: list(float)
+    @param a_times: Time of all keys in i_unit.
+    @type a_values: list(float)
+    @param a_values: Value of all keys.
+    @type a_keep: list(bool)
+    @param a_keep: Kept keys.
+    @type i_in: int
+    @param i_in: In tangent type of kept keys.
+    @type i_out: int
+    @param i_out: Out tangent type of kept keys.
+    @type i_unit: int
+    @param i_unit: OpenMaya.MTime unit of times.
+    @type mac_change: OpenMayaAnim.MAnimCurveChange
+    @param mac_change: Change that record key edits.
+    """
+
+    mta_times = OpenMaya.MTimeArray()
+    mda_values = OpenMaya.MDoubleArray()
+    for f_time, f_value, b_keep in zip(a_times, a_values, a_keep):
+        if b_keep is True:
+            mta_times.append(OpenMaya.MTime(f_time, i_unit))
+            mda_values.append(f_value)
+    mfn_curve.addKeys(mta_times, mda_values, i_in, i_out, False, mac_change)
+
+
+def _rewrite_checked(mfn_curve, a_times, a_values, a_keep, f_tolerance, i_unit, mac_change):
+
+    """
+    !@Brief Rewrite kept keys with tangent types of first key, then evaluate curve on all removed keys.
+            Removed keys out of tolerance are kept and curve is rewritten until all keys are in tolerance.
+
+    @rtype: list(bool)
+    @return: Final kept keys.
+    """
+
+    i_in, i_out = mfn_curve.inTangentType(0), mfn_curve.outTangentType(0)
+    a_keep = list(a_keep)
+    while True:
+        _rewrite_keys(mfn_curve, a_times, a_values, a_keep, i_in, i_out, i_unit, mac_change)
+        a_over = [
+            i for i, (f_time, f_value, b_keep) in enumerate(zip(a_times, a_values, a_keep))
+            if b_keep is False and abs(mfn_curve.evaluate(OpenMaya.MTime(f_time, i_unit)) - f_value) > f_tolerance
+        ]
+        if not a_over:
+            return a_keep
+        for i in a_over:
+            a_keep[i] = True
+
+
+def reduce_keys(a_items, f_translate_tolerance=0.01, f_rotate_tolerance=0.05, f_tolerance=0.001, b_linear=True, mac_change=None):
+
+    """
+    !@Brief Remove keys of baked curves while curves stay in tolerance of baked values.
+            Error is measured against line between kept keys, kept keys get linear tangents
+            so curve between kept keys is exactly this line. Without b_linear, kept keys get tangent types
+            of first key and curve is evaluated after rewrite, keys out of tolerance are added back.
+            Curves with same key times (all curves after bake) are reduced together, each curve is
+            rewritten with one addKeys.
+
+    @type a_items: list(str) / OpenMaya.MObjectArray
+    @param a_items: Nodes or anim curves.
+    @type f_translate_tolerance: float
+    @param f_translate_tolerance: Tolerance of translate curves in ui linear unit.
+    @type f_rotate_tolerance: float
+    @param f_rotate_tolerance: Tolerance of rotate curves in degrees.
+    @type f_tolerance: float
+    @param f_tolerance: Tolerance of other curves.
+    @type b_linear: bool
+    @param b_linear: Set linear tangents on kept keys. Default is True.
+    @type mac_change: OpenMayaAnim.MAnimCurveChange
+    @param mac_change: Change that record key edits. If None, new change is created and added to undo queue.
+
+    @rtype: dict
+    @return: {'curves': int, 'keys_before': int, 'keys_after': int, 'change': OpenMayaAnim.MAnimCurveChange,
+              'timings': perfUtils.Timings}
+    """
+
+    timings = perfUtils.Timings("reduce_keys")
+
+    #   Read keys
+    with timings.phase("read"):
+        i_unit = OpenMaya.MTime.uiUnit()
+        d_groups = dict()
+        i_before = 0
+        a_curves = _anim_curves(a_items)
+        for mo_curve in a_curves:
+            mfn_curve = OpenMayaAnim.MFnAnimCurve(mo_curve)
+            i_keys = mfn_curve.numKeys()
+            i_before += i_keys
+            if i_keys < 3:
+                continue
+            a_times = tuple(mfn_curve.time(i).asUnits(i_unit) for i in range(i_keys))
+            a_values = [mfn_curve.value(i) for i in range(i_keys)]
+            f_curve_tolerance = _curve_tolerance(mo_curve, f_translate_tolerance, f_rotate_tolerance, f_tolerance)
+            d_groups.setdefault(a_times, list()).append((mfn_curve, a_values, f_curve_tolerance))
+
+    #   Reduce
+    with timings.phase("reduce"):
+        a_writes = list()
+        for a_times, a_group in d_groups.items():
+            if numpy is not None:
+                a_keep = _reduce_mask(
+                    numpy.array(a_times, dtype=numpy.float64),
+                    numpy.array([a_values for _, a_values, _ in a_group], dtype=numpy.float64),
+                    numpy.array([f_curve_tolerance for _, _, f_curve_tolerance in a_group], dtype=numpy.float64)
+                ).tolist()
+            else:
+                a_keep = [_reduce_list(a_times, a_values, f_curve_tolerance) for _, a_values, f_curve_tolerance in a_group]
+            for (mfn_curve, a_values, f_curve_tolerance), a_curve_keep in zip(a_group, a_keep):
+                if all(a_curve_keep) is False:
+                    a_writes.append((mfn_curve, a_times, a_values, a_curve_keep, f_curve_tolerance))
+
+    #   Write back
+    with timings.phase("write"):
+        b_register = mac_change is None
+        if b_register is True:
+            mac_change = OpenMayaAnim.MAnimCurveChange()
+        i_removed = 0
+        for mfn_curve, a_times, a_values, a_curve_keep, f_curve_tolerance in a_writes:
+            if b_linear is True:
+                _rewrite_keys(mfn_curve, a_times, a_values, a_curve_keep, OpenMayaAnim.MFnAnimCurve.kTangentLinear,
+                              OpenMayaAnim.MFnAnimCurve.kTangentLinear, i_unit, mac_change)
+            else:
+                a_curve_keep = _rewrite_checked(
+                    mfn_curve, a_times, a_values, a_curve_keep, f_curve_tolerance, i_unit, mac_change
+                )
+            i_removed += len(a_curve_keep) - sum(a_curve_keep)
+        if b_register is True and a_writes:
+            undoUtils.register(mac_change.undoIt, mac_change.redoIt)
+
+    timings.stop()
+
+    return {
+        'curves': len(a_curves), 'keys_before': i_before, 'keys_after': i_before - i_removed,
+        'change': mac_change, 'timings': timings
+    }
+
+
+# ======================================
+#    Sampling
+# ======================================
+
+def _to_plug(item):
+
+    """
+    !@Brief Get sampled plug from item.
+
+    @type item: OpenMaya.MPlug / OpenMaya.MObject / str
+    @param item: Plug, node or name. worldMatrix is sampled for nodes.
+
+    @rtype: OpenMaya.MPlug
+    @return: Plug to sample.
+    """
+
+    if isinstance(item, OpenMaya.MPlug) is True:
+        return item
+
+    if isinstance(item, basestring) is True:
+        if "." in item:
+            return apiUtils.get_plug(item)
+        item = apiUtils.get_object(item)
+
+    if isinstance(item, OpenMaya.MObject) is False or item.hasFn(OpenMaya.MFn.kDagNode) is False:
+        raise TypeError("Item must be a plug or a dag node not {0}".format(item))
+
+    return OpenMaya.MFnDependencyNode(item).findPlug("worldMatrix").elementByLogicalIndex(0)
+
+
+def _is_matrix(mp_attr):
+
+    """
+    !@Brief Check if plug is a matrix plug.
+
+    @type mp_attr: OpenMaya.MPlug
+    @param mp_attr: Plug.
+
+    @rtype: bool
+    @return: True if plug value is a matrix.
+    """
+
+    mo_attr = mp_attr.attribute()
+    if mo_attr.hasFn(OpenMaya.MFn.kMatrixAttribute) is True:
+        return True
+
+    if mo_attr.hasFn(OpenMaya.MFn.kTypedAttribute) is True:
+        return OpenMaya.MFnTypedAttribute(mo_attr).attrType() == OpenMaya.MFnData.kMatrix
+
+    return False
+
+
+def _frames(a_frames):
+
+    """
+    !@Brief Get list of frames. Animation range if None.
+
+    @rtype: TimeRange / list(float)
+    @return: Frames.
+    """
+
+    if a_frames is None:
+        return TimeRange.animation()
+
+    if isinstance(a_frames, TimeRange) is True:
+        return a_frames
+
+    return list(a_frames)
+
+
+def _frame_chunks(a_frames, i_chunk):
+
+    """
+    !@Brief Split frames in chunks.
+
+    @type a_frames: TimeRange / list(float)
+    @param a_frames: Frames.
+    @type i_chunk: int
+    @param i_chunk: Number of frames by chunk.
+
+    @rtype: generator
+    @return: List of frames of each chunk.
+    """
+
+    if isinstance(a_frames, TimeRange) is True:
+        for time_range in a_frames.to_unit(OpenMaya.MTime.uiUnit()).chunks(i_chunk):
+            yield list(time_range)
+    else:
+        for i_start in range(0, len(a_frames), i_chunk):
+            yield a_frames[i_start:i_start + i_chunk]
+
+
+def iter_sample(a_items, a_frames=None, i_chunk=256):
+
+    """
+    !@Brief Evaluate plugs or node world matrices at many frames without changing current time.
+            Values are yielded by chunk of frames, so long clips don't stay in memory.
+
+    @type a_items: list
+    @param a_items: Plugs, nodes or names. worldMatrix[0] is sampled for nodes.
+                    Items must be all matrices or all numeric plugs.
+    @type a_frames: TimeRange / list(float)
+    @param a_frames: Range or frames in ui unit. Animation range if None.
+    @type i_chunk: int
+    @param i_chunk: Number of frames by chunk.
+
+    @rtype: generator
+    @return: (frames of chunk, values) with values of shape (frames, items) or (frames, items, 4, 4).
+             Values are numpy array, nested list without numpy.
+    """
+
+    a_plugs = [_to_plug(item) for item in a_items]
+    a_frames = _frames(a_frames)
+    i_chunk = max(1, int(i_chunk or len(a_frames) or 1))
+
+    a_matrix = [_is_matrix(mp) for mp in a_plugs]
+    if any(a_matrix) and not all(a_matrix):
+        raise TypeError("Items must be all matrices or all numeric plugs.")
+    b_matrix = bool(a_plugs) and all(a_matrix)
+
+    i_unit = OpenMaya.MTime.uiUnit()
+    for a_chunk in _frame_chunks(a_frames, i_chunk):
+        a_values = list()
+        for f_frame in a_chunk:
+            m_context = OpenMaya.MDGContext(OpenMaya.MTime(f_frame, i_unit))
+            if b_matrix:
+                a_row = list()
+                for mp in a_plugs:
+                    mm = OpenMaya.MFnMatrixData(mp.asMObject(m_context)).matrix()
+                    a_row.append([[mm(j, k) for k in range(4)] for j in range(4)])
+            else:
+                a_row = [mp.asDouble(m_context) for mp in a_plugs]
+            a_values.append(a_row)
+        if numpy is not None:
+            a_values = numpy.array(a_values, dtype=numpy.float64)
+        yield a_chunk, a_values
+
+
+def sample(a_items, a_frames=None, i_chunk=256):
+
+    """
+    !@Brief Evaluate plugs or node world matrices at many frames without changing current time.
+
+    @type a_items: list
+    @param a_items: Plugs, nodes or names. worldMatrix[0] is sampled for nodes.
+    @type a_frames: TimeRange / list(float)
+    @param a_frames: Range or frames in ui unit. Animation range if None.
+    @type i_chunk: int
+    @param i_chunk: Number of frames evaluated by chunk.
+
+    @rtype: numpy.ndarray / list
+    @return: Values of shape (frames, items) or (frames, items, 4, 4).
+    """
+
+    a_chunks = [a_values for _, a_values in iter_sample(a_items, a_frames=a_frames, i_chunk=i_chunk)]
+    if numpy is not None:
+        if not a_chunks:
+            return numpy.empty((0, len(a_items)), dtype=numpy.float64)
+        return numpy.concatenate(a_chunks)
+
+    return [a_row for a_values in a_chunks for a_row in a_values]
+
+
+# ======================================
+#    Time range
+# ======================================
+
+_TIME_RANGES = dict()
+_TIME_CALLBACKS = list()
+
+
+class TimeRange(object):
+
+    """
+    !@Brief Frame range in a time unit. Range is inclusive, frames are start, start + 1, ..., end.
+
+            for a_chunk in TimeRange.animation().chunks(100):
+                sample(a_nodes, a_frames=a_chunk)
+    """
+
+    __slots__ = ("start", "end", "unit")
+
+    def __init__(self, f_start, f_end, i_unit=None):
+
+        """
+        @type f_start: float
+        @param f_start: Start frame.
+        @type f_end: float
+        @param f_end: End frame.
+        @type i_unit: int
+        @param i_unit: OpenMaya.MTime unit. Ui unit if None.
+        """
+
+        if f_end < f_start:
+            raise ValueError("End frame must be greater than start frame -- {0} | {1}".format(f_start, f_end))
+
+        self.start = float(f_start)
+        self.end = float(f_end)
+        self.unit = OpenMaya.MTime.uiUnit() if i_unit is None else i_unit
+
+    def __repr__(self):
+
+        return "TimeRange({0}, {1}, {2})".format(self.start, self.end, self.unit)
+
+    def __eq__(self, other):
+
+        return isinstance(other, TimeRange) and (self.start, self.end, self.unit) == (other.start, other.end, other.unit)
+
+    def __ne__(self, other):
+
+        return not self == other
+
+    def __hash__(self):
+
+        return hash((self.start, self.end, self.unit))
+
+    def __len__(self):
+
+        return int(self.end - self.start) + 1
+
+    def __iter__(self):
+
+        return self.frames()
+
+    def __contains__(self, f_frame):
+
+        return self.start <= f_frame <= self.end
 
     # ==================================
-    #   bake
+    #   Scene ranges
+
+    @classmethod
+    def animation(cls):
+
+        """
+        !@Brief Animation range of scene. Cached until range or time unit change.
+
+        @rtype: TimeRange
+        @return: Animation range.
+        """
+
+        return cls.__scene_range("animation")
+
+    @classmethod
+    def playback(cls):
+
+        """
+        !@Brief Playback range of scene. Cached until range or time unit change.
+
+        @rtype: TimeRange
+        @return: Playback range.
+        """
+
+        return cls.__scene_range("playback")
+
+    @classmethod
+    def scene(cls, b_full=True):
+
+        """
+        !@Brief Animation or playback range of scene.
+
+        @type b_full: bool
+        @param b_full: If is True get animation range else playback range.
+
+        @rtype: TimeRange
+        @return: Scene range.
+        """
 
-    cmds.undoInfo(openChunk=True)
-    cmds.refresh(suspend=True)
+        return cls.animation() if b_full is True else cls.playback()
+
+    @classmethod
+    def from_times(cls, f_start=None, f_end=None, b_full=True, b_set=False):
+
+        """
+        !@Brief Get range from given frames, scene range is used for missing frames.
+
+        @type f_start: float / OpenMaya.MTime
+        @param f_start: Start frame.
+        @type f_end: float / OpenMaya.MTime
+        @param f_end: End frame.
+        @type b_full: bool
+        @param b_full: If is True use animation range else playback range.
+        @type b_set: bool
+        @param b_set: If True extend scene range to frames given, else raise if they are out of range.
+
+        @rtype: TimeRange
+        @return: Range.
+        """
+
+        if f_start is None and f_end is None:
+            return cls.scene(b_full=b_full)
+
+        mt_start = get_time(f_start, b_full=b_full, b_set=b_set)
+        mt_end = get_time(f_end, b_full=b_full, b_set=b_set, b_end=True)
+
+        return cls(mt_start.value(), mt_end.value(), mt_start.unit())
+
+    @classmethod
+    def __scene_range(cls, s_key):
+
+        """
+        !@Brief Get cached scene range.
+        """
+
+        time_range = _TIME_RANGES.get(s_key)
+        if time_range is None:
+            if len(_TIME_CALLBACKS) == 0:
+                _register_time_callbacks()
+            control = OpenMayaAnim.MAnimControl
+            if s_key == "animation":
+                mt_start, mt_end = control.animationStartTime(), control.animationEndTime()
+            else:
+                mt_start, mt_end = control.minTime(), control.maxTime()
+            time_range = cls(mt_start.value(), mt_end.value(), mt_start.unit())
+            _TIME_RANGES[s_key] = time_range
+
+        return time_range
+
+    # ==================================
+    #   Times
 
-    cmds.bakeResults(
-        a_nodes,
-        time=(mt_start.value(),
-        mt_end.value()),
-        sampleBy=1,
-        simulation=True
-    )
+    @property
+    def start_time(self):
 
-    cmds.refresh(suspend=False)
-    cmds.undoInfo(closeChunk=True)
+        """
+        !@Brief Start frame in MTime.
+
+        @rtype: OpenMaya.MTime
+        @return: New MTime.
+        """
+
+        return OpenMaya.MTime(self.start, self.unit)
+
+    @property
+    def end_time(self):
+
+        """
+        !@Brief End frame in MTime.
+
+        @rtype: OpenMaya.MTime
+        @return: New MTime.
+        """
+
+        return OpenMaya.MTime(self.end, self.unit)
+
+    def to_unit(self, i_unit):
+
+        """
+        !@Brief Get same range in other time unit.
+
+        @type i_unit: int
+        @param i_unit: OpenMaya.MTime unit.
+
+        @rtype: TimeRange
+        @return: Converted range.
+        """
+
+        if i_unit == self.unit:
+            return self
+
+        return TimeRange(self.start_time.asUnits(i_unit), self.end_time.asUnits(i_unit), i_unit)
+
+    # ==================================
+    #   Generators
+
+    def frames(self, f_step=1.0):
+
+        """
+        !@Brief Iterate frames of range.
+
+        @type f_step: float
+        @param f_step: Step between frames.
+
+        @rtype: generator
+        @return: Frames.
+        """
+
+        if f_step <= 0:
+            raise ValueError("Step must be positive not {0}".format(f_step))
+
+        i_count = int((self.end - self.start) / f_step + 1e-6) + 1
+        for i in range(i_count):
+            yield self.start + i * f_step
+
+    def stride(self, i_stride, b_end=True):
+
+        """
+        !@Brief Iterate one frame of i_stride.
+
+        @type i_stride: int
+        @param i_stride: Stride.
+        @type b_end: bool
+        @param b_end: Always yield end frame.
+
+        @rtype: generator
+        @return: Frames.
+        """
+
+        f_frame = None
+        for f_frame in self.frames(f_step=max(1, int(i_stride))):
+            yield f_frame
+
+        if b_end is True and f_frame != self.end:
+            yield self.end
+
+    def chunks(self, i_size):
+
+        """
+        !@Brief Split range in consecutive ranges.
+
+        @type i_size: int
+        @param i_size: Number of frames by chunk.
+
+        @rtype: generator
+        @return: TimeRange of each chunk.
+        """
+
+        i_size = max(1, int(i_size))
+        f_start = self.start
+        while f_start <= self.end:
+            f_end = min(f_start + i_size - 1, self.end)
+            yield TimeRange(f_start, f_end, self.unit)
+            f_start = f_end + 1
+
+
+def _register_time_callbacks():
+
+    """
+    !@Brief Register callbacks that clear cached scene ranges.
+    """
+
+    for s_event in ["playbackRangeChanged", "playbackRangeSliderChanged", "timeUnitChanged"]:
+        _TIME_CALLBACKS.append(OpenMaya.MEventMessage.addEventCallback(s_event, _on_time_changed))
+    for i_message in [OpenMaya.MSceneMessage.kAfterNew, OpenMaya.MSceneMessage.kAfterOpen]:
+        _TIME_CALLBACKS.append(OpenMaya.MSceneMessage.addCallback(i_message, _on_time_changed))
+
+
+def _on_time_changed(*args):
+
+    """
+    !@Brief Range or unit callback. Clear cached scene ranges.
+    """
+
+    _TIME_RANGES.clear()
+
+
+def clear_time_cache(b_remove_callbacks=False):
+
+    """
+    !@Brief Clear cached scene ranges.
+
+    @type b_remove_callbacks: bool
+    @param b_remove_callbacks: Remove callbacks too. Default is False.
+    """
+
+    _TIME_RANGES.clear()
+
+    if b_remove_callbacks is True:
+        for i_callback in _TIME_CALLBACKS:
+            OpenMaya.MMessage.removeCallback(i_callback)
+        del _TIME_CALLBACKS[:]
 
 
 def get_time(f_time=None, b_full=True, b_set=False, b_end=False):
@@ -82,11 +1402,8 @@ def get_time(f_time=None, b_full=True, b_set=False, b_end=False):
     @return: Start frame in MTime.
     """
 
-    anim_control = OpenMayaAnim.MAnimControl()
-    if b_end is True:
-        mt_time = anim_control.animationEndTime() if b_full is True else anim_control.maxTime()
-    else:
-        mt_time = anim_control.animationStartTime() if b_full is True else anim_control.minTime()
+    time_range = TimeRange.scene(b_full=b_full)
+    mt_time = time_range.end_time if b_end is True else time_range.start_time
 
     #   No float given
     if f_time is None:
@@ -123,7 +1440,8 @@ def set_time(mt_time, b_full=True, b_end=False):
 
     """
 
-    anim_control = OpenMayaAnim.MAnimControl()
+    anim_control = OpenMayaAnim.MAnimControl
+    _TIME_RANGES.clear()
 
     if b_end is True:
         if b_full is True:
@@ -146,4 +1464,4 @@ def current_time():
     @return: Current frame in MTime.
     """
 
-    return OpenMayaAnim.MAnimControl().currentTime()
+    return OpenMayaAnim.MAnimControl.currentTime()
@@ -8,9 +8,256 @@
 #   Import Modules
 # ====================================
 
+import fnmatch
+
 from maya import cmds, OpenMaya
 
 
+# ====================================
+#   Resolver
+# ====================================
+
+_RESOLVER_CACHE = dict()
+_RESOLVER_STATS = {"hits": 0, "misses": 0}
+_RESOLVER_CALLBACKS = list()
+
+
+def __check_name(s_node):
+
+    """
+    !@Brief Check node name type.
+    """
+
+    if not isinstance(s_node, basestring):
+        raise RuntimeError('Node name must be a string not "{0}"'.format(type(s_node)))
+
+
+def __register_resolver_callbacks():
+
+    """
+    !@Brief Register callbacks that clear resolver cache when names or hierarchy may change.
+    """
+
+    _RESOLVER_CALLBACKS.extend([
+        OpenMaya.MNodeMessage.addNameChangedCallback(OpenMaya.MObject(), __on_names_changed),
+        OpenMaya.MDGMessage.addNodeRemovedCallback(__on_names_changed, "dependNode"),
+        OpenMaya.MDGMessage.addNodeAddedCallback(__on_names_changed, "dependNode"),
+        OpenMaya.MDagMessage.addAllDagChangesCallback(__on_names_changed),
+        OpenMaya.MSceneMessage.addCallback(OpenMaya.MSceneMessage.kAfterNew, __on_names_changed),
+        OpenMaya.MSceneMessage.addCallback(OpenMaya.MSceneMessage.kAfterOpen, __on_names_changed)
+    ])
+
+
+def __on_names_changed(*args):
+
+    """
+    !@Brief Rename, add, delete or reparent callback. Clear resolver cache.
+    """
+
+    if _RESOLVER_CACHE:
+        _RESOLVER_CACHE.clear()
+
+
+def __from_cache(s_node):
+
+    """
+    !@Brief Get cached node if still valid.
+
+    @rtype: OpenMaya.MObject / None
+    @return: Cached node. None if not cached or deleted.
+    """
+
+    moh_node = _RESOLVER_CACHE.get(s_node)
+    if moh_node is not None:
+        if moh_node.isValid() is True:
+            _RESOLVER_STATS["hits"] += 1
+            return moh_node.object()
+        del _RESOLVER_CACHE[s_node]
+
+    _RESOLVER_STATS["misses"] += 1
+
+    return None
+
+
+def __resolve(a_nodes):
+
+    """
+    !@Brief Resolve names not in cache through one MSelectionList and cache them.
+
+    @type a_nodes: list(str)
+    @param a_nodes: Node names.
+
+    @rtype: dict
+    @return: {name: OpenMaya.MObject} of all names.
+    """
+
+    d_objects = dict()
+    a_missing = list()
+    for s_node in a_nodes:
+        __check_name(s_node)
+        if s_node in d_objects:
+            continue
+        mo_node = __from_cache(s_node)
+        if mo_node is None:
+            a_missing.append(s_node)
+        d_objects[s_node] = mo_node
+
+    if not a_missing:
+        return d_objects
+
+    if len(_RESOLVER_CALLBACKS) == 0:
+        __register_resolver_callbacks()
+
+    #   One selection list for all names. Names that don't add exactly one item
+    #   (same node given twice, pattern) are resolved alone.
+    selection_list = OpenMaya.MSelectionList()
+    d_indices = dict()
+    a_alone = list()
+    for s_node in a_missing:
+        i_length = selection_list.length()
+        try:
+            selection_list.add(s_node)
+        except RuntimeError:
+            raise RuntimeError('Node "{0}" not found !'.format(s_node))
+        if selection_list.length() == i_length + 1:
+            d_indices[s_node] = i_length
+        else:
+            a_alone.append(s_node)
+
+    for s_node, i_index in d_indices.items():
+        mo_node = OpenMaya.MObject()
+        selection_list.getDependNode(i_index, mo_node)
+        d_objects[s_node] = mo_node
+
+    for s_node in a_alone:
+        selection_list = OpenMaya.MSelectionList()
+        selection_list.add(s_node)
+        mo_node = OpenMaya.MObject()
+        selection_list.getDependNode(0, mo_node)
+        d_objects[s_node] = mo_node
+
+    for s_node in a_missing:
+        _RESOLVER_CACHE[s_node] = OpenMaya.MObjectHandle(d_objects[s_node])
+
+    return d_objects
+
+
+def get_objects(a_nodes):
+
+    """
+    !@Brief Get MObjects of many node names. Names not in cache are resolved with one MSelectionList.
+
+    @type a_nodes: list(str)
+    @param a_nodes: Node names.
+
+    @rtype: list(OpenMaya.MObject)
+    @return: Maya MObjects in same order.
+    """
+
+    d_objects = __resolve(a_nodes)
+
+    return [d_objects[s_node] for s_node in a_nodes]
+
+
+def get_paths(a_nodes):
+
+    """
+    !@Brief Get MDagPaths of many node names. Names not in cache are resolved with one MSelectionList.
+
+    @type a_nodes: list(str)
+    @param a_nodes: Node names.
+
+    @rtype: list(OpenMaya.MDagPath)
+    @return: Maya MDagPaths in same order.
+    """
+
+    d_objects = __resolve(a_nodes)
+
+    a_paths = list()
+    for s_node in a_nodes:
+        mo_node = d_objects[s_node]
+        if mo_node.hasFn(OpenMaya.MFn.kDagNode) is False:
+            raise RuntimeError('Node "{0}" is not a dag node !'.format(s_node))
+        m_dag_path = OpenMaya.MDagPath()
+        if OpenMaya.MFnDagNode(mo_node).isInstanced() is True:
+            #   Path of given instance
+            selection_list = OpenMaya.MSelectionList()
+            selection_list.add(s_node)
+            selection_list.getDagPath(0, m_dag_path)
+        else:
+            OpenMaya.MDagPath.getAPathTo(mo_node, m_dag_path)
+        a_paths.append(m_dag_path)
+
+    return a_paths
+
+
+def get_plugs(a_plugs):
+
+    """
+    !@Brief Get MPlugs of many plug names with one MSelectionList.
+
+    @type a_plugs: list(str)
+    @param a_plugs: Plug names "node.attribute".
+
+    @rtype: list(OpenMaya.MPlug)
+    @return: Maya MPlugs in same order.
+    """
+
+    selection_list = OpenMaya.MSelectionList()
+    a_indices = list()
+    for s_plug in a_plugs:
+        __check_name(s_plug)
+        i_length = selection_list.length()
+        selection_list.add(s_plug)
+        a_indices.append(i_length if selection_list.length() == i_length + 1 else None)
+
+    a_result = list()
+    for s_plug, i_index in zip(a_plugs, a_indices):
+        m_plug = OpenMaya.MPlug()
+        if i_index is None:
+            a_result.append(get_plug(s_plug))
+        else:
+            selection_list.getPlug(i_index, m_plug)
+            a_result.append(m_plug)
+
+    return a_result
+
+
+def resolver_stats():
+
+    """
+    !@Brief Get resolver cache counters.
+
+    @rtype: dict
+    @return: {"hits": int, "misses": int, "size": int}
+    """
+
+    return {"hits": _RESOLVER_STATS["hits"], "misses": _RESOLVER_STATS["misses"], "size": len(_RESOLVER_CACHE)}
+
+
+def clear_resolver_cache(b_remove_callbacks=False, b_reset_stats=False):
+
+    """
+    !@Brief Clear resolver cache.
+
+    @type b_remove_callbacks: bool
+    @param b_remove_callbacks: Remove callbacks too. Default is False.
+    @type b_reset_stats: bool
+    @param b_reset_stats: Reset hit / miss counters. Default is False.
+    """
+
+    _RESOLVER_CACHE.clear()
+
+    if b_reset_stats is True:
+        _RESOLVER_STATS["hits"] = 0
+        _RESOLVER_STATS["misses"] = 0
+
+    if b_remove_callbacks is True:
+        for i_callback in _RESOLVER_CALLBACKS:
+            OpenMaya.MMessage.removeCallback(i_callback)
+        del _RESOLVER_CALLBACKS[:]
+
+
 # ====================================
 #   Misc functions
 # ====================================
@@ -27,18 +274,7 @@ def get_object(s_node):
     @return: Maya MObject object.
     """
 
-    if not isinstance(s_node, basestring):
-        raise RuntimeError('Node name must be a string not "{0}"'.format(type(s_node)))
-
-    #   Get PyNode in MSelectionList
-    selection_list = OpenMaya.MSelectionList()
-    selection_list.add(s_node)
-
-    #   Get MDagPath
-    m_object = OpenMaya.MObject()
-    selection_list.getDependNode(0, m_object)
-
-    return m_object
+    return get_objects([s_node])[0]
 
 
 def get_path(s_node):
@@ -53,18 +289,7 @@ def get_path(s_node):
     @return: Maya MDagPath object.
     """
 
-    if not isinstance(s_node, basestring):
-        raise RuntimeError('Node name must be a string not "{0}"'.format(type(s_node)))
-
-    #   Get PyNode in MSelectionList
-    selection_list = OpenMaya.MSelectionList()
-    selection_list.add(s_node)
-
-    #   Get MDagPath
-    m_dag_path = OpenMaya.MDagPath()
-    selection_list.getDagPath(0, m_dag_path)
-
-    return m_dag_path
+    return get_paths([s_node])[0]
 
 
 def get_plug(s_node):
@@ -86,13 +311,99 @@ def get_plug(s_node):
     selection_list = OpenMaya.MSelectionList()
     selection_list.add(s_node)
 
-    #   Get MDagPath
-    m_plug = OpenMaya.MDagPath()
+    #   Get MPlug
+    m_plug = OpenMaya.MPlug()
     selection_list.getPlug(0, m_plug)
 
     return m_plug
 
 
+def iter_children(
+        mo_node, mfn_type=OpenMaya.MFn.kInvalid, b_breadth=True, i_depth=None,
+        prune=None, accept=None, s_pattern=None, b_shape=True, b_root=False, s_yield="object"):
+
+    """
+    !@Brief Iterate descendents of node without building list. Iteration can be stopped at any time.
+
+    @type mo_node: OpenMaya.MObject
+    @param mo_node: Root node.
+    @type mfn_type: OpenMaya.MFn
+    @param mfn_type: Type of yielded nodes. Default is all dag nodes.
+    @type b_breadth: bool
+    @param b_breadth: If True breadth first else depth first. Default is True.
+    @type i_depth: int
+    @param i_depth: Max depth below root, 1 for direct children. No limit if None.
+    @type prune: function
+    @param prune: Called with MObject of visited node, if True nodes below it are skipped.
+    @type accept: function
+    @param accept: Called with MObject of node, node is yielded only if True.
+    @type s_pattern: str
+    @param s_pattern: fnmatch pattern on short name of yielded nodes.
+    @type b_shape: bool
+    @param b_shape: Yield shapes.
+    @type b_root: bool
+    @param b_root: Yield root node too. Default is False.
+    @type s_yield: str
+    @param s_yield: "object" (OpenMaya.MObject), "path" (OpenMaya.MDagPath), "name" (partial path name)
+                    or "full_name" (full path name).
+
+    @rtype: generator
+    @return: Nodes.
+    """
+
+    if isinstance(mo_node, OpenMaya.MObject) is False:
+        raise TypeError("Invalid object given. Node must be a MObject not {0}".format(type(mo_node)))
+    if s_yield not in ("object", "path", "name", "full_name"):
+        raise ValueError('Yield type must be "object", "path", "name" or "full_name" not {0}'.format(s_yield))
+
+    i_traversal = OpenMaya.MItDag.kBreadthFirst if b_breadth else OpenMaya.MItDag.kDepthFirst
+
+    #   Type filter is pushed into iterator, except with depth limit or prune because
+    #   iterator must stop on all nodes to prune them.
+    b_filter = i_depth is None and prune is None
+    i_filter = mfn_type if b_filter else OpenMaya.MFn.kInvalid
+    it_dag = OpenMaya.MItDag(i_traversal, i_filter)
+    it_dag.reset(mo_node, i_traversal, i_filter)
+
+    #   Without type filter root is first item, depth is relative to it.
+    i_root_depth = None
+
+    while not it_dag.isDone():
+        mo_current = it_dag.currentItem()
+        b_is_root = mo_current == mo_node
+
+        #   Pruning
+        b_prune = False
+        if i_depth is not None:
+            if i_root_depth is None:
+                i_root_depth = it_dag.depth()
+            b_prune = it_dag.depth() - i_root_depth >= i_depth
+        if b_prune is False and prune is not None:
+            b_prune = bool(prune(mo_current))
+        if b_prune is True:
+            it_dag.prune()
+
+        if (
+            (b_root or not b_is_root) and
+            (b_filter or mfn_type == OpenMaya.MFn.kInvalid or mo_current.hasFn(mfn_type)) and
+            (b_shape or not mo_current.hasFn(OpenMaya.MFn.kShape)) and
+            (s_pattern is None or fnmatch.fnmatchcase(OpenMaya.MFnDependencyNode(mo_current).name(), s_pattern)) and
+            (accept is None or accept(mo_current))
+        ):
+            if s_yield == "object":
+                yield mo_current
+            elif s_yield == "path":
+                dp_current = OpenMaya.MDagPath()
+                it_dag.getPath(dp_current)
+                yield dp_current
+            elif s_yield == "name":
+                yield it_dag.partialPathName()
+            else:
+                yield it_dag.fullPathName()
+
+        it_dag.next()
+
+
 def get_children(mo_node, traversal_type=True, mfn_type=OpenMaya.MFn.kTransform, b_all_descendents=False, b_shape=True):
     
     """
@@ -105,47 +416,19 @@ def get_children(mo_node, traversal_type=True, mfn_type=OpenMaya.MFn.kTransform,
     @type mfn_type: OpenMaya.MFn
     @param mfn_type: If you want to surch type of node. Default is all node.
     @type b_all_descendents: bool
-    @param b_all_descendents: Get all descendents.
+    @param b_all_descendents: Get all descendents. Root is included if it match type.
     @type b_shape: bool
     @param b_shape: Get shape.
 
-    @rtype: OpenMaya.MDagPathArray
+    @rtype: OpenMaya.MObjectArray
     @return: list of children.
     """
 
     moa_childrens = OpenMaya.MObjectArray()
-
-    #   Check
-    if isinstance(mo_node, OpenMaya.MObject) is False:
-        raise TypeError("Invalid object given. Node must be a MObject not {0}".format(type(mo_node)))
-
-    #   Get node directly below
-    if not b_all_descendents:
-        mfn_node = OpenMaya.MFnDagNode(mo_node)
-        for i in range(mfn_node.childCount()):
-            mo_child = mfn_node.child(i)
-            if not b_shape and mo_child.hasFn(OpenMaya.MFn.kShape):
-                continue
-            if not mo_child.hasFn(mfn_type):
-                continue
-            moa_childrens.append(mo_child)
-    #   Get all Descendents
-    else:
-        #   Get parsing type
-        mit_dag_parsing = OpenMaya.MItDag.kBreadthFirst
-        if not traversal_type:
-            mit_dag_parsing = OpenMaya.MItDag.kDepthFirst
-        #   Create Iterator
-        it_dag = OpenMaya.MItDag(mit_dag_parsing, mfn_type)
-        it_dag.reset(mo_node, mit_dag_parsing, mfn_type)
-        #   Parse iterator
-        moa_childrens = OpenMaya.MObjectArray()
-        while not it_dag.isDone():
-            dp_current_item = OpenMaya.MDagPath()
-            it_dag.getPath(dp_current_item)
-            if dp_current_item.hasFn(mfn_type):
-                moa_childrens.append(dp_current_item.node())
-            it_dag.next()
+    for mo_child in iter_children(
+            mo_node, mfn_type=mfn_type, b_breadth=traversal_type, i_depth=None if b_all_descendents else 1,
+            b_shape=b_shape, b_root=b_all_descendents):
+        moa_childrens.append(mo_child)
 
     return moa_childrens
 
@@ -9,9 +9,19 @@
 # ===================================================
 
 import logging
+import functools
+import collections
 import qdMatrix
+import perfUtils
+import undoUtils
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 from maya import cmds, OpenMaya
+from maya.api import OpenMaya as OpenMaya2
 
 from CoreScripts.qdHelpers.qdLog import QDLog
 from CoreScripts.qdHelpers.qdAttributes import QDAttributeABC, QDAttributeEnum, QDAttribute
@@ -108,37 +118,94 @@ class QDTypes(object):
 #   Misc
 # ===================================================
 
-def __msu_ptr(s_type):
+_COMPOUND_NUMERIC = frozenset([
+    OpenMaya.MFnNumericData.k2Short, OpenMaya.MFnNumericData.k3Short,
+    OpenMaya.MFnNumericData.k2Int, OpenMaya.MFnNumericData.k3Int,
+    OpenMaya.MFnNumericData.k2Long, OpenMaya.MFnNumericData.k3Long,
+    OpenMaya.MFnNumericData.k2Float, OpenMaya.MFnNumericData.k3Float,
+    OpenMaya.MFnNumericData.k2Double, OpenMaya.MFnNumericData.k3Double, OpenMaya.MFnNumericData.k4Double
+])
+
+
+_API2_PLUGS = collections.OrderedDict()
+
+
+def __api2_plug(mp_attr):
 
     """
-    !@Brief Create maya short pointer
+    !@Brief Get api 2.0 plug of api 1.0 plug. Api 2.0 plugs are cached by node handle and plug name,
+            so path and MSelectionList are built once by plug. Cache share size and clear of descriptor cache.
 
-    @type s_type: str / unicode
-    @param s_type: Value type (float, double, in, short).
+    @type mp_attr: OpenMaya.MPlug
+    @param mp_attr: Api 1.0 plug.
 
-    @rtype: ptr
-    @return: Maya script util pointer.
+    @rtype: OpenMaya2.MPlug
+    @return: Same plug in api 2.0.
     """
 
-    msu = OpenMaya.MScriptUtil()
+    mo_node = mp_attr.node()
+    moh_node = OpenMaya.MObjectHandle(mo_node)
+    s_attr = mp_attr.partialName(False, True, True, False, True, True)
+    t_key = (moh_node.hashCode(), s_attr)
 
-    if s_type == "int" or s_type == "short":
-        msu.createFromInt(0)
-        if s_type == "int":
-            return msu.asIntPtr()
-        else:
-            return msu.asShortPtr()
-    elif s_type == "double":
-        msu.createFromDouble(0.0)
-        if s_type == "double":
-            return msu.asDoublePtr()
+    entry = _API2_PLUGS.pop(t_key, None)
+    if entry is None or entry[0].isAlive() is False:
+        if mo_node.hasFn(OpenMaya.MFn.kDagNode) is True:
+            s_node = OpenMaya.MFnDagNode(mo_node).fullPathName()
         else:
-            return msu.asFloatPtr()
-    else:
-        s_msg = "Invalid type given {0}.\n\tValid type are float, double, in or short".format(s_type)
+            s_node = OpenMaya.MFnDependencyNode(mo_node).name()
+        msl = OpenMaya2.MSelectionList()
+        msl.add("{0}.{1}".format(s_node, s_attr))
+        entry = (moh_node, msl.getPlug(0))
+        if len(_API2_PLUGS) >= _DESCRIPTOR_CACHE_SIZE:
+            _API2_PLUGS.popitem(last=False)
+
+    _API2_PLUGS[t_key] = entry
+
+    return entry[1]
+
+
+def __get_numeric_data(mp_attr):
+
+    """
+    !@Brief Get all components of compound numeric attribute (k2Short, k3Float, k4Double, ...)
+            in one api 2.0 call, no pointer or child plug by component.
+
+    @type mp_attr: OpenMaya.MPlug
+    @param mp_attr: Attribute plug object.
+
+    @rtype: tuple
+    @return: Attribute values.
+    """
+
+    return tuple(OpenMaya2.MFnNumericData(__api2_plug(mp_attr).asMObject()).getData())
+
+
+def __set_numeric_data(mp_attr, value, i_type):
+
+    """
+    !@Brief Set all components of compound numeric attribute (k2Short, k3Float, k4Double, ...)
+            in one api 2.0 call.
+
+    @type mp_attr: OpenMaya.MPlug
+    @param mp_attr: Attribute plug object.
+    @type value: list / tuple
+    @param value: New attribute values.
+    @type i_type: int
+    @param i_type: Numeric type (OpenMaya.MFnNumericData).
+    """
+
+    if isinstance(value, (list, tuple)) is False or len(value) != mp_attr.numChildren():
+        s_msg = "Argument must be a list of {0} values not {1}".format(mp_attr.numChildren(), value)
         qd_logger.error(s_msg)
         raise TypeError(s_msg)
 
+    #   MFnNumericData enum is shared by both api.
+    mfn_data = OpenMaya2.MFnNumericData()
+    mo_data = mfn_data.create(i_type)
+    mfn_data.setData(list(value))
+    __api2_plug(mp_attr).setMObject(mo_data)
+
 
 def edit_enum_name(mp_attr, value):
 
@@ -948,6 +1015,175 @@ def unhide(*args, **kwargs):
     return hide(*args, **kwargs)
 
 
+# ===================================================
+#   Plug descriptor
+# ===================================================
+
+_DESCRIPTOR_CACHE_SIZE = 4096
+_DESCRIPTORS = collections.OrderedDict()
+_DESCRIPTOR_CALLBACKS = list()
+
+
+class _PlugDescriptor(object):
+
+    """
+    !@Brief Resolved getter / setter of an attribute.
+    """
+
+    __slots__ = ("handle", "getter", "setter", "i_unit", "reader")
+
+    def __init__(self, moh_attr, getter, setter, i_unit=None):
+        self.handle = moh_attr
+        self.getter = getter
+        self.setter = setter
+        self.i_unit = i_unit
+        self.reader = None
+
+
+def _unsupported(s_msg, exception=TypeError):
+
+    """
+    !@Brief Build getter / setter that raise error for unsupported attribute.
+
+    @type s_msg: str
+    @param s_msg: Error message. Formated with plug info.
+    @type exception: Exception
+    @param exception: Exception class raised.
+
+    @rtype: function
+    @return: Function raising exception.
+    """
+
+    def _raise(mp_attr, *args, **kwargs):
+        s_error = s_msg.format(mp_attr.info())
+        qd_logger.error(s_error)
+        raise exception(s_error)
+
+    return _raise
+
+
+def _build_descriptor(moh_attr):
+
+    """
+    !@Brief Resolve attribute type and build its descriptor.
+
+    @type moh_attr: OpenMaya.MObjectHandle
+    @param moh_attr: Attribute object handle.
+
+    @rtype: _PlugDescriptor
+    @return: Attribute descriptor.
+    """
+
+    mo_attr = moh_attr.object()
+
+    if mo_attr.hasFn(OpenMaya.MFn.kNumericAttribute) is True:
+        i_unit = OpenMaya.MFnNumericAttribute(mo_attr).unitType()
+        getter = functools.partial(__get_numeric, i_type=i_unit)
+        setter = functools.partial(__set_numeric, i_type=i_unit)
+    elif mo_attr.hasFn(OpenMaya.MFn.kTypedAttribute) is True:
+        i_unit = OpenMaya.MFnTypedAttribute(mo_attr).attrType()
+        getter = functools.partial(__get_typed, i_type=i_unit)
+        setter = functools.partial(__set_typed, i_type=i_unit)
+    elif mo_attr.hasFn(OpenMaya.MFn.kUnitAttribute) is True:
+        i_unit = OpenMaya.MFnUnitAttribute(mo_attr).unitType()
+        getter = functools.partial(__get_unit, i_type=i_unit)
+        setter = functools.partial(__set_unit, i_type=i_unit)
+    elif mo_attr.hasFn(OpenMaya.MFn.kMatrixAttribute) is True or mo_attr.hasFn(OpenMaya.MFn.kFloatMatrixAttribute) is True:
+        i_unit = None
+        getter = __get_matrix
+        setter = __set_matrix
+    elif mo_attr.hasFn(OpenMaya.MFn.kEnumAttribute) is True:
+        i_unit = None
+        getter = __get_enum
+        setter = __set_enum
+    elif mo_attr.hasFn(OpenMaya.MFn.kCompoundAttribute) is True:
+        i_unit = None
+        getter = __get_compound
+        setter = _unsupported("Impossible to set compound attribute -- {0}", exception=Exception)
+    elif mo_attr.hasFn(OpenMaya.MFn.kMessageAttribute) is True:
+        i_unit = None
+        getter = _unsupported("Impossible to get message attribute")
+        setter = _unsupported("Impossible to set message attribute")
+    else:
+        i_unit = None
+        getter = _unsupported("Invalid plug type given -- {0}")
+        setter = getter
+
+    return _PlugDescriptor(moh_attr, getter, setter, i_unit=i_unit)
+
+
+def _descriptor(mo_attr):
+
+    """
+    !@Brief Get cached descriptor of attribute.
+            Cache is keyed by attribute handle, bounded in size (least recently used are dropped)
+            and cleared when scene change.
+
+    @type mo_attr: OpenMaya.MObject
+    @param mo_attr: Attribute object.
+
+    @rtype: _PlugDescriptor
+    @return: Attribute descriptor.
+    """
+
+    moh_attr = OpenMaya.MObjectHandle(mo_attr)
+    i_key = moh_attr.hashCode()
+
+    descriptor = _DESCRIPTORS.pop(i_key, None)
+    if descriptor is None or descriptor.handle.isAlive() is False:
+        if len(_DESCRIPTOR_CALLBACKS) == 0:
+            __register_descriptor_callbacks()
+        descriptor = _build_descriptor(moh_attr)
+        if len(_DESCRIPTORS) >= _DESCRIPTOR_CACHE_SIZE:
+            _DESCRIPTORS.popitem(last=False)
+
+    _DESCRIPTORS[i_key] = descriptor
+
+    return descriptor
+
+
+def __register_descriptor_callbacks():
+
+    """
+    !@Brief Register scene callbacks that clear descriptor cache.
+    """
+
+    for i_message in [
+            OpenMaya.MSceneMessage.kAfterNew,
+            OpenMaya.MSceneMessage.kAfterOpen,
+            OpenMaya.MSceneMessage.kAfterRemoveReference,
+            OpenMaya.MSceneMessage.kAfterUnloadReference]:
+        _DESCRIPTOR_CALLBACKS.append(OpenMaya.MSceneMessage.addCallback(i_message, __on_scene_changed))
+
+
+def __on_scene_changed(*args):
+
+    """
+    !@Brief Scene callback. Clear descriptor cache.
+    """
+
+    _DESCRIPTORS.clear()
+    _API2_PLUGS.clear()
+
+
+def clear_descriptor_cache(b_remove_callbacks=False):
+
+    """
+    !@Brief Clear cache of resolved attribute getter / setter.
+
+    @type b_remove_callbacks: bool
+    @param b_remove_callbacks: Remove scene callbacks too. Default is False.
+    """
+
+    _DESCRIPTORS.clear()
+    _API2_PLUGS.clear()
+
+    if b_remove_callbacks is True:
+        for i_callback in _DESCRIPTOR_CALLBACKS:
+            OpenMaya.MMessage.removeCallback(i_callback)
+        del _DESCRIPTOR_CALLBACKS[:]
+
+
 # ===================================================
 #   Getter
 # ===================================================
@@ -1005,38 +1241,18 @@ def get(*args):
         return a_value
 
     #   Else
-    mo_attr = mp_attr.attribute()
-    if mo_attr.hasFn(OpenMaya.MFn.kNumericAttribute) is True:
-        return __get_numeric(mp_attr)
-    elif mo_attr.hasFn(OpenMaya.MFn.kTypedAttribute) is True:
-        return __get_typed(mp_attr)
-    elif mo_attr.hasFn(OpenMaya.MFn.kUnitAttribute) is True:
-        return __get_unit(mp_attr)
-    elif mo_attr.hasFn(OpenMaya.MFn.kMatrixAttribute) is True:
-        return __get_matrix(mp_attr)
-    elif mo_attr.hasFn(OpenMaya.MFn.kFloatMatrixAttribute) is True:
-        return __get_matrix(mp_attr)
-    elif mo_attr.hasFn(OpenMaya.MFn.kEnumAttribute) is True:
-        return __get_enum(mp_attr)
-    elif mo_attr.hasFn(OpenMaya.MFn.kCompoundAttribute) is True:
-        return __get_compound(mp_attr)
-    elif mo_attr.hasFn(OpenMaya.MFn.kMessageAttribute) is True:
-        s_msg = "Impossible to get message attribute"
-        qd_logger.error(s_msg)
-        raise TypeError(s_msg)
-    else:
-        s_msg = "Invalid plug type given -- {0}".format(mo_attr.apiTypeStr())
-        qd_logger.error(s_msg)
-        raise TypeError(s_msg)
+    return _descriptor(mp_attr.attribute()).getter(mp_attr)
 
 
-def __get_typed(mp_attr):
+def __get_typed(mp_attr, i_type=None):
 
     """
     !@Brief Get typed attribute.
 
     @type mp_attr: OpenMaya.MPlug
     @param mp_attr: Attribute plug object.
+    @type i_type: int
+    @param i_type: Attribute unit / data type. Resolved from attribute if None.
 
     @rtype: unknow
     @return: Attribute value.
@@ -1049,8 +1265,8 @@ def __get_typed(mp_attr):
         raise TypeError(s_msg)
 
     #   Get
-    mfn_attr = OpenMaya.MFnTypedAttribute(mp_attr.attribute())
-    i_type = mfn_attr.attrType()
+    if i_type is None:
+        i_type = OpenMaya.MFnTypedAttribute(mp_attr.attribute()).attrType()
 
     if i_type == OpenMaya.MFnData.kNumeric:
         return __get_numeric(mp_attr)
@@ -1076,13 +1292,15 @@ def __get_typed(mp_attr):
         raise TypeError(s_msg)
 
 
-def __get_numeric(mp_attr):
+def __get_numeric(mp_attr, i_type=None):
 
     """
     !@Brief Get numeric attribute.
 
     @type mp_attr: OpenMaya.MPlug
     @param mp_attr: Attribute plug object.
+    @type i_type: int
+    @param i_type: Attribute unit / data type. Resolved from attribute if None.
 
     @rtype: unknow
     @return: Attribute value.
@@ -1095,8 +1313,8 @@ def __get_numeric(mp_attr):
         raise TypeError(s_msg)
 
     #   Get
-    mfn_attr = OpenMaya.MFnNumericAttribute(mp_attr.attribute())
-    i_type = mfn_attr.unitType()
+    if i_type is None:
+        i_type = OpenMaya.MFnNumericAttribute(mp_attr.attribute()).unitType()
 
     if i_type == OpenMaya.MFnNumericData.kBoolean:
         return mp_attr.asBool()
@@ -1106,83 +1324,16 @@ def __get_numeric(mp_attr):
         return mp_attr.asChar()
     elif i_type == OpenMaya.MFnNumericData.kShort:
         return mp_attr.asShort()
-    elif i_type == OpenMaya.MFnNumericData.k2Short:
-        mfn_data = OpenMaya.MFnNumericData(mp_attr.asMObject())
-        ptr_v1 = __msu_ptr("short")
-        ptr_v2 = __msu_ptr("short")
-        mfn_data.getData2Short(ptr_v1, ptr_v2)
-        msu = OpenMaya.MScriptUtil()
-        return msu.getShort(ptr_v1), msu.getShort(ptr_v2)
-    elif i_type == OpenMaya.MFnNumericData.k3Short:
-        mfn_data = OpenMaya.MFnNumericData(mp_attr.asMObject())
-        ptr_v1 = __msu_ptr("short")
-        ptr_v2 = __msu_ptr("short")
-        ptr_v3 = __msu_ptr("short")
-        mfn_data.getData3Short(ptr_v1, ptr_v2, ptr_v3)
-        msu = OpenMaya.MScriptUtil()
-        return msu.getShort(ptr_v1), msu.getShort(ptr_v2), msu.getShort(ptr_v3)
+    elif i_type in _COMPOUND_NUMERIC:
+        return __get_numeric_data(mp_attr)
     elif i_type == OpenMaya.MFnNumericData.kAddr:
         return
-    elif i_type == OpenMaya.MFnNumericData.kInt:
+    elif i_type == OpenMaya.MFnNumericData.kInt or i_type == OpenMaya.MFnNumericData.kLong:
         return mp_attr.asInt()
-    elif i_type == OpenMaya.MFnNumericData.k2Int:
-        mfn_data = OpenMaya.MFnNumericData(mp_attr.asMObject())
-        ptr_v1 = __msu_ptr("int")
-        ptr_v2 = __msu_ptr("int")
-        mfn_data.getData2Int(ptr_v1, ptr_v2)
-        msu = OpenMaya.MScriptUtil()
-        return msu.getInt(ptr_v1), msu.getInt(ptr_v2)
-    elif i_type == OpenMaya.MFnNumericData.k3Int:
-        mfn_data = OpenMaya.MFnNumericData(mp_attr.asMObject())
-        ptr_v1 = __msu_ptr("int")
-        ptr_v2 = __msu_ptr("int")
-        ptr_v3 = __msu_ptr("int")
-        mfn_data.getData3Int(ptr_v1, ptr_v2, ptr_v3)
-        msu = OpenMaya.MScriptUtil()
-        return msu.getInt(ptr_v1), msu.getInt(ptr_v2), msu.getInt(ptr_v3)
     elif i_type == OpenMaya.MFnNumericData.kFloat:
         return mp_attr.asFloat()
-    elif i_type == OpenMaya.MFnNumericData.k2Float:
-        mfn_data = OpenMaya.MFnNumericData(mp_attr.asMObject())
-        ptr_v1 = __msu_ptr("float")
-        ptr_v2 = __msu_ptr("float")
-        mfn_data.getData2Float(ptr_v1, ptr_v2)
-        msu = OpenMaya.MScriptUtil()
-        return msu.getFloat(ptr_v1), msu.getFloat(ptr_v2)
-    elif i_type == OpenMaya.MFnNumericData.k3Float:
-        mfn_data = OpenMaya.MFnNumericData(mp_attr.asMObject())
-        ptr_v1 = __msu_ptr("float")
-        ptr_v2 = __msu_ptr("float")
-        ptr_v3 = __msu_ptr("float")
-        mfn_data.getData3Float(ptr_v1, ptr_v2, ptr_v3)
-        msu = OpenMaya.MScriptUtil()
-        return msu.getFloat(ptr_v1), msu.getFloat(ptr_v2), msu.getFloat(ptr_v3)
     elif i_type == OpenMaya.MFnNumericData.kDouble:
         return mp_attr.asDouble()
-    elif i_type == OpenMaya.MFnNumericData.k2Double:
-        mfn_data = OpenMaya.MFnNumericData(mp_attr.asMObject())
-        ptr_v1 = __msu_ptr("double")
-        ptr_v2 = __msu_ptr("double")
-        mfn_data.getData2Double(ptr_v1, ptr_v2)
-        msu = OpenMaya.MScriptUtil()
-        return msu.getDouble(ptr_v1), msu.getDouble(ptr_v2)
-    elif i_type == OpenMaya.MFnNumericData.k3Double:
-        mfn_data = OpenMaya.MFnNumericData(mp_attr.asMObject())
-        ptr_v1 = __msu_ptr("double")
-        ptr_v2 = __msu_ptr("double")
-        ptr_v3 = __msu_ptr("double")
-        mfn_data.getData3Double(ptr_v1, ptr_v2, ptr_v3)
-        msu = OpenMaya.MScriptUtil()
-        return msu.getDouble(ptr_v1), msu.getDouble(ptr_v2), msu.getDouble(ptr_v3)
-    elif i_type == OpenMaya.MFnNumericData.k4Double:
-        mfn_data = OpenMaya.MFnNumericData(mp_attr.asMObject())
-        ptr_v1 = __msu_ptr("double")
-        ptr_v2 = __msu_ptr("double")
-        ptr_v3 = __msu_ptr("double")
-        ptr_v4 = __msu_ptr("double")
-        mfn_data.getData4Double(ptr_v1, ptr_v2, ptr_v3, ptr_v4)
-        msu = OpenMaya.MScriptUtil()
-        return msu.getDouble(ptr_v1), msu.getDouble(ptr_v2), msu.getDouble(ptr_v3), msu.getDouble(ptr_v4)
     elif i_type == OpenMaya.MFnNumericData.kInvalid:
         s_msg = "kInvalid type not implemented yet -- {0}".format(mp_attr.info())
         qd_logger.error(s_msg)
@@ -1193,13 +1344,15 @@ def __get_numeric(mp_attr):
         raise TypeError(s_msg)
 
 
-def __get_unit(mp_attr):
+def __get_unit(mp_attr, i_type=None):
 
     """
     !@Brief Get unit attribute.
 
     @type mp_attr: OpenMaya.MPlug
     @param mp_attr: Attribute plug object.
+    @type i_type: int
+    @param i_type: Attribute unit / data type. Resolved from attribute if None.
 
     @rtype: float
     @return: Attribute value.
@@ -1212,8 +1365,8 @@ def __get_unit(mp_attr):
         raise TypeError(s_msg)
 
     #   Get
-    mfn_attr = OpenMaya.MFnUnitAttribute(mp_attr.attribute())
-    i_type = mfn_attr.unitType()
+    if i_type is None:
+        i_type = OpenMaya.MFnUnitAttribute(mp_attr.attribute()).unitType()
 
     if i_type == OpenMaya.MFnUnitAttribute.kAngle:
         return mp_attr.asMAngle().value()
@@ -1315,6 +1468,259 @@ def __get_compound(mp_attr):
     return a_value
 
 
+# ===================================================
+#   Bulk getter
+# ===================================================
+
+def _matrix_rows(mm):
+
+    """
+    !@Brief Convert MMatrix to nested rows.
+
+    @type mm: OpenMaya.MMatrix
+    @param mm: Matrix to convert.
+
+    @rtype: list
+    @return: 4x4 nested list of floats.
+    """
+
+    return [[mm(i, j) for j in range(4)] for i in range(4)]
+
+
+def _handle_reader(mo_attr):
+
+    """
+    !@Brief Get reader of MDataHandle for simple attribute.
+            Return None if attribute can't be read from data handle.
+
+    @type mo_attr: OpenMaya.MObject
+    @param mo_attr: Attribute object.
+
+    @rtype: function / None
+    @return: Function that take MDataHandle and return python value.
+    """
+
+    if mo_attr.hasFn(OpenMaya.MFn.kNumericAttribute) is True:
+        i_type = OpenMaya.MFnNumericAttribute(mo_attr).unitType()
+        if i_type == OpenMaya.MFnNumericData.kBoolean:
+            return lambda mdh: mdh.asBool()
+        elif i_type == OpenMaya.MFnNumericData.kShort:
+            return lambda mdh: mdh.asShort()
+        elif i_type in (OpenMaya.MFnNumericData.kInt, OpenMaya.MFnNumericData.kLong):
+            return lambda mdh: mdh.asInt()
+        elif i_type == OpenMaya.MFnNumericData.kFloat:
+            return lambda mdh: mdh.asFloat()
+        elif i_type == OpenMaya.MFnNumericData.kDouble:
+            return lambda mdh: mdh.asDouble()
+        elif i_type == OpenMaya.MFnNumericData.k3Float:
+            return lambda mdh: tuple(mdh.asFloatVector()[i] for i in range(3))
+        elif i_type == OpenMaya.MFnNumericData.k3Double:
+            return lambda mdh: tuple(mdh.asVector()[i] for i in range(3))
+    elif mo_attr.hasFn(OpenMaya.MFn.kUnitAttribute) is True:
+        i_type = OpenMaya.MFnUnitAttribute(mo_attr).unitType()
+        if i_type == OpenMaya.MFnUnitAttribute.kTime:
+            return lambda mdh: mdh.asTime().value()
+        elif i_type in (OpenMaya.MFnUnitAttribute.kAngle, OpenMaya.MFnUnitAttribute.kDistance):
+            return lambda mdh: mdh.asDouble()
+    elif mo_attr.hasFn(OpenMaya.MFn.kMatrixAttribute) is True:
+        return lambda mdh: _matrix_rows(mdh.asMatrix())
+    elif mo_attr.hasFn(OpenMaya.MFn.kEnumAttribute) is True:
+        return lambda mdh: mdh.asShort()
+
+    return None
+
+
+def _plug_reader(mp_attr):
+
+    """
+    !@Brief Get reader of plug. Attribute type is resolved only once,
+            reader can be called on all plugs of same attribute.
+
+    @type mp_attr: OpenMaya.MPlug
+    @param mp_attr: Plug used for resolve attribute type.
+
+    @rtype: function
+    @return: Function that take MPlug and return python value.
+    """
+
+    if mp_attr.isCompound() is True:
+
+        a_readers = [_plug_reader(mp_attr.child(i)) for i in range(mp_attr.numChildren())]
+
+        def _read_compound(mp):
+            a_value = list()
+            for i, reader in enumerate(a_readers):
+                returned = reader(mp.child(i))
+                if isinstance(returned, (list, tuple)) is True:
+                    a_value.extend(returned)
+                else:
+                    a_value.append(returned)
+            return a_value
+
+        return _read_compound
+
+    mo_attr = mp_attr.attribute()
+    if mo_attr.hasFn(OpenMaya.MFn.kNumericAttribute) is True:
+        i_type = OpenMaya.MFnNumericAttribute(mo_attr).unitType()
+        if i_type == OpenMaya.MFnNumericData.kBoolean:
+            return lambda mp: mp.asBool()
+        elif i_type == OpenMaya.MFnNumericData.kShort:
+            return lambda mp: mp.asShort()
+        elif i_type in (OpenMaya.MFnNumericData.kInt, OpenMaya.MFnNumericData.kLong):
+            return lambda mp: mp.asInt()
+        elif i_type == OpenMaya.MFnNumericData.kFloat:
+            return lambda mp: mp.asFloat()
+        elif i_type == OpenMaya.MFnNumericData.kDouble:
+            return lambda mp: mp.asDouble()
+    elif mo_attr.hasFn(OpenMaya.MFn.kUnitAttribute) is True:
+        return __get_unit
+    elif mo_attr.hasFn(OpenMaya.MFn.kMatrixAttribute) is True:
+        return lambda mp: _matrix_rows(OpenMaya.MFnMatrixData(mp.asMObject()).matrix())
+    elif mo_attr.hasFn(OpenMaya.MFn.kEnumAttribute) is True:
+        return __get_enum
+    elif mo_attr.hasFn(OpenMaya.MFn.kTypedAttribute) is True:
+        i_type = OpenMaya.MFnTypedAttribute(mo_attr).attrType()
+        if i_type == OpenMaya.MFnData.kDoubleArray:
+            return lambda mp: _array_values(OpenMaya.MFnDoubleArrayData(mp.asMObject()).array())
+        elif i_type == OpenMaya.MFnData.kFloatArray:
+            return lambda mp: _array_values(OpenMaya.MFnFloatArrayData(mp.asMObject()).array())
+        elif i_type == OpenMaya.MFnData.kIntArray:
+            return lambda mp: _array_values(OpenMaya.MFnIntArrayData(mp.asMObject()).array())
+
+    return get
+
+
+def _array_values(m_array):
+
+    """
+    !@Brief Convert maya array (MDoubleArray, MIntArray, ...) to list.
+
+    @type m_array: OpenMaya.MDoubleArray / OpenMaya.MFloatArray / OpenMaya.MIntArray
+    @param m_array: Maya array.
+
+    @rtype: list
+    @return: Array values.
+    """
+
+    return [m_array[i] for i in range(m_array.length())]
+
+
+def _to_array(a_values):
+
+    """
+    !@Brief Convert list of values to contiguous numpy array.
+            Without numpy, or if values are not homogeneous, list is returned.
+
+    @type a_values: list
+    @param a_values: Values getted.
+
+    @rtype: numpy.ndarray / list
+    @return: Values.
+    """
+
+    if numpy is None:
+        return a_values
+
+    try:
+        return numpy.ascontiguousarray(a_values, dtype=numpy.float64)
+    except (ValueError, TypeError):
+        return a_values
+
+
+def get_array(mp_attr, b_indices=False):
+
+    """
+    !@Brief Get all values of array plug in one pass.
+            Attribute type is resolved once for all elements, simple elements
+            are read directly from array data handle.
+
+    @type mp_attr: OpenMaya.MPlug
+    @param mp_attr: Array plug.
+    @type b_indices: bool
+    @param b_indices: If True return logical indices with values. Default is False.
+
+    @rtype: numpy.ndarray / list / tuple
+    @return: Values of each element. (indices, values) if b_indices is True.
+    """
+
+    #   Check
+    if isinstance(mp_attr, OpenMaya.MPlug) is False:
+        s_msg = "Argument must be a MPlug not {0}".format(type(mp_attr))
+        qd_logger.error(s_msg)
+        raise TypeError(s_msg)
+
+    if mp_attr.isArray() is False:
+        s_msg = "Plug given is not array -- {0}".format(mp_attr.info())
+        qd_logger.error(s_msg)
+        raise TypeError(s_msg)
+
+    #   Get
+    mia_indices = OpenMaya.MIntArray()
+    mp_attr.getExistingArrayAttributeIndices(mia_indices)
+    a_indices = _array_values(mia_indices)
+
+    a_values = list()
+    if len(a_indices) > 0:
+        mp_first = mp_attr.elementByLogicalIndex(a_indices[0])
+        handle_reader = None if mp_first.isCompound() is True else _handle_reader(mp_first.attribute())
+        if handle_reader is not None:
+            mdh = mp_attr.asMDataHandle()
+            try:
+                madh = OpenMaya.MArrayDataHandle(mdh)
+                a_indices = list()
+                for i in range(madh.elementCount()):
+                    madh.jumpToArrayElement(i)
+                    a_indices.append(madh.elementIndex())
+                    a_values.append(handle_reader(madh.inputValue()))
+            finally:
+                mp_attr.destructHandle(mdh)
+        else:
+            reader = _plug_reader(mp_first)
+            a_values = [reader(mp_attr.elementByLogicalIndex(i)) for i in a_indices]
+
+    if b_indices is True:
+        return a_indices, _to_array(a_values)
+    return _to_array(a_values)
+
+
+def get_many(a_plugs):
+
+    """
+    !@Brief Get values of many plugs.
+            Reader of each attribute is cached in descriptor, array plugs are read with get_array.
+
+    @type a_plugs: list(OpenMaya.MPlug) / OpenMaya.MPlugArray
+    @param a_plugs: Plugs to read.
+
+    @rtype: numpy.ndarray / list
+    @return: Values of each plug. List if values are not homogeneous.
+    """
+
+    if isinstance(a_plugs, OpenMaya.MPlugArray) is True:
+        a_plugs = [a_plugs[i] for i in range(a_plugs.length())]
+
+    if isinstance(a_plugs, (list, tuple)) is False:
+        s_msg = "Argument must be a list of MPlug not {0}".format(type(a_plugs))
+        qd_logger.error(s_msg)
+        raise TypeError(s_msg)
+
+    a_values = list()
+    for mp_attr in a_plugs:
+        if isinstance(mp_attr, OpenMaya.MPlug) is False:
+            s_msg = "Argument must be a MPlug not {0}".format(type(mp_attr))
+            qd_logger.error(s_msg)
+            raise TypeError(s_msg)
+        if mp_attr.isArray() is True:
+            a_values.append(get_array(mp_attr))
+            continue
+        descriptor = _descriptor(mp_attr.attribute())
+        if descriptor.reader is None:
+            descriptor.reader = _plug_reader(mp_attr)
+        a_values.append(descriptor.reader(mp_attr))
+
+    return _to_array(a_values)
+
+
 # ===================================================
 #   Setter
 # ===================================================
@@ -1371,36 +1777,9 @@ def set(*args, **kwargs):
                     set(mp_attr.child(i), value[i])
     else:
         try:
-            mo_attr = mp_attr.attribute()
-            if mo_attr.hasFn(OpenMaya.MFn.kNumericAttribute) is True:
-                __set_numeric(mp_attr, value)
-            elif mo_attr.hasFn(OpenMaya.MFn.kTypedAttribute) is True:
-                __set_typed(mp_attr, value)
-            elif mo_attr.hasFn(OpenMaya.MFn.kUnitAttribute) is True:
-                __set_unit(mp_attr, value)
-            elif mo_attr.hasFn(OpenMaya.MFn.kMatrixAttribute) is True:
-                __set_matrix(mp_attr, value)
-            elif mo_attr.hasFn(OpenMaya.MFn.kFloatMatrixAttribute) is True:
-                __set_matrix(mp_attr, value)
-            elif mo_attr.hasFn(OpenMaya.MFn.kEnumAttribute) is True:
-                __set_enum(mp_attr, value)
-            elif mo_attr.hasFn(OpenMaya.MFn.kCompoundAttribute) is True:
-                mp_attr.setLocked(b_locked)
-                s_msg = "Impossible to set compound attribute -- {0}".format(mp_attr.info())
-                qd_logger.error(s_msg)
-                raise Exception(s_msg)
-            elif mo_attr.hasFn(OpenMaya.MFn.kMessageAttribute) is True:
-                mp_attr.setLocked(b_locked)
-                s_msg = "Impossible to set message attribute"
-                qd_logger.error(s_msg)
-                raise TypeError(s_msg)
-            else:
-                mp_attr.setLocked(b_locked)
-                s_msg = "Invalid plug type given -- {0}".format(mo_attr.apiTypeStr())
-                qd_logger.error(s_msg)
-                raise TypeError(s_msg)
-
+            _descriptor(mp_attr.attribute()).setter(mp_attr, value)
         except Exception as e:
+            mp_attr.setLocked(b_locked)
             qd_logger.error(e)
             raise Exception(e)
 
@@ -1408,7 +1787,7 @@ def set(*args, **kwargs):
     mp_attr.setLocked(b_locked)
 
 
-def __set_typed(mp_attr, value):
+def __set_typed(mp_attr, value, i_type=None):
 
     """
     !@Brief Get typed attribute.
@@ -1417,6 +1796,8 @@ def __set_typed(mp_attr, value):
     @param mp_attr: Attribute plug object.
     @type value: unknow
     @param value: New attribute value.
+    @type i_type: int
+    @param i_type: Attribute unit / data type. Resolved from attribute if None.
 
     @rtype: unknow
     @return: Attribute value.
@@ -1429,8 +1810,8 @@ def __set_typed(mp_attr, value):
         raise TypeError(s_msg)
 
     #   Set
-    mfn_attr = OpenMaya.MFnTypedAttribute(mp_attr.attribute())
-    i_type = mfn_attr.attrType()
+    if i_type is None:
+        i_type = OpenMaya.MFnTypedAttribute(mp_attr.attribute()).attrType()
 
     if i_type == OpenMaya.MFnData.kNumeric:
         __set_numeric(mp_attr, value)
@@ -1496,7 +1877,7 @@ def __set_typed(mp_attr, value):
         raise TypeError(s_msg)
 
 
-def __set_numeric(mp_attr, value):
+def __set_numeric(mp_attr, value, i_type=None):
 
     """
     !@Brief Get numeric attribute.
@@ -1505,6 +1886,8 @@ def __set_numeric(mp_attr, value):
     @param mp_attr: Attribute plug object.
     @type value: unknow
     @param value: New attribute value.
+    @type i_type: int
+    @param i_type: Attribute unit / data type. Resolved from attribute if None.
 
     @rtype: unknow
     @return: Attribute value.
@@ -1517,8 +1900,8 @@ def __set_numeric(mp_attr, value):
         raise TypeError(s_msg)
 
     #   Set
-    mfn_attr = OpenMaya.MFnNumericAttribute(mp_attr.attribute())
-    i_type = mfn_attr.unitType()
+    if i_type is None:
+        i_type = OpenMaya.MFnNumericAttribute(mp_attr.attribute()).unitType()
 
     if i_type == OpenMaya.MFnNumericData.kBoolean:
         if isinstance(value, bool) is False:
@@ -1544,14 +1927,6 @@ def __set_numeric(mp_attr, value):
             qd_logger.error(s_msg)
             raise TypeError(s_msg)
         mp_attr.setShort(value)
-    elif i_type == OpenMaya.MFnNumericData.k2Short:
-        s_msg = "Set k2Short not implemented yet."
-        qd_logger.error(s_msg)
-        raise NotImplementedError(s_msg)
-    elif i_type == OpenMaya.MFnNumericData.k3Short:
-        s_msg = "Set k3Short not implemented yet."
-        qd_logger.error(s_msg)
-        raise NotImplementedError(s_msg)
     elif i_type == OpenMaya.MFnNumericData.kAddr:
         return
     elif i_type == OpenMaya.MFnNumericData.kInt or i_type == OpenMaya.MFnNumericData.kLong:
@@ -1560,46 +1935,20 @@ def __set_numeric(mp_attr, value):
             qd_logger.error(s_msg)
             raise TypeError(s_msg)
         mp_attr.setInt(value)
-    elif i_type == OpenMaya.MFnNumericData.k2Int or i_type == OpenMaya.MFnNumericData.k2Long:
-        s_msg = "Set k2Int not implemented yet."
-        qd_logger.error(s_msg)
-        raise NotImplementedError(s_msg)
-    elif i_type == OpenMaya.MFnNumericData.k3Int or i_type == OpenMaya.MFnNumericData.k3Long:
-        s_msg = "Set k3Int not implemented yet."
-        qd_logger.error(s_msg)
-        raise NotImplementedError(s_msg)
     elif i_type == OpenMaya.MFnNumericData.kFloat:
         if isinstance(value, (int, float)) is False:
             s_msg = "Argument must be a float not {0}".format(value)
             qd_logger.error(s_msg)
             raise TypeError(s_msg)
         mp_attr.setFloat(value)
-    elif i_type == OpenMaya.MFnNumericData.k2Float:
-        s_msg = "Set k2Float not implemented yet."
-        qd_logger.error(s_msg)
-        raise NotImplementedError(s_msg)
-    elif i_type == OpenMaya.MFnNumericData.k3Float:
-        s_msg = "Set k3Float not implemented yet."
-        qd_logger.error(s_msg)
-        raise NotImplementedError(s_msg)
     elif i_type == OpenMaya.MFnNumericData.kDouble:
         if isinstance(value, (int, float)) is False:
             s_msg = "Argument must be a float not {0}".format(value)
             qd_logger.error(s_msg)
             raise TypeError(s_msg)
         mp_attr.setDouble(value)
-    elif i_type == OpenMaya.MFnNumericData.k2Double:
-        s_msg = "Set k2Double not implemented yet."
-        qd_logger.error(s_msg)
-        raise NotImplementedError(s_msg)
-    elif i_type == OpenMaya.MFnNumericData.k3Double:
-        s_msg = "Set k3Double not implemented yet."
-        qd_logger.error(s_msg)
-        raise NotImplementedError(s_msg)
-    elif i_type == OpenMaya.MFnNumericData.k4Double:
-        s_msg = "Set k4Double not implemented yet."
-        qd_logger.error(s_msg)
-        raise NotImplementedError(s_msg)
+    elif i_type in _COMPOUND_NUMERIC:
+        __set_numeric_data(mp_attr, value, i_type)
     elif i_type == OpenMaya.MFnNumericData.kInvalid:
         s_msg = "kInvalid type not implemented yet -- {0}".format(mp_attr.info())
         qd_logger.error(s_msg)
@@ -1610,7 +1959,7 @@ def __set_numeric(mp_attr, value):
         raise TypeError(s_msg)
 
 
-def __set_unit(mp_attr, value):
+def __set_unit(mp_attr, value, i_type=None):
 
     """
     !@Brief Get unit attribute.
@@ -1619,6 +1968,8 @@ def __set_unit(mp_attr, value):
     @param mp_attr: Attribute plug object.
     @type value: unknow
     @param value: New attribute value.
+    @type i_type: int
+    @param i_type: Attribute unit / data type. Resolved from attribute if None.
 
     @rtype: float
     @return: Attribute value.
@@ -1636,8 +1987,8 @@ def __set_unit(mp_attr, value):
         raise TypeError(s_msg)
 
     #   Set
-    mfn_attr = OpenMaya.MFnUnitAttribute(mp_attr.attribute())
-    i_type = mfn_attr.unitType()
+    if i_type is None:
+        i_type = OpenMaya.MFnUnitAttribute(mp_attr.attribute()).unitType()
 
     if i_type == OpenMaya.MFnUnitAttribute.kAngle:
         mp_attr.setMAngle(OpenMaya.MAngle(value, OpenMaya.MAngle().uiUnit()))
@@ -1716,3 +2067,359 @@ def __set_enum(mp_attr, value):
 
     #   Get
     mp_attr.setInt(value)
+
+
+# ===================================================
+#   Batch
+# ===================================================
+
+_NUMERIC_DATA_SETTERS = {
+    OpenMaya.MFnNumericData.k2Short: "setData2Short",
+    OpenMaya.MFnNumericData.k3Short: "setData3Short",
+    OpenMaya.MFnNumericData.k2Int: "setData2Int",
+    OpenMaya.MFnNumericData.k3Int: "setData3Int",
+    OpenMaya.MFnNumericData.k2Long: "setData2Int",
+    OpenMaya.MFnNumericData.k3Long: "setData3Int",
+    OpenMaya.MFnNumericData.k2Float: "setData2Float",
+    OpenMaya.MFnNumericData.k3Float: "setData3Float",
+    OpenMaya.MFnNumericData.k2Double: "setData2Double",
+    OpenMaya.MFnNumericData.k3Double: "setData3Double",
+    OpenMaya.MFnNumericData.k4Double: "setData4Double"
+}
+
+
+def _queue_numeric(mdg_mod, mp_attr, value, i_type):
+
+    """
+    !@Brief Queue numeric value on modifier.
+
+    @type mdg_mod: OpenMaya.MDGModifier
+    @param mdg_mod: Modifier.
+    @type mp_attr: OpenMaya.MPlug
+    @param mp_attr: Attribute plug object.
+    @type value: unknow
+    @param value: New attribute value.
+    @type i_type: int
+    @param i_type: Numeric type.
+    """
+
+    if i_type == OpenMaya.MFnNumericData.kBoolean:
+        mdg_mod.newPlugValueBool(mp_attr, bool(value))
+    elif i_type == OpenMaya.MFnNumericData.kChar:
+        mdg_mod.newPlugValueChar(mp_attr, value)
+    elif i_type == OpenMaya.MFnNumericData.kShort:
+        mdg_mod.newPlugValueShort(mp_attr, int(value))
+    elif i_type in (OpenMaya.MFnNumericData.kByte, OpenMaya.MFnNumericData.kInt, OpenMaya.MFnNumericData.kLong):
+        mdg_mod.newPlugValueInt(mp_attr, int(value))
+    elif i_type == OpenMaya.MFnNumericData.kFloat:
+        mdg_mod.newPlugValueFloat(mp_attr, float(value))
+    elif i_type == OpenMaya.MFnNumericData.kDouble:
+        mdg_mod.newPlugValueDouble(mp_attr, float(value))
+    elif i_type in _NUMERIC_DATA_SETTERS:
+        mfn_data = OpenMaya.MFnNumericData()
+        mo_data = mfn_data.create(i_type)
+        getattr(mfn_data, _NUMERIC_DATA_SETTERS[i_type])(*value)
+        mdg_mod.newPlugValue(mp_attr, mo_data)
+    else:
+        s_msg = "Invalid numeric type -- {0}".format(mp_attr.info())
+        qd_logger.error(s_msg)
+        raise TypeError(s_msg)
+
+
+def _queue_typed(mdg_mod, mp_attr, value, i_type):
+
+    """
+    !@Brief Queue typed value on modifier.
+
+    @type mdg_mod: OpenMaya.MDGModifier
+    @param mdg_mod: Modifier.
+    @type mp_attr: OpenMaya.MPlug
+    @param mp_attr: Attribute plug object.
+    @type value: unknow
+    @param value: New attribute value.
+    @type i_type: int
+    @param i_type: Data type.
+    """
+
+    if i_type == OpenMaya.MFnData.kString:
+        if isinstance(value, (str, unicode)) is False:
+            s_msg = "Argument must be a string not {0}".format(value)
+            qd_logger.error(s_msg)
+            raise TypeError(s_msg)
+        mdg_mod.newPlugValueString(mp_attr, str(value))
+    elif i_type == OpenMaya.MFnData.kMatrix:
+        mdg_mod.newPlugValue(mp_attr, OpenMaya.MFnMatrixData().create(value))
+    elif i_type == OpenMaya.MFnData.kDoubleArray:
+        mdg_mod.newPlugValue(mp_attr, OpenMaya.MFnDoubleArrayData().create(value))
+    elif i_type == OpenMaya.MFnData.kFloatArray:
+        mdg_mod.newPlugValue(mp_attr, OpenMaya.MFnFloatArrayData().create(value))
+    elif i_type == OpenMaya.MFnData.kIntArray:
+        mdg_mod.newPlugValue(mp_attr, OpenMaya.MFnIntArrayData().create(value))
+    elif i_type == OpenMaya.MFnData.kPointArray:
+        mdg_mod.newPlugValue(mp_attr, OpenMaya.MFnPointArrayData().create(value))
+    elif i_type == OpenMaya.MFnData.kVectorArray:
+        mdg_mod.newPlugValue(mp_attr, OpenMaya.MFnVectorArrayData().create(value))
+    else:
+        s_msg = "Invalid typed attribute -- {0}".format(mp_attr.info())
+        qd_logger.error(s_msg)
+        raise TypeError(s_msg)
+
+
+def _queue_value(mdg_mod, mp_attr, value):
+
+    """
+    !@Brief Queue value of leaf plug on modifier.
+            Values are interpreted like set (unit attributes in ui unit).
+
+    @type mdg_mod: OpenMaya.MDGModifier
+    @param mdg_mod: Modifier.
+    @type mp_attr: OpenMaya.MPlug
+    @param mp_attr: Attribute plug object.
+    @type value: unknow
+    @param value: New attribute value.
+    """
+
+    mo_attr = mp_attr.attribute()
+    descriptor = _descriptor(mo_attr)
+
+    if mo_attr.hasFn(OpenMaya.MFn.kNumericAttribute) is True:
+        _queue_numeric(mdg_mod, mp_attr, value, descriptor.i_unit)
+    elif mo_attr.hasFn(OpenMaya.MFn.kTypedAttribute) is True:
+        _queue_typed(mdg_mod, mp_attr, value, descriptor.i_unit)
+    elif mo_attr.hasFn(OpenMaya.MFn.kUnitAttribute) is True:
+        if descriptor.i_unit == OpenMaya.MFnUnitAttribute.kAngle:
+            mdg_mod.newPlugValueMAngle(mp_attr, OpenMaya.MAngle(value, OpenMaya.MAngle.uiUnit()))
+        elif descriptor.i_unit == OpenMaya.MFnUnitAttribute.kDistance:
+            mdg_mod.newPlugValueMDistance(mp_attr, OpenMaya.MDistance(value, OpenMaya.MDistance.uiUnit()))
+        elif descriptor.i_unit == OpenMaya.MFnUnitAttribute.kTime:
+            mdg_mod.newPlugValueMTime(mp_attr, OpenMaya.MTime(value, OpenMaya.MTime.uiUnit()))
+        else:
+            s_msg = "Invalid unit type -- {0}".format(mp_attr.info())
+            qd_logger.error(s_msg)
+            raise TypeError(s_msg)
+    elif mo_attr.hasFn(OpenMaya.MFn.kMatrixAttribute) is True or mo_attr.hasFn(OpenMaya.MFn.kFloatMatrixAttribute) is True:
+        if isinstance(value, OpenMaya.MFloatMatrix) is True:
+            value = qdMatrix.float_array_to_mmatrix(qdMatrix.float_array_from_matrix(value))
+        mdg_mod.newPlugValue(mp_attr, OpenMaya.MFnMatrixData().create(value))
+    elif mo_attr.hasFn(OpenMaya.MFn.kEnumAttribute) is True:
+        mdg_mod.newPlugValueInt(mp_attr, int(value))
+    else:
+        #   Raise same error than set
+        descriptor.setter(mp_attr, value)
+
+
+class AttrBatch(object):
+
+    """
+    !@Brief Collect set / lock / connect operations and apply them in one MDGModifier.
+            Plugs are unlocked when modifier is executed, the graph is dirtied once and
+            the batch is one entry of maya undo queue (Ctrl+Z). batch.undo() undo it from code.
+
+            with attr.AttrBatch() as batch:
+                batch.set(mp_translate_x, 1.0)
+                batch.connect(mp_source, mp_destination)
+                batch.lock(mp_translate_x)
+            print batch.timings
+            batch.undo()
+    """
+
+    def __init__(self, b_force=True, b_undo=True):
+
+        """
+        @type b_force: bool
+        @param b_force: Disconnect destination plugs already connected. Default is True.
+        @type b_undo: bool
+        @param b_undo: Add applied batch to maya undo queue. Default is True.
+        """
+
+        self.b_force = b_force
+        self.b_undo = b_undo
+        self.timings = None
+
+        self.__mdg_mod = OpenMaya.MDGModifier()
+        self.__a_values = list()
+        self.__a_connections = list()
+        self.__a_locks = list()
+        self.__a_unlocks = list()
+        self.__a_lock_states = list()
+        self.__b_applied = False
+        self.__b_undone = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.apply()
+        return False
+
+    def __len__(self):
+        return len(self.__a_values) + len(self.__a_connections) + len(self.__a_locks)
+
+    def set(self, *args):
+
+        """
+        !@Brief Queue new value. Same arguments than attr.set:
+                    MPlug, value
+                    MObject, string attr, value
+        """
+
+        if len(args) == 2 and isinstance(args[0], OpenMaya.MPlug) is True:
+            self.__a_values.append((args[0], args[1]))
+        elif len(args) == 3 and isinstance(args[0], OpenMaya.MObject) is True:
+            self.__a_values.append((retrieve(args[0], args[1]), args[2]))
+        else:
+            s_msg = "Invalid argument given.\n\tMPlug, value\n\tMObject, string attr, value"
+            qd_logger.error(s_msg)
+            raise TypeError(s_msg)
+
+    def lock(self, mp_attr, b_lock=True):
+
+        """
+        !@Brief Queue lock state. Applied after values and connections.
+
+        @type mp_attr: OpenMaya.MPlug
+        @param mp_attr: Plug to lock.
+        @type b_lock: bool
+        @param b_lock: Lock state. Default is True.
+        """
+
+        if isinstance(mp_attr, OpenMaya.MPlug) is False:
+            s_msg = "Argument must be a MPlug not {0}".format(type(mp_attr))
+            qd_logger.error(s_msg)
+            raise TypeError(s_msg)
+
+        self.__a_locks.append((mp_attr, b_lock))
+
+    def connect(self, mp_source, mp_destination):
+
+        """
+        !@Brief Queue connection.
+
+        @type mp_source: OpenMaya.MPlug
+        @param mp_source: Source plug.
+        @type mp_destination: OpenMaya.MPlug
+        @param mp_destination: Destination plug.
+        """
+
+        if isinstance(mp_source, OpenMaya.MPlug) is False or isinstance(mp_destination, OpenMaya.MPlug) is False:
+            s_msg = "Arguments must be MPlug not {0} | {1}".format(type(mp_source), type(mp_destination))
+            qd_logger.error(s_msg)
+            raise TypeError(s_msg)
+
+        self.__a_connections.append((mp_source, mp_destination))
+
+    def __queue_plug(self, mp_attr, value):
+
+        """
+        !@Brief Queue value, recurse on array and compound plug like set.
+        """
+
+        if mp_attr.isArray() is True:
+            if isinstance(value, (list, tuple)) is False:
+                value = [value]
+            for i in range(len(value)):
+                self.__queue_plug(mp_attr.elementByLogicalIndex(i), value[i])
+        elif mp_attr.isCompound() is True:
+            for i in range(mp_attr.numChildren()):
+                self.__queue_plug(mp_attr.child(i), value[i])
+        else:
+            self.__a_unlocks.append(mp_attr)
+            _queue_value(self.__mdg_mod, mp_attr, value)
+
+    def __execute(self):
+
+        """
+        !@Brief Unlock written plugs, run modifier, restore their lock state then apply queued locks.
+                Lock states are stored before each change for undo.
+        """
+
+        del self.__a_lock_states[:]
+        try:
+            for mp_attr in self.__a_unlocks:
+                if mp_attr.isLocked() is True:
+                    self.__a_lock_states.append((mp_attr, True))
+                    mp_attr.setLocked(False)
+            self.__mdg_mod.doIt()
+        finally:
+            for mp_attr, b_lock in self.__a_lock_states:
+                mp_attr.setLocked(b_lock)
+
+        for mp_attr, b_lock in self.__a_locks:
+            self.__a_lock_states.append((mp_attr, mp_attr.isLocked()))
+            mp_attr.setLocked(b_lock)
+
+    def apply(self):
+
+        """
+        !@Brief Apply all queued operations with one doIt.
+
+        @rtype: perfUtils.Timings
+        @return: Timings of batch.
+        """
+
+        if self.__b_applied is True:
+            s_msg = "Batch already applied."
+            qd_logger.error(s_msg)
+            raise RuntimeError(s_msg)
+
+        self.timings = perfUtils.Timings("AttrBatch")
+
+        try:
+            with self.timings.phase("queue"):
+                for mp_attr, value in self.__a_values:
+                    self.__queue_plug(mp_attr, value)
+                for mp_source, mp_destination in self.__a_connections:
+                    if mp_destination.isConnected() is True:
+                        mpa_inputs = get_connected(mp_destination, b_outputs=False, b_recurse=False)
+                        if mpa_inputs.length() > 0:
+                            if self.b_force is False:
+                                s_msg = "Attribute already connected {0}".format(mp_destination.info())
+                                qd_logger.error(s_msg)
+                                raise Exception(s_msg)
+                            self.__mdg_mod.disconnect(mpa_inputs[0], mp_destination)
+                    self.__a_unlocks.append(mp_destination)
+                    self.__mdg_mod.connect(mp_source, mp_destination)
+            with self.timings.phase("doIt"):
+                self.__execute()
+        finally:
+            self.timings.stop()
+
+        self.__b_applied = True
+        if self.b_undo is True:
+            undoUtils.register(self.undo, self.__redo)
+        qd_logger.debug("{0} -- {1} operations".format(self.timings, len(self)))
+
+        return self.timings
+
+    def undo(self):
+
+        """
+        !@Brief Undo all operations of applied batch.
+        """
+
+        if self.__b_applied is False or self.__b_undone is True:
+            return
+
+        for mp_attr, _ in self.__a_lock_states:
+            mp_attr.setLocked(False)
+
+        self.__mdg_mod.undoIt()
+
+        #   Lock states are stored before each change, restore them from last to first.
+        for mp_attr, b_lock in reversed(self.__a_lock_states):
+            mp_attr.setLocked(b_lock)
+
+        self.__b_undone = True
+
+    def __redo(self):
+
+        """
+        !@Brief Apply undone batch again. Called by maya redo.
+        """
+
+        if self.__b_undone is False:
+            return
+
+        self.__execute()
+        self.__b_undone = False
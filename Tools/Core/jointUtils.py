@@ -11,7 +11,9 @@
 from maya import cmds, OpenMaya
 
 import apiUtils
+import matrix
 import nodeUtils
+import undoUtils
 
 
 # ===========================================
@@ -19,17 +21,30 @@ import nodeUtils
 # ===========================================
 
 
-def duplicate_hierarchy(mo_root, mo_parent=None, s_namespace=':'):
+def duplicate_hierarchy(
+        mo_root, mo_parent=None, s_namespace=':', b_joint_orient=False, b_radius=False, b_custom=False, mdag_mod=None):
     
     """
-    !@Brief Duplicate hierarchy from given root node.
+    !@Brief Duplicate joint hierarchy from given root node.
+            Source world matrices are read in one traversal, local matrices are solved in one batch
+            and all joints are created and placed with one modifier.
     
     @type mo_root: OpenMaya.MObject
     @param mo_root: Root node name.
-    @type s_root: OpenMaya.MObject
-    @param s_root: parent node.
+    @type mo_parent: OpenMaya.MObject
+    @param mo_parent: parent node.
     @type s_namespace: str / unicode
     @param s_namespace: Duplication namespace.
+    @type b_joint_orient: bool
+    @param b_joint_orient: Copy jointOrient. Else rotation is set on rotate only.
+    @type b_radius: bool
+    @param b_radius: Copy radius.
+    @type b_custom: bool
+    @param b_custom: Copy user defined attributes and their values.
+    @type mdag_mod: OpenMaya.MDagModifier
+    @param mdag_mod: Modifier used, its doIt is already called on return and its undoIt remove all duplication.
+                     Its owner add it to undo queue with undoUtils.register(mdag_mod.undoIt, mdag_mod.doIt).
+                     If None, new modifier is created and added to undo queue (one undo step).
     
     @rtype: OpenMaya.MObject
     @return: New root node object.
@@ -41,46 +56,187 @@ def duplicate_hierarchy(mo_root, mo_parent=None, s_namespace=':'):
     
     if not mo_root.hasFn(OpenMaya.MFn.kJoint):
         raise RuntimeError('Node given must be a joint not "{0}"'.format(mo_root.apiTypeStr()))
-    
-    #    Duplicate
-    s_short = nodeUtils.name(mo_root, b_full=False, b_namespace=False)
-    mo_new_joint = nodeUtils.create('joint', s_short, s_namespace=s_namespace)
-    
-    if mo_parent:
-        mfn_parent = OpenMaya.MFnDagNode(mo_parent)
-        mfn_parent.addChild(mo_new_joint)
-    
-    nodeUtils.snap(mo_root, mo_new_joint)
-    
-    #    Duplicate Children
-    mfn_root = OpenMaya.MFnDagNode(mo_root)
-    for i in range(mfn_root.childCount()):
-        mo_child = mfn_root.child(i)
-        if not mo_child.hasFn(OpenMaya.MFn.kJoint):
+
+    b_register = mdag_mod is None
+    if b_register is True:
+        mdag_mod = OpenMaya.MDagModifier()
+
+    #    Read source, parent first
+    a_sources = list()
+    a_parents = list()
+    a_worlds = list()
+    a_specs = list()
+    d_indices = dict()
+    with nodeUtils.MatrixCacheContext():
+        for dp_joint in apiUtils.iter_children(mo_root, mfn_type=OpenMaya.MFn.kJoint, b_root=True, s_yield="path"):
+            s_path = dp_joint.fullPathName()
+            i_parent = d_indices.get(s_path.rsplit('|', 1)[0])
+            if a_sources and i_parent is None:
+                #    Joint under other node type is not duplicated
+                continue
+            mo_joint = dp_joint.node()
+            d_indices[s_path] = len(a_sources)
+            a_specs.append(('joint', nodeUtils.name(mo_joint, b_full=False, b_namespace=False), i_parent if a_sources else mo_parent))
+            a_sources.append(mo_joint)
+            a_parents.append(i_parent)
+            a_worlds.append(nodeUtils.get_path_matrix(dp_joint))
+        mm_parent = nodeUtils.get_matrix(mo_parent) if mo_parent is not None else OpenMaya.MMatrix()
+
+    #    Create
+    a_joints = nodeUtils.create_many(a_specs, s_namespace=s_namespace, mdag_mod=mdag_mod)
+
+    #    Copy attributes used by placement and optional ones
+    for mo_source, mo_joint in zip(a_sources, a_joints):
+        mfn_source = OpenMaya.MFnDependencyNode(mo_source)
+        mfn_joint = OpenMaya.MFnDependencyNode(mo_joint)
+        mdag_mod.newPlugValueInt(mfn_joint.findPlug('rotateOrder'), mfn_source.findPlug('rotateOrder').asInt())
+        if b_joint_orient:
+            mp_source = mfn_source.findPlug('jointOrient')
+            mp_joint = mfn_joint.findPlug('jointOrient')
+            for i in range(3):
+                mdag_mod.newPlugValueDouble(mp_joint.child(i), mp_source.child(i).asDouble())
+        if b_radius:
+            mdag_mod.newPlugValueDouble(mfn_joint.findPlug('radius'), mfn_source.findPlug('radius').asDouble())
+        if b_custom:
+            _queue_custom_attributes(mdag_mod, mo_source, mo_joint)
+    mdag_mod.doIt()
+
+    #    Place all joints
+    a_parent_worlds = [mm_parent if i_parent is None else a_worlds[i_parent] for i_parent in a_parents]
+    a_locals = matrix.multiply_many(matrix.to_stack(a_worlds), matrix.inverse_many(matrix.to_stack(a_parent_worlds)))
+    for i, mo_joint in enumerate(a_joints):
+        nodeUtils.queue_local_matrix(mdag_mod, mo_joint, matrix.to_mmatrix(a_locals[i]))
+    mdag_mod.doIt()
+
+    #    Creation, attributes and placement are done by same modifier, undoIt revert all of them
+    if b_register is True:
+        undoUtils.register(mdag_mod.undoIt, mdag_mod.doIt)
+
+    return a_joints[0]
+
+
+def _queue_custom_attributes(mdag_mod, mo_source, mo_joint):
+
+    """
+    !@Brief Queue creation of user defined attributes of source on joint and copy their values.
+
+    @type mdag_mod: OpenMaya.MDagModifier
+    @param mdag_mod: Modifier.
+    @type mo_source: OpenMaya.MObject
+    @param mo_source: Source node.
+    @type mo_joint: OpenMaya.MObject
+    @param mo_joint: Destination node.
+    """
+
+    s_source = nodeUtils.name(mo_source)
+    a_attrs = cmds.listAttr(s_source, userDefined=True) or list()
+    if not a_attrs:
+        return
+
+    s_joint = nodeUtils.name(mo_joint)
+    mfn_source = OpenMaya.MFnDependencyNode(mo_source)
+    for s_attr in a_attrs:
+        mo_attr = mfn_source.attribute(s_attr)
+        if mo_attr.isNull():
             continue
-        duplicate_hierarchy(mo_child, mo_parent=mo_new_joint)
-    
-    return mo_new_joint
+        s_command = OpenMaya.MFnAttribute(mo_attr).getAddAttrCmd(True).rstrip().rstrip(';')
+        mdag_mod.commandToExecute('{0} "{1}"'.format(s_command, s_joint))
 
+    s_attrs = ' '.join('-at "{0}"'.format(s_attr) for s_attr in a_attrs)
+    mdag_mod.commandToExecute('copyAttr -values {0} "{1}" "{2}"'.format(s_attrs, s_source, s_joint))
 
-def remove_joint_orient(b_lock=False):
+
+def remove_joint_orient(b_lock=False, a_joints=None, b_hierarchy=False, mdg_mod=None):
 
     """
     !@Brief Set final rotation on rotation attribute and remove to jointOrient.
+            World matrices of all joints are read first, rotations are solved in one batch
+            by rotate order and all values are written with one modifier.
+            World matrices are kept so parent of a joint does not move and order of joints does not matter.
 
     @type b_lock: bool
     @param b_lock: Lock jointOrient
+    @type a_joints: list(str)
+    @param a_joints: Joints to process. Default is selection.
+    @type b_hierarchy: bool
+    @param b_hierarchy: Process all joints under given joints too. Default is False.
+    @type mdg_mod: OpenMaya.MDGModifier
+    @param mdg_mod: Modifier used, its owner add it to undo queue. If None, new modifier is created
+                    and added to undo queue (one undo step).
+
+    @rtype: list(str)
+    @return: Processed joints, parent first.
     """
 
-    a_selected = cmds.ls(selection=True, long=True)
-
-    for s_node in a_selected:
-        
-        a_matrix = cmds.xform(s_node, query=True, matrix=True, worldSpace=True)
-        
-        cmds.setAttr("{0}.jointOrient".format(s_node), lock=False)
-        for s_axis in "XYZ":
-            cmds.setAttr("{0}.jointOrient{1}".format(s_node, s_axis), lock=False)
-            cmds.setAttr("{0}.jointOrient{1}".format(s_node, s_axis), 0.0, lock=b_lock)
-        
-        cmds.xform(s_node, matrix=a_matrix, worldSpace=True)
+    if a_joints is None:
+        a_joints = cmds.ls(selection=True, long=True, type='joint')
+    if not a_joints:
+        return list()
+
+    b_register = mdg_mod is None
+    if b_register is True:
+        mdg_mod = OpenMaya.MDGModifier()
+
+    #    Collect joints, parent first
+    d_paths = dict()
+    for dp_joint in apiUtils.get_paths(a_joints):
+        if b_hierarchy is False:
+            d_paths.setdefault(dp_joint.fullPathName(), dp_joint)
+            continue
+        for dp_child in apiUtils.iter_children(dp_joint.node(), mfn_type=OpenMaya.MFn.kJoint, b_root=True, s_yield="path"):
+            d_paths.setdefault(dp_child.fullPathName(), dp_child)
+    a_names = sorted(d_paths, key=lambda s_path: s_path.count('|'))
+
+    #    Read all matrices before any change
+    a_locals = list()
+    a_compensates = list()
+    a_rotate_axis = list()
+    a_orders = list()
+    a_plugs = list()
+    for s_joint in a_names:
+        dp_joint = d_paths[s_joint]
+        mfn_joint = OpenMaya.MFnDependencyNode(dp_joint.node())
+        a_locals.append(dp_joint.inclusiveMatrix() * dp_joint.exclusiveMatrixInverse())
+
+        #    Undo inverse parent scale of segment scale compensate
+        a_scale = [1.0, 1.0, 1.0]
+        dp_parent = OpenMaya.MDagPath(dp_joint)
+        dp_parent.pop()
+        if mfn_joint.findPlug('segmentScaleCompensate').asBool() and dp_parent.node().hasFn(OpenMaya.MFn.kJoint):
+            mp_scale = OpenMaya.MFnDependencyNode(dp_parent.node()).findPlug('scale')
+            a_scale = [mp_scale.child(i).asDouble() for i in range(3)]
+        a_compensates.append([
+            [a_scale[0], 0.0, 0.0, 0.0], [0.0, a_scale[1], 0.0, 0.0], [0.0, 0.0, a_scale[2], 0.0], [0.0, 0.0, 0.0, 1.0]
+        ])
+
+        mp_rotate_axis = mfn_joint.findPlug('rotateAxis')
+        a_rotate_axis.append(OpenMaya.MEulerRotation(*[mp_rotate_axis.child(i).asDouble() for i in range(3)]).asMatrix().inverse())
+        a_orders.append(mfn_joint.findPlug('rotateOrder').asInt())
+        a_plugs.append((s_joint, mfn_joint.findPlug('jointOrient'), mfn_joint.findPlug('rotate')))
+
+    #    Solve rotations: local = S * RA * R * IS * T once jointOrient is zero, scale is removed before RA
+    a_rotations = matrix.multiply_many(
+        matrix.to_stack(a_rotate_axis),
+        matrix.remove_scale_many(matrix.multiply_many(matrix.to_stack(a_locals), matrix.to_stack(a_compensates)))
+    )
+    a_eulers = matrix.matrix_to_euler(a_rotations, a_orders)
+
+    #    Write
+    for (s_joint, mp_joint_orient, mp_rotate), a_euler in zip(a_plugs, a_eulers):
+        a_orient_plugs = [(mp_joint_orient, 'jointOrient')]
+        a_orient_plugs += [(mp_joint_orient.child(i), 'jointOrient{0}'.format(s_axis)) for i, s_axis in enumerate('XYZ')]
+        for mp_plug, s_attr in a_orient_plugs:
+            if mp_plug.isLocked():
+                mdg_mod.commandToExecute('setAttr -lock 0 "{0}.{1}"'.format(s_joint, s_attr))
+        for i in range(3):
+            mdg_mod.newPlugValueDouble(mp_joint_orient.child(i), 0.0)
+            mdg_mod.newPlugValueDouble(mp_rotate.child(i), float(a_euler[i]))
+        if b_lock:
+            for _, s_attr in a_orient_plugs[1:]:
+                mdg_mod.commandToExecute('setAttr -lock 1 "{0}.{1}"'.format(s_joint, s_attr))
+    if b_register is True:
+        undoUtils.do_it(mdg_mod)
+    else:
+        mdg_mod.doIt()
+
+    return a_names
@@ -8,6 +8,11 @@
 #   Import Modules
 # ==================================
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from maya import cmds, OpenMaya
 
 
@@ -34,3 +39,481 @@ def float_array_to_mmatrix(a_matrix):
     OpenMaya.MScriptUtil.createMatrixFromList(a_matrix, out_matrix)
 
     return out_matrix
+
+
+def mmatrix_to_float_array(mm):
+
+    """
+    !@Brief Transform MMatrix to flat list.
+
+    @type mm: OpenMaya.MMatrix
+    @param mm: Matrix to transform.
+
+    @rtype: list(float)
+    @return: 16 floats, row major.
+    """
+
+    return [mm(i, j) for i in range(4) for j in range(4)]
+
+
+# ==================================
+#   Matrix stack
+#   Stack is a (N, 4, 4) numpy array, or a list of MMatrix without numpy.
+#   Api 1.0 MMatrix has no buffer protocol, conversions from / to MMatrix copy
+#   values through python floats (one flat list or iterator, no list by matrix).
+#   Only numpy inputs ((N, 16) arrays) are reshaped as views without copy.
+# ==================================
+
+def to_stack(a_matrices):
+
+    """
+    !@Brief Build matrix stack. MMatrix values are copied with from_mmatrices, numpy arrays are reshaped without copy.
+
+    @type a_matrices: list(OpenMaya.MMatrix) / OpenMaya.MMatrixArray / list / numpy.ndarray
+    @param a_matrices: Matrices as MMatrix, MMatrixArray, 4x4 rows, flat lists of 16 floats,
+                       api 2.0 matrices or (N, 4, 4) / (N, 16) numpy array.
+
+    @rtype: numpy.ndarray / list(OpenMaya.MMatrix)
+    @return: Matrix stack.
+    """
+
+    if isinstance(a_matrices, OpenMaya.MMatrixArray) is True:
+        a_matrices = [a_matrices[i] for i in range(a_matrices.length())]
+
+    if numpy is None:
+        return [to_mmatrix(mm) for mm in a_matrices]
+
+    if isinstance(a_matrices, numpy.ndarray) is True:
+        return a_matrices.reshape(-1, 4, 4)
+
+    if len(a_matrices) == 0:
+        return numpy.empty((0, 4, 4), dtype=numpy.float64)
+
+    if isinstance(a_matrices[0], OpenMaya.MMatrix) is True:
+        return from_mmatrices(a_matrices)
+
+    return numpy.asarray(a_matrices, dtype=numpy.float64).reshape(-1, 4, 4)
+
+
+def from_mmatrices(a_matrices):
+
+    """
+    !@Brief Build matrix stack from MMatrix.
+            Values are read one by one with mm(i, j) (no buffer access in api 1.0) and streamed
+            in one preallocated array, no intermediate list by matrix.
+
+    @type a_matrices: list(OpenMaya.MMatrix)
+    @param a_matrices: Matrices.
+
+    @rtype: numpy.ndarray / list(OpenMaya.MMatrix)
+    @return: Matrix stack.
+    """
+
+    if numpy is None:
+        return list(a_matrices)
+
+    a_cells = [(i, j) for i in range(4) for j in range(4)]
+    a_values = (mm(i, j) for mm in a_matrices for i, j in a_cells)
+
+    return numpy.fromiter(a_values, dtype=numpy.float64, count=len(a_matrices) * 16).reshape(-1, 4, 4)
+
+
+def to_mmatrices(a_stack):
+
+    """
+    !@Brief Get MMatrix of all matrices of stack.
+            Numpy stack is flattened to python floats in one pass, then each MMatrix is filled
+            from its 16 floats with MScriptUtil (no buffer access in api 1.0).
+
+    @type a_stack: numpy.ndarray / list
+    @param a_stack: Matrix stack.
+
+    @rtype: list(OpenMaya.MMatrix)
+    @return: Matrices.
+    """
+
+    if numpy is not None and isinstance(a_stack, numpy.ndarray) is True:
+        return [float_array_to_mmatrix(a_values) for a_values in a_stack.reshape(-1, 16).tolist()]
+
+    return [to_mmatrix(mm) for mm in a_stack]
+
+
+def to_mmatrix_array(a_stack):
+
+    """
+    !@Brief Get MMatrixArray from matrix stack.
+
+    @type a_stack: numpy.ndarray / list
+    @param a_stack: Matrix stack.
+
+    @rtype: OpenMaya.MMatrixArray
+    @return: Matrix array.
+    """
+
+    mma_matrices = OpenMaya.MMatrixArray()
+    for mm in to_mmatrices(a_stack):
+        mma_matrices.append(mm)
+
+    return mma_matrices
+
+
+def from_flat(a_values):
+
+    """
+    !@Brief Build matrix stack from flat values, like cmds.getAttr / cmds.xform matrix results.
+
+    @type a_values: list(float) / list(list(float)) / numpy.ndarray
+    @param a_values: 16 * N floats, or N lists of 16 floats.
+
+    @rtype: numpy.ndarray / list(OpenMaya.MMatrix)
+    @return: Matrix stack.
+    """
+
+    if numpy is not None:
+        return numpy.asarray(a_values, dtype=numpy.float64).reshape(-1, 4, 4)
+
+    if a_values and isinstance(a_values[0], (list, tuple)):
+        a_values = [f for a_matrix in a_values for f in a_matrix]
+
+    return [float_array_to_mmatrix(list(a_values[i:i + 16])) for i in range(0, len(a_values), 16)]
+
+
+def to_flat(a_stack):
+
+    """
+    !@Brief Get flat values of matrix stack, like cmds.setAttr matrix arguments.
+
+    @type a_stack: numpy.ndarray / list
+    @param a_stack: Matrix stack.
+
+    @rtype: list(float)
+    @return: 16 * N floats, row major.
+    """
+
+    if numpy is not None and isinstance(a_stack, numpy.ndarray) is True:
+        return a_stack.ravel().tolist()
+
+    return [f for mm in a_stack for f in mmatrix_to_float_array(to_mmatrix(mm))]
+
+
+def read_plug_array(mp_array, a_indices=None):
+
+    """
+    !@Brief Read matrix array plug (bindPreMatrix, worldMatrix, ...) as matrix stack.
+
+    @type mp_array: OpenMaya.MPlug
+    @param mp_array: Array plug of matrix.
+    @type a_indices: list(int)
+    @param a_indices: Logical indices read. Default is all existing indices.
+
+    @rtype: tuple(list(int), numpy.ndarray / list(OpenMaya.MMatrix))
+    @return: Logical indices and matrix stack in same order. Element without data is identity.
+    """
+
+    if a_indices is None:
+        mia_indices = OpenMaya.MIntArray()
+        mp_array.getExistingArrayAttributeIndices(mia_indices)
+        a_indices = [mia_indices[i] for i in range(mia_indices.length())]
+
+    a_matrices = list()
+    for i_index in a_indices:
+        mo_data = mp_array.elementByLogicalIndex(i_index).asMObject()
+        a_matrices.append(OpenMaya.MMatrix() if mo_data.isNull() else OpenMaya.MFnMatrixData(mo_data).matrix())
+
+    return list(a_indices), from_mmatrices(a_matrices)
+
+
+def queue_plug_array(mdg_mod, mp_array, a_indices, a_stack):
+
+    """
+    !@Brief Queue write of matrix stack on matrix array plug.
+
+    @type mdg_mod: OpenMaya.MDGModifier
+    @param mdg_mod: Modifier.
+    @type mp_array: OpenMaya.MPlug
+    @param mp_array: Array plug of matrix.
+    @type a_indices: list(int)
+    @param a_indices: Logical indices written.
+    @type a_stack: numpy.ndarray / list
+    @param a_stack: Matrix stack, one matrix by index.
+    """
+
+    for i_index, mm in zip(a_indices, to_mmatrices(a_stack)):
+        mdg_mod.newPlugValue(mp_array.elementByLogicalIndex(i_index), OpenMaya.MFnMatrixData().create(mm))
+
+
+def to_mmatrix(matrix):
+
+    """
+    !@Brief Get MMatrix from item of matrix stack.
+
+    @type matrix: numpy.ndarray / OpenMaya.MMatrix / list
+    @param matrix: 4x4 array, MMatrix, 4x4 rows or flat list of 16 floats.
+
+    @rtype: OpenMaya.MMatrix
+    @return: Matrix.
+    """
+
+    if isinstance(matrix, OpenMaya.MMatrix) is True:
+        return matrix
+
+    if numpy is not None and isinstance(matrix, numpy.ndarray) is True:
+        return float_array_to_mmatrix(matrix.ravel().tolist())
+
+    if len(matrix) == 4:
+        return float_array_to_mmatrix([f for a_row in matrix for f in a_row])
+
+    return float_array_to_mmatrix(list(matrix))
+
+
+def take(a_stack, a_indices):
+
+    """
+    !@Brief Get matrices of stack at given indices.
+
+    @type a_stack: numpy.ndarray / list(OpenMaya.MMatrix)
+    @param a_stack: Matrix stack.
+    @type a_indices: list(int)
+    @param a_indices: Indices in stack.
+
+    @rtype: numpy.ndarray / list(OpenMaya.MMatrix)
+    @return: Matrix stack.
+    """
+
+    if numpy is not None and isinstance(a_stack, numpy.ndarray) is True:
+        return a_stack[numpy.asarray(a_indices, dtype=numpy.int64)]
+
+    return [a_stack[i] for i in a_indices]
+
+
+def is_equivalent_many(a_stack_a, a_stack_b, f_tolerance=1e-10):
+
+    """
+    !@Brief Compare matrices of two stacks one by one, like MMatrix.isEquivalent.
+
+    @type a_stack_a: numpy.ndarray / list(OpenMaya.MMatrix)
+    @param a_stack_a: First matrix stack.
+    @type a_stack_b: numpy.ndarray / list(OpenMaya.MMatrix)
+    @param a_stack_b: Second matrix stack.
+    @type f_tolerance: float
+    @param f_tolerance: Max difference of each value.
+
+    @rtype: list(bool)
+    @return: True for each equivalent pair.
+    """
+
+    if numpy is not None and isinstance(a_stack_a, numpy.ndarray) is True:
+        a_diff = numpy.abs(a_stack_a.reshape(-1, 16) - numpy.asarray(a_stack_b).reshape(-1, 16))
+        return (a_diff <= f_tolerance).all(axis=1).tolist()
+
+    return [to_mmatrix(a).isEquivalent(to_mmatrix(b), f_tolerance) for a, b in zip(a_stack_a, a_stack_b)]
+
+
+def inverse_many(a_stack):
+
+    """
+    !@Brief Inverse all matrices of stack.
+
+    @type a_stack: numpy.ndarray / list(OpenMaya.MMatrix)
+    @param a_stack: Matrix stack.
+
+    @rtype: numpy.ndarray / list(OpenMaya.MMatrix)
+    @return: Inverse matrix stack.
+    """
+
+    if numpy is not None and isinstance(a_stack, numpy.ndarray) is True:
+        return numpy.linalg.inv(a_stack)
+
+    return [to_mmatrix(mm).inverse() for mm in a_stack]
+
+
+def multiply_many(a_stack_a, a_stack_b):
+
+    """
+    !@Brief Multiply matrices of two stacks one by one (a[i] * b[i]).
+
+    @type a_stack_a: numpy.ndarray / list(OpenMaya.MMatrix)
+    @param a_stack_a: Left matrix stack.
+    @type a_stack_b: numpy.ndarray / list(OpenMaya.MMatrix)
+    @param a_stack_b: Right matrix stack.
+
+    @rtype: numpy.ndarray / list(OpenMaya.MMatrix)
+    @return: Matrix stack.
+    """
+
+    if numpy is not None and isinstance(a_stack_a, numpy.ndarray) is True:
+        return numpy.matmul(a_stack_a, numpy.asarray(a_stack_b))
+
+    return [to_mmatrix(a) * to_mmatrix(b) for a, b in zip(a_stack_a, a_stack_b)]
+
+
+def translation_many(a_stack):
+
+    """
+    !@Brief Get translation of all matrices of stack.
+
+    @type a_stack: numpy.ndarray / list(OpenMaya.MMatrix)
+    @param a_stack: Matrix stack.
+
+    @rtype: numpy.ndarray / list(tuple(float))
+    @return: (N, 3) translations.
+    """
+
+    if numpy is not None and isinstance(a_stack, numpy.ndarray) is True:
+        return a_stack.reshape(-1, 4, 4)[:, 3, :3].copy()
+
+    return [(mm(3, 0), mm(3, 1), mm(3, 2)) for mm in (to_mmatrix(m) for m in a_stack)]
+
+
+def remove_scale_many(a_stack):
+
+    """
+    !@Brief Remove scale of all matrices of stack. Rows of rotation part are normalized, translation is kept.
+
+    @type a_stack: numpy.ndarray / list(OpenMaya.MMatrix)
+    @param a_stack: Matrix stack.
+
+    @rtype: numpy.ndarray / list(OpenMaya.MMatrix)
+    @return: Matrix stack without scale.
+    """
+
+    if numpy is not None and isinstance(a_stack, numpy.ndarray) is True:
+        a_result = a_stack.reshape(-1, 4, 4).copy()
+        a_result[:, :3, :3] /= numpy.linalg.norm(a_result[:, :3, :3], axis=2)[:, :, None]
+        return a_result
+
+    a_result = list()
+    for mm in a_stack:
+        a_values = mmatrix_to_float_array(to_mmatrix(mm))
+        for i in range(3):
+            f_length = sum(f * f for f in a_values[i * 4:i * 4 + 3]) ** 0.5
+            for j in range(3):
+                a_values[i * 4 + j] /= f_length
+        a_result.append(float_array_to_mmatrix(a_values))
+
+    return a_result
+
+
+# ==================================
+#   Euler
+# ==================================
+
+#   Rotate order index (same as rotateOrder attribute) -> (first, second, third) axis
+ROTATE_ORDER_AXES = ((0, 1, 2), (1, 2, 0), (2, 0, 1), (0, 2, 1), (1, 0, 2), (2, 1, 0))
+
+
+def matrix_to_euler(a_stack, a_orders=0, f_epsilon=1e-9):
+
+    """
+    !@Brief Decompose rotation of all matrices of stack to euler angles.
+            Scale is removed by normalizing rows, matrices are grouped by rotate order
+            and each group is decomposed in one vectorized pass.
+
+    @type a_stack: numpy.ndarray / list(OpenMaya.MMatrix)
+    @param a_stack: Matrix stack.
+    @type a_orders: int / list(int)
+    @param a_orders: Rotate order of all matrices or one by matrix. Same values as rotateOrder attribute.
+    @type f_epsilon: float
+    @param f_epsilon: Under this cosine, matrix is in gimbal lock and third angle is set to 0.
+
+    @rtype: numpy.ndarray / list(tuple(float))
+    @return: (N, 3) X, Y, Z angles in radians.
+    """
+
+    if numpy is None or isinstance(a_stack, numpy.ndarray) is False:
+        a_stack = [to_mmatrix(mm) for mm in a_stack]
+        if isinstance(a_orders, int):
+            a_orders = [a_orders] * len(a_stack)
+        a_eulers = list()
+        for mm, i_order in zip(a_stack, a_orders):
+            me_rotation = OpenMaya.MTransformationMatrix(mm).eulerRotation()
+            me_rotation.reorderIt(i_order)
+            a_eulers.append((me_rotation.x, me_rotation.y, me_rotation.z))
+        return a_eulers
+
+    a_rotations = a_stack.reshape(-1, 4, 4)[:, :3, :3]
+    a_rotations = a_rotations / numpy.linalg.norm(a_rotations, axis=2)[:, :, None]
+    #   Maya matrices are row vector, transpose to use column vector formulas
+    a_rotations = a_rotations.transpose(0, 2, 1)
+
+    a_orders = numpy.broadcast_to(numpy.asarray(a_orders, dtype=numpy.int64), (a_rotations.shape[0],))
+    a_eulers = numpy.zeros((a_rotations.shape[0], 3), dtype=numpy.float64)
+    for i_order in numpy.unique(a_orders):
+        a_mask = a_orders == i_order
+        a_group = a_rotations[a_mask]
+        i, j, k = ROTATE_ORDER_AXES[i_order]
+        f_parity = 1.0 if i_order < 3 else -1.0
+
+        a_second = numpy.arcsin(numpy.clip(-f_parity * a_group[:, k, i], -1.0, 1.0))
+        a_first = numpy.arctan2(f_parity * a_group[:, k, j], a_group[:, k, k])
+        a_third = numpy.arctan2(f_parity * a_group[:, j, i], a_group[:, i, i])
+
+        a_gimbal = numpy.cos(a_second) < f_epsilon
+        if a_gimbal.any():
+            a_first[a_gimbal] = numpy.arctan2(-f_parity * a_group[a_gimbal, j, k], a_group[a_gimbal, j, j])
+            a_third[a_gimbal] = 0.0
+
+        a_group_eulers = numpy.empty((a_group.shape[0], 3), dtype=numpy.float64)
+        a_group_eulers[:, i] = a_first
+        a_group_eulers[:, j] = a_second
+        a_group_eulers[:, k] = a_third
+        a_eulers[a_mask] = a_group_eulers
+
+    return a_eulers
+
+
+def euler_to_matrix(a_eulers, a_orders=0, a_translates=None):
+
+    """
+    !@Brief Build matrix stack from euler angles. Each group of rotate order is built in one vectorized pass.
+
+    @type a_eulers: numpy.ndarray / list(tuple(float))
+    @param a_eulers: (N, 3) X, Y, Z angles in radians.
+    @type a_orders: int / list(int)
+    @param a_orders: Rotate order of all matrices or one by matrix. Same values as rotateOrder attribute.
+    @type a_translates: numpy.ndarray / list(tuple(float))
+    @param a_translates: (N, 3) translations. No translation if None.
+
+    @rtype: numpy.ndarray / list(OpenMaya.MMatrix)
+    @return: Matrix stack.
+    """
+
+    if numpy is None:
+        if isinstance(a_orders, int):
+            a_orders = [a_orders] * len(a_eulers)
+        a_stack = list()
+        for i, (a_euler, i_order) in enumerate(zip(a_eulers, a_orders)):
+            mm = OpenMaya.MEulerRotation(a_euler[0], a_euler[1], a_euler[2], i_order).asMatrix()
+            if a_translates is not None:
+                a_values = mmatrix_to_float_array(mm)
+                a_values[12:15] = list(a_translates[i])
+                mm = float_array_to_mmatrix(a_values)
+            a_stack.append(mm)
+        return a_stack
+
+    a_eulers = numpy.asarray(a_eulers, dtype=numpy.float64).reshape(-1, 3)
+    i_count = a_eulers.shape[0]
+    a_cos = numpy.cos(a_eulers)
+    a_sin = numpy.sin(a_eulers)
+
+    #   Row vector rotation matrix of each axis
+    a_axes = numpy.zeros((3, i_count, 4, 4), dtype=numpy.float64)
+    a_axes[:, :, 3, 3] = 1.0
+    for i_axis, (i, j) in enumerate([(1, 2), (2, 0), (0, 1)]):
+        a_axes[i_axis, :, i_axis, i_axis] = 1.0
+        a_axes[i_axis, :, i, i] = a_cos[:, i_axis]
+        a_axes[i_axis, :, j, j] = a_cos[:, i_axis]
+        a_axes[i_axis, :, i, j] = a_sin[:, i_axis]
+        a_axes[i_axis, :, j, i] = -a_sin[:, i_axis]
+
+    a_orders = numpy.broadcast_to(numpy.asarray(a_orders, dtype=numpy.int64), (i_count,))
+    a_stack = numpy.empty((i_count, 4, 4), dtype=numpy.float64)
+    for i_order in numpy.unique(a_orders):
+        a_mask = a_orders == i_order
+        i, j, k = ROTATE_ORDER_AXES[i_order]
+        a_stack[a_mask] = numpy.matmul(numpy.matmul(a_axes[i][a_mask], a_axes[j][a_mask]), a_axes[k][a_mask])
+
+    if a_translates is not None:
+        a_stack[:, 3, :3] = numpy.asarray(a_translates, dtype=numpy.float64).reshape(-1, 3)
+
+    return a_stack
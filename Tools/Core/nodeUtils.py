@@ -9,9 +9,16 @@
 #   Import Modules
 # ====================================
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from maya import cmds, OpenMaya, OpenMayaAnim
 
 import apiUtils
+import matrix
+import undoUtils
 
 
 # ====================================
@@ -50,10 +57,208 @@ def name(mo_node, b_full=True, b_namespace=True):
     return s_node if b_namespace is True else s_node.split(":")[-1]
 
 
-def get_matrix(mo_node, b_exclusive=False, b_inverse=False):
+_MATRIX_CACHE = dict()
+#   Callbacks only exist in MatrixCacheContext: "global" for time / dag changes, "nodes" for dirty of watched nodes
+_MATRIX_STATE = {"depth": 0, "global": list(), "nodes": dict(), "watchers": dict()}
+_MATRIX_STATS = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+class MatrixCacheContext(object):
+
+    """
+    !@Brief Scope where get_matrix / get_path_matrix cache matrices.
+            Cached matrices of a node are dropped when node or one of its parents is dirty, when time
+            changes and when hierarchy changes, so nodes can be moved in scope. Callbacks are registered
+            only for cached nodes and removed with cache on exit of outermost scope.
+
+            with nodeUtils.MatrixCacheContext():
+                for mo_node in a_nodes:
+                    mm = nodeUtils.get_matrix(mo_node)
+    """
+
+    def __enter__(self):
+
+        _MATRIX_STATE["depth"] += 1
+        if _MATRIX_STATE["depth"] == 1:
+            _MATRIX_STATE["global"].extend([
+                OpenMaya.MDGMessage.addTimeChangeCallback(_on_matrix_time_changed),
+                OpenMaya.MDagMessage.addAllDagChangesCallback(_on_matrix_dag_changed)
+            ])
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        _MATRIX_STATE["depth"] -= 1
+        if _MATRIX_STATE["depth"] == 0:
+            clear_matrix_cache()
+            for i_callback in _MATRIX_STATE["global"]:
+                OpenMaya.MMessage.removeCallback(i_callback)
+            del _MATRIX_STATE["global"][:]
+
+        return False
+
+
+class _MatrixEntry(object):
+
+    """
+    !@Brief Cached matrices of one node path for one time.
+    """
+
+    __slots__ = ("handle", "path", "time", "matrices")
+
+    def __init__(self, moh_node, dp_node, f_time):
+        self.handle = moh_node
+        self.path = dp_node
+        self.time = f_time
+        self.matrices = dict()
+
+
+def _on_matrix_time_changed(*args):
+
+    """
+    !@Brief Time callback. All cached matrices are obsolete.
+    """
+
+    for entry in _MATRIX_CACHE.values():
+        entry.matrices.clear()
+
+
+def _on_matrix_dag_changed(*args):
+
+    """
+    !@Brief Dag callback (parent added, removed or reordered). Cached paths are obsolete.
+    """
+
+    _MATRIX_STATS["invalidations"] += len(_MATRIX_CACHE)
+    clear_matrix_cache()
+
+
+def __on_matrix_node_dirty(mo_node, *args):
+
+    """
+    !@Brief Node dirty callback. Drop matrices of cached nodes at or below dirty node.
+    """
+
+    for t_key in _MATRIX_STATE["watchers"].get(OpenMaya.MObjectHandle(mo_node).hashCode(), ()):
+        entry = _MATRIX_CACHE.get(t_key)
+        if entry is not None and entry.matrices:
+            entry.matrices.clear()
+            _MATRIX_STATS["invalidations"] += 1
+
+
+def __watch_matrix(t_key, dp_node):
+
+    """
+    !@Brief Register dirty callbacks on node of path and its parents, once by node.
+    """
+
+    dp_current = OpenMaya.MDagPath(dp_node)
+    while dp_current.length() > 0:
+        mo_current = dp_current.node()
+        i_hash = OpenMaya.MObjectHandle(mo_current).hashCode()
+        if i_hash not in _MATRIX_STATE["nodes"]:
+            _MATRIX_STATE["nodes"][i_hash] = OpenMaya.MNodeMessage.addNodeDirtyCallback(mo_current, __on_matrix_node_dirty)
+        _MATRIX_STATE["watchers"].setdefault(i_hash, set()).add(t_key)
+        dp_current.pop()
+
+
+def __node_path(mo_node):
+
+    """
+    !@Brief Get first dag path of node.
+
+    @rtype: OpenMaya.MDagPath
+    @return: Dag path.
+    """
+
+    mpa_node = OpenMaya.MDagPathArray()
+    OpenMaya.MDagPath().getAllPathsTo(mo_node, mpa_node)
+    if mpa_node.length() == 0:
+        raise Exception("Problem on get dag path of driver node")
+
+    if mpa_node.length() > 1:
+        cmds.warning("Multi path found. This transform is instanced. First dag path found getted")
+
+    return OpenMaya.MDagPath(mpa_node[0])
+
+
+def __matrix_entry(dp_node):
+
+    """
+    !@Brief Get cache entry of node path, create it on miss.
+
+    @rtype: _MatrixEntry
+    @return: Entry of current time.
+    """
+
+    f_time = OpenMayaAnim.MAnimControl.currentTime().value()
+    mo_node = dp_node.node()
+    moh_node = OpenMaya.MObjectHandle(mo_node)
+    t_key = (moh_node.hashCode(), dp_node.instanceNumber())
+    entry = _MATRIX_CACHE.get(t_key)
+
+    if entry is not None and entry.handle.isValid() is True and entry.handle.object() == mo_node:
+        if entry.time != f_time:
+            entry.time = f_time
+            entry.matrices.clear()
+        return entry
+
+    entry = _MatrixEntry(moh_node, OpenMaya.MDagPath(dp_node), f_time)
+    _MATRIX_CACHE[t_key] = entry
+    __watch_matrix(t_key, dp_node)
+
+    return entry
+
+
+def matrix_cache_stats():
+
+    """
+    !@Brief Get matrix cache counters.
+
+    @rtype: dict
+    @return: {"hits", "misses", "hit_rate", "invalidations", "nodes"}
+    """
+
+    i_total = _MATRIX_STATS["hits"] + _MATRIX_STATS["misses"]
+
+    return {
+        "hits": _MATRIX_STATS["hits"],
+        "misses": _MATRIX_STATS["misses"],
+        "hit_rate": float(_MATRIX_STATS["hits"]) / i_total if i_total else 0.0,
+        "invalidations": _MATRIX_STATS["invalidations"],
+        "nodes": len(_MATRIX_CACHE)
+    }
+
+
+def clear_matrix_cache(b_reset_stats=False):
+
+    """
+    !@Brief Clear matrix cache and dirty callbacks of cached nodes.
+
+    @type b_reset_stats: bool
+    @param b_reset_stats: Reset counters. Default is False.
+    """
+
+    for i_callback in _MATRIX_STATE["nodes"].values():
+        try:
+            OpenMaya.MMessage.removeCallback(i_callback)
+        except RuntimeError:
+            pass
+    _MATRIX_STATE["nodes"].clear()
+    _MATRIX_STATE["watchers"].clear()
+    _MATRIX_CACHE.clear()
+
+    if b_reset_stats is True:
+        for s_key in _MATRIX_STATS:
+            _MATRIX_STATS[s_key] = 0
+
+
+def get_matrix(mo_node, b_exclusive=False, b_inverse=False, b_cache=True):
     
     """
     !@Brief Get worldMatrix of object from dagPath.
+            In MatrixCacheContext, matrices are cached until node is dirty or time changes.
 
     @type mo_node: OpenMaya.MObject
     @param mo_node: Transform api object.
@@ -61,6 +266,8 @@ def get_matrix(mo_node, b_exclusive=False, b_inverse=False):
     @param b_exclusive: Get exlusive matrix. Default is False
     @type b_inverse: bool
     @param b_inverse: Get inverse matrix. Default is False
+    @type b_cache: bool
+    @param b_cache: Use matrix cache in MatrixCacheContext. Default is True
 
     @rtype: OpenMaya.MMatrix
     @return: Transform worldMatrix.
@@ -76,18 +283,128 @@ def get_matrix(mo_node, b_exclusive=False, b_inverse=False):
     if mo_node.hasFn(OpenMaya.MFn.kTransform) is False and mo_node.hasFn(OpenMaya.MFn.kJoint) is False:
         raise TypeError("Invalid type given. Driver must be a transform or joint node")
 
-    #   Get dagPath
-    mpa_node = OpenMaya.MDagPathArray()
-    OpenMaya.MDagPath().getAllPathsTo(mo_node, mpa_node)
-    if mpa_node.length() == 0:
-        raise Exception("Problem on get dag path of driver node")
+    return get_path_matrix(__node_path(mo_node), b_exclusive=b_exclusive, b_inverse=b_inverse, b_cache=b_cache)
 
-    if mpa_node.length() > 1:
-        cmds.warning("Multi path found. This transform is instanced. First dag path found getted")
+
+def get_path_matrix(dp_node, b_exclusive=False, b_inverse=False, b_cache=True):
+
+    """
+    !@Brief Get worldMatrix of dag path. Same cache as get_matrix, without path lookup.
+
+    @type dp_node: OpenMaya.MDagPath
+    @param dp_node: Dag path of transform.
+    @type b_exclusive: bool
+    @param b_exclusive: Get exlusive matrix. Default is False
+    @type b_inverse: bool
+    @param b_inverse: Get inverse matrix. Default is False
+    @type b_cache: bool
+    @param b_cache: Use matrix cache in MatrixCacheContext. Default is True
+
+    @rtype: OpenMaya.MMatrix
+    @return: Transform worldMatrix.
+    """
+
+    if b_cache is False or _MATRIX_STATE["depth"] == 0:
+        return __path_matrix(dp_node, b_exclusive, b_inverse)
+
+    entry = __matrix_entry(dp_node)
+    t_key = (b_exclusive, b_inverse)
+    mm = entry.matrices.get(t_key)
+    if mm is None:
+        _MATRIX_STATS["misses"] += 1
+        mm = __path_matrix(entry.path, b_exclusive, b_inverse)
+        entry.matrices[t_key] = mm
+    else:
+        _MATRIX_STATS["hits"] += 1
+
+    return OpenMaya.MMatrix(mm)
+
+
+def __path_matrix(dp_node, b_exclusive, b_inverse):
+
+    """
+    !@Brief Get matrix of dag path.
+
+    @rtype: OpenMaya.MMatrix
+    @return: Inclusive or exclusive, inverse or not, world matrix.
+    """
 
     if b_inverse is False:
-        return mpa_node[0].inclusiveMatrix() if b_exclusive is False else mpa_node[0].exclusiveMatrix()
-    return mpa_node[0].inclusiveMatrixInverse() if b_exclusive is False else mpa_node[0].exclusiveMatrixInverse()
+        return dp_node.inclusiveMatrix() if b_exclusive is False else dp_node.exclusiveMatrix()
+    return dp_node.inclusiveMatrixInverse() if b_exclusive is False else dp_node.exclusiveMatrixInverse()
+
+
+def decompose(mo_node, mm_local, mer_previous=None):
+
+    """
+    !@Brief Decompose local matrix in transform attribute values.
+            Rotation respect rotateOrder, rotateAxis and jointOrient of node.
+
+    @type mo_node: OpenMaya.MObject
+    @param mo_node: Transform or joint api object.
+    @type mm_local: OpenMaya.MMatrix
+    @param mm_local: Local matrix.
+    @type mer_previous: OpenMaya.MEulerRotation
+    @param mer_previous: If given, rotation closest to this one is returned (avoid flip on animation).
+
+    @rtype: tuple
+    @return: translate (OpenMaya.MVector), rotate (OpenMaya.MEulerRotation), scale (list(float)).
+    """
+
+    mfn_node = OpenMaya.MFnDependencyNode(mo_node)
+    mtm = OpenMaya.MTransformationMatrix(mm_local)
+
+    mv_translate = mtm.getTranslation(OpenMaya.MSpace.kTransform)
+    a_scale = [OpenMaya.MVector(mm_local(i, 0), mm_local(i, 1), mm_local(i, 2)).length() for i in range(3)]
+
+    #   local rotation = rotateAxis * rotate * jointOrient
+    mq_rotate = mtm.rotation()
+    mp_axis = mfn_node.findPlug('rotateAxis')
+    mq_axis = OpenMaya.MEulerRotation(*[mp_axis.child(i).asDouble() for i in range(3)]).asQuaternion()
+    mq_rotate = mq_axis.inverse() * mq_rotate
+    if mo_node.hasFn(OpenMaya.MFn.kJoint) is True:
+        mp_orient = mfn_node.findPlug('jointOrient')
+        mq_orient = OpenMaya.MEulerRotation(*[mp_orient.child(i).asDouble() for i in range(3)]).asQuaternion()
+        mq_rotate = mq_rotate * mq_orient.inverse()
+
+    mer_rotate = mq_rotate.asEulerRotation()
+    mer_rotate.reorderIt(mfn_node.findPlug('rotateOrder').asShort())
+    if mer_previous is not None:
+        mer_rotate.setToClosestSolution(mer_previous)
+
+    return mv_translate, mer_rotate, a_scale
+
+
+def queue_local_matrix(mdg_mod, mo_node, mm_local, mer_previous=None):
+
+    """
+    !@Brief Queue translate / rotate / scale values of local matrix on modifier.
+
+    @type mdg_mod: OpenMaya.MDGModifier
+    @param mdg_mod: Modifier.
+    @type mo_node: OpenMaya.MObject
+    @param mo_node: Transform or joint api object.
+    @type mm_local: OpenMaya.MMatrix
+    @param mm_local: Local matrix.
+    @type mer_previous: OpenMaya.MEulerRotation
+    @param mer_previous: If given, rotation closest to this one is used.
+
+    @rtype: OpenMaya.MEulerRotation
+    @return: Rotation queued.
+    """
+
+    mv_translate, mer_rotate, a_scale = decompose(mo_node, mm_local, mer_previous=mer_previous)
+
+    mfn_node = OpenMaya.MFnDependencyNode(mo_node)
+    for s_attr, a_values in [
+            ('translate', (mv_translate.x, mv_translate.y, mv_translate.z)),
+            ('rotate', (mer_rotate.x, mer_rotate.y, mer_rotate.z)),
+            ('scale', a_scale)]:
+        mp_attr = mfn_node.findPlug(s_attr)
+        for i in range(3):
+            mdg_mod.newPlugValueDouble(mp_attr.child(i), a_values[i])
+
+    return mer_rotate
 
 
 def create(s_type, s_name, mo_parent=None, s_namespace=None, i_restriction=0):
@@ -163,6 +480,106 @@ def create(s_type, s_name, mo_parent=None, s_namespace=None, i_restriction=0):
     return mo_node
 
 
+_DAG_TYPES = dict()
+
+
+def _is_dag_type(s_type):
+
+    """
+    !@Brief Check if node type is a dag node type. Result is cached by type.
+
+    @type s_type: str
+    @param s_type: Node type.
+
+    @rtype: bool
+    @return: True if dag type.
+    """
+
+    if s_type not in _DAG_TYPES:
+        a_inherited = cmds.nodeType(s_type, isTypeName=True, inherited=True) or list()
+        _DAG_TYPES[s_type] = "dagNode" in a_inherited
+
+    return _DAG_TYPES[s_type]
+
+
+def create_many(a_specs, s_namespace=None, mdag_mod=None):
+
+    """
+    !@Brief Create many nodes with one modifier and one doIt.
+            Modifier undoIt remove all nodes and namespaces created.
+
+            a_mo = create_many([
+                ("joint", "root"),
+                ("joint", "spine", 0),
+                {"type": "transform", "name": "ctrl", "parent": mo_parent},
+            ], s_namespace="RIG")
+
+    @type a_specs: list(tuple / dict)
+    @param a_specs: (type, name, parent) or {"type", "name", "parent"}. Parent is optional,
+                    it is an OpenMaya.MObject or index of spec created before.
+    @type s_namespace: str / unicode
+    @param s_namespace: With given namespace, ":" for root namespace. Created if doesn't exist.
+                        Current namespace if None.
+    @type mdag_mod: OpenMaya.MDagModifier
+    @param mdag_mod: Modifier used, give it for queue more operations, its owner add it to undo queue.
+                     If None, new modifier is created and added to undo queue (one undo step).
+
+    @rtype: list(OpenMaya.MObject)
+    @return: Nodes created in specs order.
+    """
+
+    b_register = mdag_mod is None
+    if b_register is True:
+        mdag_mod = OpenMaya.MDagModifier()
+
+    #   Namespace, created by modifier so it is removed on undo
+    s_prefix = ":" if s_namespace == ":" else ""
+    if s_namespace is not None and s_namespace not in ("", ":"):
+        s_current = ""
+        for s_part in s_namespace.strip(":").split(":"):
+            s_parent = s_current or ":"
+            s_current = "{0}:{1}".format(s_current, s_part)
+            if OpenMaya.MNamespace.namespaceExists(s_current) is False:
+                mdag_mod.commandToExecute('namespace -parent "{0}" -add "{1}"'.format(s_parent, s_part))
+        s_prefix = s_current + ":"
+
+    #   Queue creation
+    a_nodes = list()
+    for spec in a_specs:
+        if isinstance(spec, dict) is True:
+            s_type, s_name, parent = spec["type"], spec["name"], spec.get("parent")
+        else:
+            s_type, s_name, parent = (tuple(spec) + (None,))[:3]
+
+        if isinstance(s_name, (str, unicode)) is False:
+            raise TypeError("Argument must be a string not {0}".format(type(s_name)))
+
+        if isinstance(parent, int) is True:
+            if parent < 0 or parent >= len(a_nodes):
+                raise Exception("Parent index {0} of {1} must refer to spec created before.".format(parent, s_name))
+            parent = a_nodes[parent]
+        if parent is not None:
+            if isinstance(parent, OpenMaya.MObject) is False or parent.isNull() is True:
+                raise Exception("Parent given is invalid. Parent must be a non null MObject not {0}".format(parent))
+            if parent.hasFn(OpenMaya.MFn.kWorld) is True:
+                parent = None
+
+        if _is_dag_type(s_type) is True:
+            mo_node = mdag_mod.createNode(s_type, parent if parent is not None else OpenMaya.MObject.kNullObj)
+        else:
+            mo_node = OpenMaya.MDGModifier.createNode(mdag_mod, s_type)
+
+        mdag_mod.renameNode(mo_node, s_prefix + s_name)
+        a_nodes.append(mo_node)
+
+    if b_register is True:
+        undoUtils.do_it(mdag_mod)
+    else:
+        mdag_mod.doIt()
+
+    return a_nodes
+
+
 def remove(mo_node, b_force=False):
     
     """
@@ -198,6 +615,9 @@ def remove(mo_node, b_force=False):
     del mdg_mod
 
 
+_PIVOT_ATTRIBUTES = ['rotatePivot', 'rotatePivotTranslate', 'scalePivot', 'scalePivotTranslate']
+
+
 def snap(mo_driver, mo_driven):
     
     """
@@ -221,17 +641,103 @@ def snap(mo_driver, mo_driven):
         s_msg = "Impossible to get matrix of DependencyNode -- {0} | {1}".format(mo_driver.apiTypeStr(), mo_driven.apiTypeStr())
         raise TypeError(s_msg)
 
-    mm = get_matrix(mo_driver) * get_matrix(mo_driven, b_exclusive=True).inverse()
+    with MatrixCacheContext():
+        mm = get_matrix(mo_driver) * get_matrix(mo_driven, b_exclusive=True, b_inverse=True)
     OpenMaya.MFnTransform(mo_driven).set(OpenMaya.MTransformationMatrix(mm))
 
     mfn_driver = OpenMaya.MFnDependencyNode(mo_driver)
-    mfn_driven = OpenMaya.MFnDependencyNode(mo_driver)
-    for s_attr in ['rotatePivot', 'rotatePivotTranslate', 'scalePivot', 'scalePivotTranslate']:
+    mfn_driven = OpenMaya.MFnDependencyNode(mo_driven)
+    for s_attr in _PIVOT_ATTRIBUTES:
         for i in range(3):
             f = mfn_driver.findPlug(s_attr).child(i).asFloat()
             mfn_driven.findPlug(s_attr).child(i).setFloat(f)
 
 
+def snap_many(a_pairs, b_pivots=True, mdg_mod=None):
+
+    """
+    !@Brief Snap many transform nodes in one batch.
+            Driver and parent matrices are read once before any change. When a driven node is below
+            an other driven node of the batch, its parent matrix is solved from the new world matrix
+            of its nearest driven ancestor, so all results are right in one sweep.
+
+    @type a_pairs: list(tuple(OpenMaya.MObject, OpenMaya.MObject))
+    @param a_pairs: (driver, driven) pairs.
+    @type b_pivots: bool
+    @param b_pivots: Copy pivots of drivers. Default is True.
+    @type mdg_mod: OpenMaya.MDGModifier
+    @param mdg_mod: Modifier used, its owner add it to undo queue. If None, new modifier is created
+                    and added to undo queue (one undo step).
+    """
+
+    b_register = mdg_mod is None
+    if b_register is True:
+        mdg_mod = OpenMaya.MDGModifier()
+
+    #   Read
+    a_driver_paths = list()
+    a_driven_paths = list()
+    for mo_driver, mo_driven in a_pairs:
+        for mo_node in (mo_driver, mo_driven):
+            if isinstance(mo_node, OpenMaya.MObject) is False:
+                raise TypeError("Argument must be a MObject not {0}".format(type(mo_node)))
+            if mo_node.hasFn(OpenMaya.MFn.kTransform) is False:
+                raise TypeError("Invalid type given. Node must be a transform or joint not {0}".format(mo_node.apiTypeStr()))
+        dp_driver = OpenMaya.MDagPath()
+        OpenMaya.MDagPath.getAPathTo(mo_driver, dp_driver)
+        dp_driven = OpenMaya.MDagPath()
+        OpenMaya.MDagPath.getAPathTo(mo_driven, dp_driven)
+        a_driver_paths.append(dp_driver)
+        a_driven_paths.append(dp_driven)
+
+    if not a_pairs:
+        return
+
+    #   Drivers shared by many driven and ancestors of many driven are read once
+    with MatrixCacheContext():
+        a_drivers = matrix.to_stack([get_path_matrix(dp) for dp in a_driver_paths])
+        a_parents = matrix.to_stack([get_path_matrix(dp, b_exclusive=True) for dp in a_driven_paths])
+
+        #   Nearest driven ancestor
+        d_driven = dict((dp.fullPathName(), i) for i, dp in enumerate(a_driven_paths))
+        a_children = list()
+        a_ancestors = list()
+        for i, dp_driven in enumerate(a_driven_paths):
+            s_path = dp_driven.fullPathName()
+            while '|' in s_path.lstrip('|'):
+                s_path = s_path.rsplit('|', 1)[0]
+                if s_path in d_driven:
+                    a_children.append(i)
+                    a_ancestors.append(d_driven[s_path])
+                    break
+
+        #   Parent matrix after ancestors snap: parent * ancestor old world^-1 * ancestor new world
+        if a_children:
+            a_old = matrix.to_stack([get_path_matrix(a_driven_paths[i], b_inverse=True) for i in a_ancestors])
+            a_new = matrix.to_stack([a_drivers[i] for i in a_ancestors])
+            a_solved = matrix.multiply_many(matrix.multiply_many(matrix.to_stack([a_parents[i] for i in a_children]), a_old), a_new)
+            for i, mm_parent in zip(a_children, a_solved):
+                a_parents[i] = mm_parent
+
+    a_locals = matrix.multiply_many(a_drivers, matrix.inverse_many(a_parents))
+
+    #   Apply
+    for i, (mo_driver, mo_driven) in enumerate(a_pairs):
+        queue_local_matrix(mdg_mod, mo_driven, matrix.to_mmatrix(a_locals[i]))
+        if b_pivots is True:
+            mfn_driver = OpenMaya.MFnDependencyNode(mo_driver)
+            mfn_driven = OpenMaya.MFnDependencyNode(mo_driven)
+            for s_attr in _PIVOT_ATTRIBUTES:
+                mp_driver = mfn_driver.findPlug(s_attr)
+                mp_driven = mfn_driven.findPlug(s_attr)
+                for j in range(3):
+                    mdg_mod.newPlugValueDouble(mp_driven.child(j), mp_driver.child(j).asDouble())
+    if b_register is True:
+        undoUtils.do_it(mdg_mod)
+    else:
+        mdg_mod.doIt()
+
+
 def add_shape():
     
     """
@@ -285,53 +791,148 @@ def replace_shape():
     cmds.parent(relative=True, shape=True)
 
 
-def average_selection():
-
-    a_selected = cmds.ls(selection=True, long=True, flatten=True)
-
-    mv_pos = OpenMaya.MVector()
-    i_num_point = 0
-
-    for s_node in a_selected:
-        
-        if "." in s_node:
-            
-            dp_shape = apiUtils.get_path(s_node.split(".")[0])
-            if dp_shape.hasFn(OpenMaya.MFn.kShape) is False:
-                dp_shape.extendToShape()
-            
-            i_index = int(s_node.split("[")[-1].split("]")[0])
-            mpa_pos = OpenMaya.MPointArray()
-            
-            if dp_shape.hasFn(OpenMaya.MFn.kMesh) is True:
-                mfn_mesh = OpenMaya.MFnMesh(dp_shape)
-                mfn_mesh.getPoints(mpa_pos, OpenMaya.MSpace.kWorld)
-                mv_pos += OpenMaya.MVector(mpa_pos[i_index])
-                i_num_point += 1
-            elif dp_shape.hasFn(OpenMaya.MFn.kNurbsSurface) is True:
-                mfn_nurbs_surface = OpenMaya.MFnNurbsSurface(dp_shape)
-                mfn_nurbs_surface.getCVs(mpa_pos, OpenMaya.MSpace.kWorld)
-                mv_pos += OpenMaya.MVector(mpa_pos[i_index])
-                i_num_point += 1
-            elif dp_shape.hasFn(OpenMaya.MFn.kNurbsCurve) is True:
-                mfn_nurbs_curve = OpenMaya.MFnNurbsCurve(dp_shape)
-                mfn_nurbs_curve.getCVs(mpa_pos, OpenMaya.MSpace.kWorld)
-                mv_pos += OpenMaya.MVector(mpa_pos[i_index])
-                i_num_point += 1
+def _selection_points(b_soft=False):
+
+    """
+    !@Brief Get world position and weight of selected points.
+            Components are grouped by shape and only selected points are read.
+            Transform selected give its world position. Mesh edges and faces give their vertices.
+            Point shared by several selected components is read once.
+
+    @type b_soft: bool
+    @param b_soft: Use soft selection weights.
+
+    @rtype: tuple(list(tuple(float, float, float)), list(float))
+    @return: Positions and weights.
+    """
+
+    msl_selected = OpenMaya.MSelectionList()
+    if b_soft is True:
+        mrs_selection = OpenMaya.MRichSelection()
+        OpenMaya.MGlobal.getRichSelection(mrs_selection)
+        mrs_selection.getSelection(msl_selected)
+    else:
+        OpenMaya.MGlobal.getActiveSelectionList(msl_selected)
+
+    a_positions = list()
+    a_weights = list()
+    d_read = dict()
+    it_selection = OpenMaya.MItSelectionList(msl_selected)
+    while not it_selection.isDone():
+        dp_node = OpenMaya.MDagPath()
+        mo_component = OpenMaya.MObject()
+        try:
+            it_selection.getDagPath(dp_node, mo_component)
+        except RuntimeError:
+            #   Dependency node selected
+            it_selection.next()
+            continue
+
+        #   Transform
+        if mo_component.isNull() is True:
+            if dp_node.hasFn(OpenMaya.MFn.kTransform) is False:
+                dp_node.pop()
+            mm_matrix = dp_node.inclusiveMatrix()
+            a_positions.append((mm_matrix(3, 0), mm_matrix(3, 1), mm_matrix(3, 2)))
+            a_weights.append(1.0)
+            it_selection.next()
+            continue
+
+        if dp_node.hasFn(OpenMaya.MFn.kShape) is False:
+            dp_node.extendToShape()
+        if dp_node.hasFn(OpenMaya.MFn.kMesh) is False and \
+                dp_node.hasFn(OpenMaya.MFn.kNurbsSurface) is False and \
+                dp_node.hasFn(OpenMaya.MFn.kNurbsCurve) is False:
+            raise TypeError("Invalid type selected -- {0}".format(dp_node.node().apiTypeStr()))
+
+        #   Mesh edges / faces to vertices
+        if mo_component.hasFn(OpenMaya.MFn.kMeshEdgeComponent) or mo_component.hasFn(OpenMaya.MFn.kMeshPolygonComponent):
+            a_vertices = set()
+            mia_item = OpenMaya.MIntArray()
+            if mo_component.hasFn(OpenMaya.MFn.kMeshEdgeComponent):
+                it_component = OpenMaya.MItMeshEdge(dp_node, mo_component)
+                while not it_component.isDone():
+                    a_vertices.add(it_component.index(0))
+                    a_vertices.add(it_component.index(1))
+                    it_component.next()
             else:
-                raise TypeError("Invalid type selected -- {0}".format(dp_shape.node().apiTypeStr()))
-        else:
-            dp_shape = apiUtils.get_path(s_node)
-            if dp_shape.hasFn(OpenMaya.MFn.kTransform) is False:
-                dp_shape.pop()
-            mm_matrix = dp_shape.inclusiveMatrix()
-            mv_pos += OpenMaya.MVector(mm_matrix(3, 0), mm_matrix(3, 1), mm_matrix(3, 2))
+                it_component = OpenMaya.MItMeshPolygon(dp_node, mo_component)
+                while not it_component.isDone():
+                    it_component.getVertices(mia_item)
+                    a_vertices.update(mia_item[i] for i in range(mia_item.length()))
+                    it_component.next()
+            mia_vertices = OpenMaya.MIntArray()
+            for i_vertex in sorted(a_vertices):
+                mia_vertices.append(i_vertex)
+            mfn_component = OpenMaya.MFnSingleIndexedComponent()
+            mo_component = mfn_component.create(OpenMaya.MFn.kMeshVertComponent)
+            mfn_component.addElements(mia_vertices)
+
+        #   Selected points only, once by shape
+        a_read = d_read.setdefault(dp_node.fullPathName(), set())
+        it_geometry = OpenMaya.MItGeometry(dp_node, mo_component)
+        while not it_geometry.isDone():
+            if it_geometry.index() not in a_read:
+                a_read.add(it_geometry.index())
+                mp_position = it_geometry.position(OpenMaya.MSpace.kWorld)
+                a_positions.append((mp_position.x, mp_position.y, mp_position.z))
+                a_weights.append(it_geometry.weight().influence() if b_soft is True else 1.0)
+            it_geometry.next()
+
+        it_selection.next()
+
+    return a_positions, a_weights
+
+
+def average_selection(s_mode="mean", b_soft=False):
 
-    mv_pos /= float(i_num_point)
+    """
+    !@Brief Create transform on average position of selected transforms and components.
+
+    @type s_mode: str
+    @param s_mode: "mean" for weighted mean of points, "bbox" for bounding box center.
+    @type b_soft: bool
+    @param b_soft: Weight points with soft selection.
+
+    @rtype: str
+    @return: Transform created.
+    """
+
+    if s_mode not in ("mean", "bbox"):
+        raise ValueError('Mode must be "mean" or "bbox" not {0}'.format(s_mode))
 
+    a_positions, a_weights = _selection_points(b_soft=b_soft)
+    if not a_positions:
+        raise Exception("Select transforms or components")
+
+    #   No point with soft selection weight, fall back to unweighted points
+    if sum(a_weights) <= 0.0:
+        cmds.warning("Soft selection weights are all zero, unweighted average is used")
+        a_weights = [1.0] * len(a_positions)
+
+    if numpy is not None:
+        a_positions = numpy.array(a_positions, dtype=numpy.float64)
+        a_weights = numpy.array(a_weights, dtype=numpy.float64)
+        if s_mode == "bbox":
+            a_positions = a_positions[a_weights > 0.0]
+            a_pos = (a_positions.min(axis=0) + a_positions.max(axis=0)) * 0.5
+        else:
+            a_pos = (a_positions * a_weights[:, None]).sum(axis=0) / a_weights.sum()
+        mv_pos = OpenMaya.MVector(*a_pos.tolist())
+    else:
+        if s_mode == "bbox":
+            a_positions = [a_position for a_position, f_weight in zip(a_positions, a_weights) if f_weight > 0.0]
+            mv_pos = OpenMaya.MVector(*[(min(a_axis) + max(a_axis)) * 0.5 for a_axis in zip(*a_positions)])
+        else:
+            f_total = sum(a_weights)
+            mv_pos = OpenMaya.MVector(*[
+                sum(f * f_weight for f, f_weight in zip(a_axis, a_weights)) / f_total for a_axis in zip(*a_positions)
+            ])
 
     s_transform = cmds.createNode("transform", name="AVERAGE_SELECTION", skipSelect=True)
     cmds.setAttr("%s.translateX" % s_transform, mv_pos.x)
     cmds.setAttr("%s.translateY" % s_transform, mv_pos.y)
     cmds.setAttr("%s.translateZ" % s_transform, mv_pos.z)
     cmds.setAttr("%s.displayHandle" % s_transform, True)
+
+    return s_transform
@@ -0,0 +1,218 @@
+# coding=ascii
+
+"""
+!@Brief Timing helpers for bulk operations.
+"""
+
+# ====================================
+#   Import Modules
+# ====================================
+
+import time
+import collections
+import contextlib
+
+from maya import cmds
+
+
+# ====================================
+#   Timings
+# ====================================
+
+class Timings(object):
+
+    """
+    !@Brief Wall-clock timings of an operation, split by phases.
+
+            timings = Timings("bake")
+            with timings.phase("sample"):
+                ...
+            timings.stop()
+    """
+
+    def __init__(self, s_name=""):
+
+        self.name = s_name
+        self.phases = collections.OrderedDict()
+        self.__f_start = time.time()
+        self.__f_end = None
+
+    @contextlib.contextmanager
+    def phase(self, s_phase):
+
+        """
+        !@Brief Time block of code. Time of phases with same name are summed.
+
+        @type s_phase: str
+        @param s_phase: Phase name.
+        """
+
+        f_start = time.time()
+        try:
+            yield
+        finally:
+            self.phases[s_phase] = self.phases.get(s_phase, 0.0) + time.time() - f_start
+
+    def stop(self):
+
+        """
+        !@Brief Stop timer.
+
+        @rtype: float
+        @return: Total time in seconds.
+        """
+
+        self.__f_end = time.time()
+        return self.total
+
+    @property
+    def total(self):
+
+        """
+        !@Brief Wall-clock time since creation until stop (or now if not stopped).
+
+        @rtype: float
+        @return: Time in seconds.
+        """
+
+        f_end = self.__f_end if self.__f_end is not None else time.time()
+        return f_end - self.__f_start
+
+    def as_dict(self):
+
+        """
+        !@Brief Get timings as dict.
+
+        @rtype: dict
+        @return: name, total and phases times in seconds.
+        """
+
+        return {"name": self.name, "total": self.total, "phases": dict(self.phases)}
+
+    def __str__(self):
+
+        s_phases = " | ".join("{0}: {1:.3f}s".format(s, f) for s, f in self.phases.items())
+        return "{0} -- {1:.3f}s ({2})".format(self.name, self.total, s_phases)
+
+
+# ====================================
+#   Perf context
+# ====================================
+
+class PerfContext(object):
+
+    """
+    !@Brief Scene state for bulk operations. Maya state is always restored on exit, even on error.
+
+            with PerfContext("bake", s_evaluation="parallel") as perf:
+                with perf.phase("bake"):
+                    ...
+            print perf.timings
+    """
+
+    EVALUATION_MODES = ("off", "serial", "parallel", "cached")
+
+    def __init__(self, s_name="", s_evaluation=None, b_suspend_refresh=True, b_undo=True, b_autosave=False):
+
+        """
+        @type s_name: str
+        @param s_name: Name of operation. Used for undo chunk and timings.
+        @type s_evaluation: str
+        @param s_evaluation: Evaluation manager mode "off" (DG), "serial", "parallel" or "cached"
+                             (parallel with cached playback). Keep current mode if None.
+        @type b_suspend_refresh: bool
+        @param b_suspend_refresh: Suspend viewport refresh.
+        @type b_undo: bool
+        @param b_undo: True group all commands in one undo chunk, False disable undo queue,
+                       None leave undo as is.
+        @type b_autosave: bool
+        @param b_autosave: If False disable autosave.
+        """
+
+        if s_evaluation is not None and s_evaluation not in self.EVALUATION_MODES:
+            raise ValueError("Evaluation mode must be in {0} not {1}".format(self.EVALUATION_MODES, s_evaluation))
+
+        self.name = s_name
+        self.timings = None
+        self.__s_evaluation = s_evaluation
+        self.__b_suspend_refresh = b_suspend_refresh
+        self.__b_undo = b_undo
+        self.__b_autosave = b_autosave
+        self.__a_restore = list()
+
+    def __enter__(self):
+
+        self.timings = Timings(self.name)
+        self.__a_restore = list()
+        try:
+            with self.phase("enter"):
+                self.__setup()
+        except Exception:
+            self.__restore()
+            raise
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        with self.phase("exit"):
+            self.__restore()
+        self.timings.stop()
+
+        return False
+
+    def phase(self, s_phase):
+
+        """
+        !@Brief Time block of code.
+
+        @type s_phase: str
+        @param s_phase: Phase name.
+        """
+
+        return self.timings.phase(s_phase)
+
+    def __setup(self):
+
+        """
+        !@Brief Change scene state and register how restore it.
+        """
+
+        if self.__b_undo is True:
+            cmds.undoInfo(openChunk=True, chunkName=self.name or "PerfContext")
+            self.__a_restore.append(lambda: cmds.undoInfo(closeChunk=True))
+        elif self.__b_undo is False and cmds.undoInfo(query=True, stateWithoutFlush=True):
+            cmds.undoInfo(stateWithoutFlush=False)
+            self.__a_restore.append(lambda: cmds.undoInfo(stateWithoutFlush=True))
+
+        if self.__b_autosave is False and cmds.autoSave(query=True, enable=True):
+            cmds.autoSave(enable=False)
+            self.__a_restore.append(lambda: cmds.autoSave(enable=True))
+
+        if self.__s_evaluation is not None and hasattr(cmds, "evaluationManager"):
+            s_mode = (cmds.evaluationManager(query=True, mode=True) or ["off"])[0]
+            s_target = "parallel" if self.__s_evaluation == "cached" else self.__s_evaluation
+            if s_mode != s_target:
+                cmds.evaluationManager(mode=s_target)
+                self.__a_restore.append(lambda: cmds.evaluationManager(mode=s_mode))
+            if self.__s_evaluation == "cached" and hasattr(cmds, "evaluator"):
+                if not cmds.evaluator(name="cache", query=True, enable=True):
+                    cmds.evaluator(name="cache", enable=True)
+                    self.__a_restore.append(lambda: cmds.evaluator(name="cache", enable=False))
+
+        if self.__b_suspend_refresh is True and not cmds.about(batch=True):
+            cmds.refresh(suspend=True)
+            self.__a_restore.append(lambda: cmds.refresh(suspend=False))
+
+    def __restore(self):
+
+        """
+        !@Brief Restore scene state in reverse order. All restores are run even if one fails.
+        """
+
+        while self.__a_restore:
+            restore = self.__a_restore.pop()
+            try:
+                restore()
+            except Exception as e:
+                cmds.warning("{0} -- Failed to restore scene state: {1}".format(self.name, e))
@@ -0,0 +1,147 @@
+# coding=ascii
+
+"""
+!@Brief Put api changes (MDGModifier, MDagModifier, MAnimCurveChange, ...) in maya undo queue.
+        Module is also the maya plugin that register the undo command, it is loaded on first use.
+
+            mdg_mod = OpenMaya.MDGModifier()
+            ...
+            undoUtils.do_it(mdg_mod)      # doIt, then Ctrl+Z call mdg_mod.undoIt()
+
+        Modifier given by caller is not registered by the function that use it,
+        the owner of modifier register it once when all its doIt are done.
+"""
+
+# ===========================================
+#    Import Modules
+# ===========================================
+
+import os
+
+from maya import cmds, OpenMaya, OpenMayaMPx
+
+
+S_COMMAND = "isartApiUndo"
+
+_PENDING = list()
+
+
+# ===========================================
+#    Command
+# ===========================================
+
+class _ApiUndoCommand(OpenMayaMPx.MPxCommand):
+
+    """
+    !@Brief Undoable command that hold undo / redo of change already done.
+    """
+
+    def __init__(self):
+
+        OpenMayaMPx.MPxCommand.__init__(self)
+        self.__undo = None
+        self.__redo = None
+
+    def doIt(self, args):
+
+        #   Plugin module can be an other instance than package module, pending changes are read on package.
+        from isartdigital.Tools.Core import undoUtils
+        self.__undo, self.__redo = undoUtils._PENDING.pop(0)
+
+    def redoIt(self):
+
+        self.__redo()
+
+    def undoIt(self):
+
+        self.__undo()
+
+    def isUndoable(self):
+
+        return True
+
+
+def _creator():
+
+    return OpenMayaMPx.asMPxPtr(_ApiUndoCommand())
+
+
+def initializePlugin(mo_plugin):
+
+    OpenMayaMPx.MFnPlugin(mo_plugin, "isartdigital", "1.0").registerCommand(S_COMMAND, _creator)
+
+
+def uninitializePlugin(mo_plugin):
+
+    OpenMayaMPx.MFnPlugin(mo_plugin).deregisterCommand(S_COMMAND)
+
+
+# ===========================================
+#    Func
+# ===========================================
+
+def _load():
+
+    """
+    !@Brief Load this module as plugin if undo command doesn't exist.
+    """
+
+    if hasattr(cmds, S_COMMAND) is False:
+        cmds.loadPlugin(os.path.abspath(__file__).replace('.pyc', '.py'), quiet=True)
+
+
+def register(undo, redo):
+
+    """
+    !@Brief Add change already done to undo queue.
+
+    @type undo: function
+    @param undo: Called without argument on undo.
+    @type redo: function
+    @param redo: Called without argument on redo.
+    """
+
+    _load()
+    _PENDING.append((undo, redo))
+    try:
+        getattr(cmds, S_COMMAND)()
+    finally:
+        #   Command not run (error) must not give its change to next one
+        del _PENDING[:]
+
+
+def do_it(mdg_mod):
+
+    """
+    !@Brief Execute modifier and add it to undo queue.
+
+    @type mdg_mod: OpenMaya.MDGModifier / OpenMaya.MDagModifier
+    @param mdg_mod: Modifier to execute.
+    """
+
+    mdg_mod.doIt()
+    register(mdg_mod.undoIt, mdg_mod.doIt)
+
+
+def register_all(a_changes):
+
+    """
+    !@Brief Add changes already done to undo queue as one undo step.
+            Undo is done in reverse order, redo in given order.
+
+    @type a_changes: list(OpenMaya.MDGModifier / OpenMayaAnim.MAnimCurveChange)
+    @param a_changes: Modifiers (doIt / undoIt) and anim curve changes (redoIt / undoIt), in done order.
+    """
+
+    def _undo():
+        for change in reversed(a_changes):
+            change.undoIt()
+
+    def _redo():
+        for change in a_changes:
+            if isinstance(change, OpenMaya.MDGModifier) is True:
+                change.doIt()
+            else:
+                change.redoIt()
+
+    register(_undo, _redo)
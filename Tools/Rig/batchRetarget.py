@@ -0,0 +1,407 @@
+# coding=ascii
+
+"""
+!@Brief Batch retarget of many clips. Each clip is retargeted, baked and exported
+        to FBX in its own mayapy process, a pool of workers runs clips in parallel.
+
+        Manifest (json):
+            {
+                "rig": "/path/target_rig.ma",
+                "driver_root": "SRC:Hips",
+                "driven_root": "Hips",
+                "mapping": {"Spine": "spine_01"},
+                "output_dir": "/path/export",
+                "clips": ["/path/clip_01.fbx", {"source": "/path/clip_02.fbx", "output": "/path/clip_02_rt.fbx"}]
+            }
+
+        Command line:
+            python batchRetarget.py manifest.json --workers 4 --retries 1 --report report.json
+            python batchRetarget.py manifest.json --stub      (scheduler only, no maya)
+
+        Maya is only imported by workers, scheduler can run headless in any python.
+"""
+
+# ===========================================
+#    Import Modules
+# ===========================================
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import subprocess
+import multiprocessing.pool
+
+
+S_NAMESPACE = 'SRC'
+S_RESULT_TAG = 'BATCH_RESULT:'
+
+
+# ===========================================
+#    Job
+# ===========================================
+
+class Job(object):
+
+    """
+    !@Brief Retarget job of one clip.
+    """
+
+    def __init__(self, s_source, s_output, s_rig, s_driver_root, s_driven_root, d_mapping=None, b_constraint=True):
+
+        self.source = s_source
+        self.output = s_output
+        self.rig = s_rig
+        self.driver_root = s_driver_root
+        self.driven_root = s_driven_root
+        self.mapping = dict(d_mapping) if d_mapping else dict()
+        self.b_constraint = b_constraint
+
+    def to_dict(self):
+
+        """
+        !@Brief Serialize job.
+
+        @rtype: dict
+        @return: Job data.
+        """
+
+        return {
+            'source': self.source,
+            'output': self.output,
+            'rig': self.rig,
+            'driver_root': self.driver_root,
+            'driven_root': self.driven_root,
+            'mapping': self.mapping,
+            'b_constraint': self.b_constraint
+        }
+
+    @classmethod
+    def from_dict(cls, d_job):
+
+        """
+        !@Brief Build job from serialized data.
+
+        @type d_job: dict
+        @param d_job: Job data.
+
+        @rtype: Job
+        @return: New job.
+        """
+
+        return cls(
+            d_job['source'], d_job['output'], d_job['rig'], d_job['driver_root'], d_job['driven_root'],
+            d_mapping=d_job.get('mapping'), b_constraint=d_job.get('b_constraint', True)
+        )
+
+
+def load_manifest(s_path):
+
+    """
+    !@Brief Load jobs from manifest file.
+
+    @type s_path: str
+    @param s_path: Manifest file path.
+
+    @rtype: list(Job)
+    @return: Jobs of all clips.
+    """
+
+    with open(s_path, 'r') as f:
+        d_manifest = json.load(f)
+
+    for s_key in ('rig', 'driver_root', 'driven_root', 'clips'):
+        if s_key not in d_manifest:
+            raise RuntimeError('Manifest "{0}" must define "{1}"'.format(s_path, s_key))
+
+    s_output_dir = d_manifest.get('output_dir', os.path.dirname(os.path.abspath(s_path)))
+
+    a_jobs = list()
+    for clip in d_manifest['clips']:
+        if not isinstance(clip, dict):
+            clip = {'source': clip}
+        s_output = clip.get('output')
+        if not s_output:
+            s_name = os.path.splitext(os.path.basename(clip['source']))[0]
+            s_output = os.path.join(s_output_dir, '{0}.fbx'.format(s_name))
+        a_jobs.append(Job(
+            clip['source'], s_output, clip.get('rig', d_manifest['rig']),
+            clip.get('driver_root', d_manifest['driver_root']), clip.get('driven_root', d_manifest['driven_root']),
+            d_mapping=clip.get('mapping', d_manifest.get('mapping')),
+            b_constraint=clip.get('b_constraint', d_manifest.get('b_constraint', True))
+        ))
+
+    return a_jobs
+
+
+# ===========================================
+#    Runners
+# ===========================================
+
+def _communicate(process, f_timeout=None):
+
+    """
+    !@Brief Wait process end and get its output. Output is read by a thread while process runs,
+            so a worker that write more than pipe buffer never blocks.
+
+    @type process: subprocess.Popen
+    @param process: Process started with stdout=subprocess.PIPE.
+    @type f_timeout: float
+    @param f_timeout: Kill process after this time in seconds. No timeout if None.
+
+    @rtype: str
+    @return: Output of process.
+    """
+
+    a_chunks = list()
+    reader = threading.Thread(target=lambda: a_chunks.extend(iter(process.stdout.readline, b'')))
+    reader.daemon = True
+    reader.start()
+
+    reader.join(f_timeout)
+    if reader.is_alive():
+        process.kill()
+        process.wait()
+        reader.join()
+        process.stdout.close()
+        raise RuntimeError('Worker timeout after {0}s'.format(f_timeout))
+
+    process.wait()
+    process.stdout.close()
+
+    return b''.join(a_chunks).decode('utf-8', 'replace')
+
+
+def mayapy_runner(s_mayapy=None, f_timeout=None):
+
+    """
+    !@Brief Build runner that retarget each job in new mayapy process.
+
+    @type s_mayapy: str
+    @param s_mayapy: mayapy executable. Default is $MAYA_LOCATION/bin/mayapy.
+    @type f_timeout: float
+    @param f_timeout: Kill worker after this time in seconds. No timeout if None.
+
+    @rtype: function
+    @return: Runner, take Job and return worker result dict.
+    """
+
+    if not s_mayapy:
+        s_mayapy = os.path.join(os.environ.get('MAYA_LOCATION', ''), 'bin', 'mayapy')
+
+    def _run(job):
+        a_command = [s_mayapy, os.path.abspath(__file__).replace('.pyc', '.py'), '--worker', json.dumps(job.to_dict())]
+        process = subprocess.Popen(a_command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        s_output = _communicate(process, f_timeout)
+        for s_line in reversed(s_output.splitlines()):
+            if s_line.startswith(S_RESULT_TAG):
+                d_result = json.loads(s_line[len(S_RESULT_TAG):])
+                if d_result.get('error'):
+                    raise RuntimeError(d_result['error'])
+                return d_result
+        raise RuntimeError('Worker exit with code {0} without result:\n{1}'.format(process.returncode, s_output[-2000:]))
+
+    return _run
+
+
+def stub_runner(f_duration=0.0, d_failures=None):
+
+    """
+    !@Brief Build runner that replace maya layer. Used for test scheduler headless.
+
+    @type f_duration: float
+    @param f_duration: Simulated time of each job in seconds.
+    @type d_failures: dict
+    @param d_failures: Number of attempts that fail by source {source: count}.
+
+    @rtype: function
+    @return: Runner, take Job and return result dict.
+    """
+
+    d_failures = dict(d_failures) if d_failures else dict()
+
+    def _run(job):
+        time.sleep(f_duration)
+        if d_failures.get(job.source, 0) > 0:
+            d_failures[job.source] -= 1
+            raise RuntimeError('Stub failure -- {0}'.format(job.source))
+        return {'output': job.output, 'stub': True}
+
+    return _run
+
+
+# ===========================================
+#    Scheduler
+# ===========================================
+
+def _run_job(job, runner, i_retries):
+
+    """
+    !@Brief Run job with retries.
+
+    @rtype: dict
+    @return: Job result.
+    """
+
+    d_result = {'source': job.source, 'output': job.output, 'status': 'failed', 'attempts': 0, 'errors': list()}
+
+    f_start = time.time()
+    for _ in range(i_retries + 1):
+        d_result['attempts'] += 1
+        f_attempt = time.time()
+        try:
+            d_result['worker'] = runner(job)
+            d_result['status'] = 'succeeded'
+            d_result['last_attempt'] = time.time() - f_attempt
+            break
+        except Exception as e:
+            d_result['errors'].append(str(e))
+    d_result['duration'] = time.time() - f_start
+
+    return d_result
+
+
+def run(a_jobs, runner=None, i_workers=None, i_retries=1, s_report=None):
+
+    """
+    !@Brief Run all jobs.
+
+    @type a_jobs: list(Job)
+    @param a_jobs: Jobs to run.
+    @type runner: function
+    @param runner: Function that run one job. Default is mayapy_runner().
+    @type i_workers: int
+    @param i_workers: Number of clips run at same time. Default is cpu count.
+    @type i_retries: int
+    @param i_retries: Number of retries of failed job.
+    @type s_report: str
+    @param s_report: If given, write json summary to this file.
+
+    @rtype: dict
+    @return: Summary with result of each job.
+    """
+
+    if runner is None:
+        runner = mayapy_runner()
+    if not i_workers:
+        i_workers = multiprocessing.cpu_count()
+
+    f_start = time.time()
+    pool = multiprocessing.pool.ThreadPool(max(1, min(i_workers, len(a_jobs) or 1)))
+    try:
+        a_results = pool.map(lambda job: _run_job(job, runner, i_retries), a_jobs)
+    finally:
+        pool.close()
+        pool.join()
+
+    d_summary = {
+        'jobs': a_results,
+        'succeeded': len([d for d in a_results if d['status'] == 'succeeded']),
+        'failed': len([d for d in a_results if d['status'] != 'succeeded']),
+        'workers': i_workers,
+        'duration': time.time() - f_start
+    }
+
+    if s_report:
+        with open(s_report, 'w') as f:
+            json.dump(d_summary, f, indent=4)
+
+    return d_summary
+
+
+# ===========================================
+#    Worker
+# ===========================================
+
+def _work(d_job):
+
+    """
+    !@Brief Retarget, bake and export one clip. Run in mayapy.
+
+    @type d_job: dict
+    @param d_job: Serialized job.
+
+    @rtype: dict
+    @return: Worker result.
+    """
+
+    from maya import standalone
+    standalone.initialize()
+
+    from maya import cmds
+    from isartdigital.Tools.Core import apiUtils
+    from isartdigital.Tools.Rig import retarget
+
+    job = Job.from_dict(d_job)
+    d_times = dict()
+
+    f_start = time.time()
+    cmds.file(job.rig, open=True, force=True)
+    if not cmds.pluginInfo('fbxmaya', query=True, loaded=True):
+        cmds.loadPlugin('fbxmaya', quiet=True)
+    cmds.file(job.source, i=True, namespace=S_NAMESPACE, force=True)
+    d_times['load'] = time.time() - f_start
+
+    #   Timeline from clip keys
+    s_driver = job.driver_root if ':' in job.driver_root else '{0}:{1}'.format(S_NAMESPACE, job.driver_root)
+    a_keys = cmds.keyframe((cmds.listRelatives(s_driver, allDescendents=True, fullPath=True) or list()) + [s_driver], query=True, timeChange=True)
+    if a_keys:
+        cmds.playbackOptions(
+            minTime=min(a_keys), maxTime=max(a_keys),
+            animationStartTime=min(a_keys), animationEndTime=max(a_keys)
+        )
+
+    f_start = time.time()
+    retarget.hierarchy(
+        apiUtils.get_object(s_driver), apiUtils.get_object(job.driven_root),
+        d_mapping=job.mapping, b_constraint=job.b_constraint
+    )
+    d_times['retarget'] = time.time() - f_start
+
+    f_start = time.time()
+    retarget.export_fbx([job.driven_root], job.output)
+    d_times['export'] = time.time() - f_start
+
+    return {'output': job.output, 'times': d_times}
+
+
+def main(a_args=None):
+
+    """
+    !@Brief Command line entry point.
+    """
+
+    parser = argparse.ArgumentParser(description='Batch retarget clips to FBX.')
+    parser.add_argument('manifest', nargs='?', help='Manifest json file.')
+    parser.add_argument('--workers', type=int, default=None, help='Number of mayapy processes.')
+    parser.add_argument('--retries', type=int, default=1, help='Retries of failed clip.')
+    parser.add_argument('--report', default=None, help='Json summary output path.')
+    parser.add_argument('--mayapy', default=None, help='mayapy executable.')
+    parser.add_argument('--timeout', type=float, default=None, help='Timeout of one clip in seconds.')
+    parser.add_argument('--stub', action='store_true', help='Replace maya layer by stand-in.')
+    parser.add_argument('--worker', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(a_args)
+
+    if args.worker is not None:
+        try:
+            d_result = _work(json.loads(args.worker))
+        except Exception as e:
+            d_result = {'error': '{0}: {1}'.format(type(e).__name__, e)}
+        sys.stdout.write('{0}{1}\n'.format(S_RESULT_TAG, json.dumps(d_result)))
+        sys.stdout.flush()
+        return 0 if 'error' not in d_result else 1
+
+    if not args.manifest:
+        parser.error('Manifest is required.')
+
+    runner = stub_runner() if args.stub else mayapy_runner(args.mayapy, args.timeout)
+    d_summary = run(load_manifest(args.manifest), runner=runner, i_workers=args.workers, i_retries=args.retries, s_report=args.report)
+    print ('{0} succeeded, {1} failed in {2:.1f}s'.format(d_summary['succeeded'], d_summary['failed'], d_summary['duration']))
+
+    return 0 if d_summary['failed'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,34 +8,37 @@
 #    Import Mosules
 # ===========================================
 
-from maya import mel, cmds, OpenMaya
+import os
+import math
+import time
+import collections
 
-from PySide2 import QtWidgets
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
-from isartdigital.Tools.Core import apiUtils, nodeUtils, animUtils
+from maya import mel, cmds, OpenMaya, OpenMayaAnim
+
+from isartdigital.Tools.Core import apiUtils, nodeUtils, animUtils, matrix, perfUtils, undoUtils
 
 
 # ===========================================
 #    Func
 # ===========================================
 
-def _constraint(mo_driver, mo_driven):
-    
+def _locked_axes(mo_driven):
+
     """
-    !@Brief Constrain node.
+    !@Brief Get locked translate and rotate axes.
 
-    @type mo_driver: OpenMaya.MObject
-    @param mo_driver: Driver node.
     @type mo_driven: OpenMaya.MObject
     @param mo_driven: Driven node.
 
-    @rtype: OpenMaya.MObject
-    @return: Constraint node.
+    @rtype: tuple
+    @return: set of locked translate axes, set of locked rotate axes ('x', 'y', 'z').
     """
 
-    if not mo_driver.hasFn(OpenMaya.MFn.kTransform) or not mo_driven.hasFn(OpenMaya.MFn.kTransform):
-        raise RuntimeError('Node must be a transform not "{0}" | "{1}"'.format(mo_driver.apiTypeStr(), mo_driven.apiTypeStr()))
-
     mp_translate = OpenMaya.MFnDependencyNode(mo_driven).findPlug('translate')
     mp_rotate = OpenMaya.MFnDependencyNode(mo_driven).findPlug('rotate')
     set_translate = set() if not mp_translate.isLocked() else set(['x', 'y', 'z'])
@@ -46,6 +49,28 @@ def _constraint(mo_driver, mo_driven):
         if  mp_rotate.child(i).isLocked():
             set_rotate.add(s_axis)
 
+    return set_translate, set_rotate
+
+
+def _constraint(mo_driver, mo_driven):
+    
+    """
+    !@Brief Constrain node.
+
+    @type mo_driver: OpenMaya.MObject
+    @param mo_driver: Driver node.
+    @type mo_driven: OpenMaya.MObject
+    @param mo_driven: Driven node.
+
+    @rtype: str
+    @return: Constraint node name.
+    """
+
+    if not mo_driver.hasFn(OpenMaya.MFn.kTransform) or not mo_driven.hasFn(OpenMaya.MFn.kTransform):
+        raise RuntimeError('Node must be a transform not "{0}" | "{1}"'.format(mo_driver.apiTypeStr(), mo_driven.apiTypeStr()))
+
+    set_translate, set_rotate = _locked_axes(mo_driven)
+
     s_node = cmds.parentConstraint(
         nodeUtils.name(mo_driver),
         nodeUtils.name(mo_driven),
@@ -53,10 +78,464 @@ def _constraint(mo_driver, mo_driven):
         skipTranslate=list(set_translate)
     )
 
-    return apiUtils.get_object(s_node[0])
+    return s_node[0]
+
+
+class SkeletonIndex(object):
+
+    """
+    !@Brief Index of skeleton joints by name.
+            Built once per root and reusable for many retarget passes.
+            Lookup order is user mapping, short name, then short name without namespace.
+    """
+
+    def __init__(self, mo_root=None, d_mapping=None):
+
+        """
+        @type mo_root: OpenMaya.MObject
+        @param mo_root: Root joint. If None, index is empty.
+        @type d_mapping: dict
+        @param d_mapping: User mapping {driven name: indexed name}. Names can have namespace or not.
+        """
+
+        self.d_mapping = dict(d_mapping) if d_mapping else dict()
+        self.__d_names = dict()
+        self.__d_stripped = dict()
+        self.__a_items = list()
+
+        if mo_root is not None:
+            self.build(mo_root)
+
+    def __len__(self):
+        return len(self.__a_items)
+
+    def __contains__(self, s_name):
+        return self.find(s_name) is not None
+
+    def __iter__(self):
+        return iter(self.__a_items)
+
+    def add(self, s_name, item):
+
+        """
+        !@Brief Add item to index. First item added with a name is kept.
+
+        @type s_name: str
+        @param s_name: Short name of item (with namespace).
+        @type item: unknow
+        @param item: Item indexed (OpenMaya.MObject for joints).
+        """
+
+        self.__a_items.append(item)
+        self.__d_names.setdefault(s_name, item)
+        self.__d_stripped.setdefault(s_name.split(':')[-1], item)
+
+    def build(self, mo_root):
+
+        """
+        !@Brief Index all joints under root.
+
+        @type mo_root: OpenMaya.MObject
+        @param mo_root: Root joint.
+        """
+
+        for mo_joint in apiUtils.iter_children(mo_root, mfn_type=OpenMaya.MFn.kJoint, b_root=True):
+            self.add(OpenMaya.MFnDependencyNode(mo_joint).name(), mo_joint)
+
+    def find(self, s_name):
+
+        """
+        !@Brief Find indexed item from name.
+
+        @type s_name: str
+        @param s_name: Short name (with or without namespace).
+
+        @rtype: unknow
+        @return: Item found, None if not found.
+        """
+
+        s_stripped = s_name.split(':')[-1]
+        s_mapped = self.d_mapping.get(s_name, self.d_mapping.get(s_stripped))
+        if s_mapped is not None:
+            return self.__d_names.get(s_mapped, self.__d_stripped.get(s_mapped.split(':')[-1]))
+
+        item = self.__d_names.get(s_name)
+        if item is not None:
+            return item
+
+        return self.__d_stripped.get(s_stripped)
+
+
+def _channel_curve(mdg_mod, mp_channel):
+
+    """
+    !@Brief Get animation curve of channel. Curve is created with modifier if channel is not animated.
+
+    @type mdg_mod: OpenMaya.MDGModifier
+    @param mdg_mod: Modifier used for create curves.
+    @type mp_channel: OpenMaya.MPlug
+    @param mp_channel: Channel plug.
+
+    @rtype: OpenMayaAnim.MFnAnimCurve
+    @return: Curve, None if channel is driven by another node than animation curve.
+    """
+
+    mpa_inputs = OpenMaya.MPlugArray()
+    mp_channel.connectedTo(mpa_inputs, True, False)
+    if mpa_inputs.length() > 0:
+        if not mpa_inputs[0].node().hasFn(OpenMaya.MFn.kAnimCurve):
+            cmds.warning('Channel is driven, impossible to retarget it -- {0}'.format(mp_channel.info()))
+            return None
+        return OpenMayaAnim.MFnAnimCurve(mpa_inputs[0].node())
+
+    mfn_curve = OpenMayaAnim.MFnAnimCurve()
+    mfn_curve.create(mp_channel, mdg_mod)
+
+    return mfn_curve
+
+
+def _write_keys(mfn_curve, mta_times, a_values, mac_change):
+
+    """
+    !@Brief Replace keys of curve on range of times. Keys outside of range are kept.
+
+    @type mfn_curve: OpenMayaAnim.MFnAnimCurve
+    @param mfn_curve: Curve.
+    @type mta_times: OpenMaya.MTimeArray
+    @param mta_times: Keys time, sorted.
+    @type a_values: list(float)
+    @param a_values: Keys value in internal unit.
+    @type mac_change: OpenMayaAnim.MAnimCurveChange
+    @param mac_change: Change that record key edits.
+    """
+
+    i_unit = mta_times[0].unit()
+    f_start = mta_times[0].value()
+    f_end = mta_times[mta_times.length() - 1].value()
+    for i in range(mfn_curve.numKeys() - 1, -1, -1):
+        if f_start <= mfn_curve.time(i).asUnits(i_unit) <= f_end:
+            mfn_curve.remove(i, mac_change)
+
+    mda_values = OpenMaya.MDoubleArray()
+    for f_value in a_values:
+        mda_values.append(f_value)
+    mfn_curve.addKeys(
+        mta_times, mda_values,
+        OpenMayaAnim.MFnAnimCurve.kTangentGlobal, OpenMayaAnim.MFnAnimCurve.kTangentGlobal,
+        True, mac_change
+    )
+
+
+def _unwrap(a_values):
+
+    """
+    !@Brief Remove 2 pi jumps between consecutive angles.
+
+    @type a_values: list(float)
+    @param a_values: Angles in radians.
+
+    @rtype: list(float)
+    @return: Continuous angles.
+    """
+
+    if numpy is not None:
+        return numpy.unwrap(numpy.asarray(a_values, dtype=numpy.float64)).tolist()
+
+    a_result = list(a_values[:1])
+    for f_value in a_values[1:]:
+        f_delta = f_value - a_result[-1]
+        a_result.append(f_value - 2.0 * math.pi * round(f_delta / (2.0 * math.pi)))
+
+    return a_result
+
+
+def _columns(a_values):
+
+    """
+    !@Brief Split (N, 3) values in 3 lists.
+
+    @type a_values: numpy.ndarray / list(tuple(float))
+    @param a_values: Values.
+
+    @rtype: list(list(float))
+    @return: X, Y, Z values.
+    """
+
+    if numpy is not None and isinstance(a_values, numpy.ndarray) is True:
+        return [a_values[:, i].tolist() for i in range(3)]
+
+    return [list(a_column) for a_column in zip(*a_values)] if a_values else [list(), list(), list()]
+
+
+def _constant(mm, i_count):
+
+    """
+    !@Brief Get matrix stack that multiply a stack of i_count matrices by same matrix.
+
+    @type mm: OpenMaya.MMatrix
+    @param mm: Matrix.
+    @type i_count: int
+    @param i_count: Number of matrices of other stack.
+
+    @rtype: numpy.ndarray / list(OpenMaya.MMatrix)
+    @return: (1, 4, 4) stack broadcasted by numpy, i_count matrices without numpy.
+    """
+
+    a_stack = matrix.to_stack([mm])
+    if isinstance(a_stack, list) is True:
+        return a_stack * i_count
+
+    return a_stack
+
+
+class _JointSolver(object):
+
+    """
+    !@Brief Static data of driven joint, read once, used for decompose / compose its local matrix
+            on all frames in one batch: local = S * RA * R * JO * IS * T.
+    """
+
+    def __init__(self, dp_joint):
 
+        mfn_joint = OpenMaya.MFnDependencyNode(dp_joint.node())
+        self.node = dp_joint.node()
+        self.rotate_order = mfn_joint.findPlug('rotateOrder').asInt()
+        self.locked = _locked_axes(self.node)
+        mp_translate = mfn_joint.findPlug('translate')
+        mp_rotate = mfn_joint.findPlug('rotate')
+        self.translate = [mp_translate.child(i).asDouble() for i in range(3)]
+        self.rotate = [mp_rotate.child(i).asDouble() for i in range(3)]
 
-def hierarchy(mo_driver, mo_driven):
+        mm_scale = self.__scale_matrix([mfn_joint.findPlug('scale').child(i).asDouble() for i in range(3)])
+        mp_axis = mfn_joint.findPlug('rotateAxis')
+        mm_axis = OpenMaya.MEulerRotation(*[mp_axis.child(i).asDouble() for i in range(3)]).asMatrix()
+        mm_orient = OpenMaya.MMatrix()
+        if mfn_joint.hasAttribute('jointOrient'):
+            mp_orient = mfn_joint.findPlug('jointOrient')
+            mm_orient = OpenMaya.MEulerRotation(*[mp_orient.child(i).asDouble() for i in range(3)]).asMatrix()
+        mm_compensate = OpenMaya.MMatrix()
+        dp_parent = OpenMaya.MDagPath(dp_joint)
+        dp_parent.pop()
+        if mfn_joint.hasAttribute('segmentScaleCompensate') and mfn_joint.findPlug('segmentScaleCompensate').asBool() \
+                and dp_parent.length() > 0 and dp_parent.node().hasFn(OpenMaya.MFn.kJoint):
+            mp_scale = OpenMaya.MFnDependencyNode(dp_parent.node()).findPlug('scale')
+            mm_compensate = self.__scale_matrix([mp_scale.child(i).asDouble() for i in range(3)]).inverse()
+
+        self.pre = mm_scale * mm_axis
+        self.post = mm_orient * mm_compensate
+        self.axis_inverse = mm_axis.inverse()
+        self.orient_inverse = mm_orient.inverse()
+        self.compensate_inverse = mm_compensate.inverse()
+
+    @staticmethod
+    def __scale_matrix(a_scale):
+
+        return matrix.float_array_to_mmatrix([
+            a_scale[0], 0.0, 0.0, 0.0, 0.0, a_scale[1], 0.0, 0.0, 0.0, 0.0, a_scale[2], 0.0, 0.0, 0.0, 0.0, 1.0
+        ])
+
+    def decompose(self, a_locals):
+
+        """
+        !@Brief Get translate and rotate channels of local matrices. Locked axes keep their current value.
+
+        @type a_locals: numpy.ndarray / list(OpenMaya.MMatrix)
+        @param a_locals: Local matrix of each frame.
+
+        @rtype: tuple(list(list(float)), list(list(float)))
+        @return: X, Y, Z translate values and X, Y, Z rotate values (radians).
+        """
+
+        i_count = len(a_locals)
+        a_rotations = matrix.multiply_many(
+            matrix.multiply_many(
+                _constant(self.axis_inverse, i_count),
+                matrix.remove_scale_many(matrix.multiply_many(a_locals, _constant(self.compensate_inverse, i_count)))
+            ),
+            _constant(self.orient_inverse, i_count)
+        )
+
+        a_translate = _columns(matrix.translation_many(a_locals))
+        a_rotate = _columns(matrix.matrix_to_euler(a_rotations, self.rotate_order))
+
+        set_translate, set_rotate = self.locked
+        for i, s_axis in enumerate('xyz'):
+            if s_axis in set_translate:
+                a_translate[i] = [self.translate[i]] * i_count
+            if s_axis in set_rotate:
+                a_rotate[i] = [self.rotate[i]] * i_count
+            else:
+                a_rotate[i] = _unwrap(a_rotate[i])
+
+        return a_translate, a_rotate
+
+    def compose(self, a_translate, a_rotate):
+
+        """
+        !@Brief Get local matrices from channels values.
+
+        @type a_translate: list(list(float))
+        @param a_translate: X, Y, Z translate values.
+        @type a_rotate: list(list(float))
+        @param a_rotate: X, Y, Z rotate values (radians).
+
+        @rtype: numpy.ndarray / list(OpenMaya.MMatrix)
+        @return: Local matrix of each frame.
+        """
+
+        i_count = len(a_translate[0])
+        a_local = matrix.multiply_many(
+            matrix.multiply_many(_constant(self.pre, i_count), matrix.euler_to_matrix(list(zip(*a_rotate)), self.rotate_order)),
+            _constant(self.post, i_count)
+        )
+
+        #   T is last, it only set translation row
+        return matrix.multiply_many(a_local, matrix.euler_to_matrix([(0.0, 0.0, 0.0)] * i_count, 0, list(zip(*a_translate))))
+
+
+def _column(a_samples, i):
+
+    """
+    !@Brief Get matrices of one sampled plug on all frames.
+
+    @type a_samples: numpy.ndarray / list
+    @param a_samples: Values of animUtils.sample, (frames, plugs, 4, 4).
+    @type i: int
+    @param i: Plug index.
+
+    @rtype: numpy.ndarray / list(OpenMaya.MMatrix)
+    @return: Matrix stack.
+    """
+
+    if numpy is not None and isinstance(a_samples, numpy.ndarray) is True:
+        return a_samples[:, i]
+
+    return matrix.to_stack([a_row[i] for a_row in a_samples])
+
+
+def direct(mo_driver, mo_driven, d_mapping=None, driver_index=None, f_start=None, f_end=None):
+
+    """
+    !@Brief Retarget hierarchy without constraint.
+            Driver world matrices are sampled with animUtils.sample, driven joints are solved parent first
+            on all frames in one batch and written directly on animation curves (one undo step).
+            Keys of driven curves on time range are replaced, keys outside of time range are kept.
+            Driven world of each joint is rebuilt from its keyed values, so locked translate / rotate axes
+            (not keyed) and unmatched joints between matched ones are taken into account by children.
+
+    @type mo_driver: OpenMaya.MObject
+    @param mo_driver: Root driver node.
+    @type mo_driven: OpenMaya.MObject
+    @param mo_driven: Root driven node.
+    @type d_mapping: dict
+    @param d_mapping: User mapping {driven name: driver name}. Used only if driver_index is None.
+    @type driver_index: SkeletonIndex
+    @param driver_index: Index of driver skeleton.
+    @type f_start: float
+    @param f_start: Start frame. Animation start if None.
+    @type f_end: float
+    @param f_end: End frame. Animation end if None.
+
+    @rtype: perfUtils.Timings
+    @return: Timings of retarget.
+    """
+
+    with perfUtils.PerfContext('retarget.direct', s_evaluation='parallel') as perf:
+
+        # Match joints, parent first. Parent slot is the nearest matched ancestor.
+        with perf.phase('match'):
+            if driver_index is None:
+                driver_index = SkeletonIndex(mo_driver, d_mapping=d_mapping)
+            a_pairs = list()
+            a_parent_slots = list()
+            a_direct_parents = list()
+            d_slots = dict()
+            for dp_joint in apiUtils.iter_children(mo_driven, mfn_type=OpenMaya.MFn.kJoint, b_root=True, s_yield="path"):
+                mo_source = driver_index.find(OpenMaya.MFnDagNode(dp_joint).name())
+                if mo_source is None:
+                    continue
+                s_path = dp_joint.fullPathName()
+                s_parent = s_path.rsplit('|', 1)[0]
+                s_ancestor = s_parent
+                while s_ancestor and s_ancestor not in d_slots:
+                    s_ancestor = s_ancestor.rsplit('|', 1)[0]
+                d_slots[s_path] = len(a_pairs)
+                a_parent_slots.append(d_slots.get(s_ancestor))
+                a_direct_parents.append(s_ancestor == s_parent)
+                a_pairs.append((mo_source, dp_joint))
+
+        if not a_pairs:
+            return perf.timings
+
+        # Sample driver world matrices, parent matrices of driven roots and offsets of unmatched parents
+        with perf.phase('sample'):
+            a_frames = list(animUtils.TimeRange.from_times(f_start, f_end))
+            a_plugs = [OpenMaya.MFnDependencyNode(mo).findPlug('worldMatrix').elementByLogicalIndex(0) for mo, _ in a_pairs]
+            d_parents = dict()
+            for i, i_parent in enumerate(a_parent_slots):
+                if i_parent is not None and a_direct_parents[i]:
+                    continue
+                mfn_driven = OpenMaya.MFnDependencyNode(a_pairs[i][1].node())
+                d_parents[i] = [len(a_plugs)]
+                a_plugs.append(mfn_driven.findPlug('parentMatrix').elementByLogicalIndex(0))
+                if i_parent is not None:
+                    #   Unmatched joints between joint and its matched ancestor: parentMatrix * ancestor worldInverseMatrix
+                    mfn_ancestor = OpenMaya.MFnDependencyNode(a_pairs[i_parent][1].node())
+                    d_parents[i].append(len(a_plugs))
+                    a_plugs.append(mfn_ancestor.findPlug('worldInverseMatrix').elementByLogicalIndex(0))
+            a_samples = animUtils.sample(a_plugs, a_frames)
+
+        # Solve parent first, driven world is rebuilt from keyed values
+        with perf.phase('solve'):
+            a_worlds = list()
+            a_channels = list()
+            for i, (_, dp_joint) in enumerate(a_pairs):
+                i_parent = a_parent_slots[i]
+                if i_parent is None:
+                    a_parent_world = _column(a_samples, d_parents[i][0])
+                elif a_direct_parents[i]:
+                    a_parent_world = a_worlds[i_parent]
+                else:
+                    a_offset = matrix.multiply_many(_column(a_samples, d_parents[i][0]), _column(a_samples, d_parents[i][1]))
+                    a_parent_world = matrix.multiply_many(a_offset, a_worlds[i_parent])
+
+                solver = _JointSolver(dp_joint)
+                a_locals = matrix.multiply_many(_column(a_samples, i), matrix.inverse_many(a_parent_world))
+                a_translate, a_rotate = solver.decompose(a_locals)
+                a_channels.append({'translate': a_translate, 'rotate': a_rotate, 'locked': solver.locked})
+                a_worlds.append(matrix.multiply_many(solver.compose(a_translate, a_rotate), a_parent_world))
+
+        # Write animation curves
+        with perf.phase('write'):
+            i_unit = OpenMaya.MTime.uiUnit()
+            mta_times = OpenMaya.MTimeArray()
+            for i_frame in a_frames:
+                mta_times.append(OpenMaya.MTime(i_frame, i_unit))
+            mdg_mod = OpenMaya.MDGModifier()
+            a_writes = list()
+            for (_, dp_joint), d_channels in zip(a_pairs, a_channels):
+                set_translate, set_rotate = d_channels['locked']
+                mfn_target = OpenMaya.MFnDependencyNode(dp_joint.node())
+                for s_attr, set_locked in [('translate', set_translate), ('rotate', set_rotate)]:
+                    mp_attr = mfn_target.findPlug(s_attr)
+                    for j, s_axis in enumerate('xyz'):
+                        if s_axis in set_locked:
+                            continue
+                        mfn_curve = _channel_curve(mdg_mod, mp_attr.child(j))
+                        if mfn_curve is not None:
+                            a_writes.append((mfn_curve, d_channels[s_attr][j]))
+            mdg_mod.doIt()
+
+            #   Curves are connected before keys, undo remove keys then curves
+            mac_change = OpenMayaAnim.MAnimCurveChange()
+            for mfn_curve, a_values in a_writes:
+                _write_keys(mfn_curve, mta_times, a_values, mac_change)
+            undoUtils.register_all([mdg_mod, mac_change])
+
+    return perf.timings
+
+
+def hierarchy(mo_driver, mo_driven, d_mapping=None, driver_index=None, b_constraint=True, scheduler=None):
 
     """
     !@Brief Retarget hierarchy.
@@ -65,26 +544,168 @@ def hierarchy(mo_driver, mo_driven):
     @param mo_driver: Root driver node.
     @type mo_driven: OpenMaya.MObject
     @param mo_driven: Root driven node.
+    @type d_mapping: dict
+    @param d_mapping: User mapping {driven name: driver name}. Used only if driver_index is None.
+    @type driver_index: SkeletonIndex
+    @param driver_index: Index of driver skeleton. Give it for reuse it across retarget passes.
+    @type b_constraint: bool
+    @param b_constraint: If True retarget with constraints and bake, else use direct retarget. Default is True.
+    @type scheduler: animUtils.BakeScheduler
+    @param scheduler: If given, bake is added to scheduler and constraints are deleted when scheduler run.
 
-    @rtype: OpenMaya.MObjectArray
-    @return: Constraint nodes.
+    @rtype: perfUtils.Timings
+    @return: Timings of retarget. With scheduler, bake is timed by scheduler results.
     """
 
-    moa_driver = apiUtils.get_children(mo_driver, mfn_type=OpenMaya.MFn.kJoint, b_all_descendents=True, b_shape=False)
-    a_src = [nodeUtils.name(moa_driver[i], b_full=False, b_namespace=False) for i in range(moa_driver.length())]
-    moa_driven = apiUtils.get_children(mo_driven, mfn_type=OpenMaya.MFn.kJoint, b_all_descendents=True, b_shape=False)
-    moa_constraints = OpenMaya.MObjectArray()
+    if not b_constraint:
+        return direct(mo_driver, mo_driven, d_mapping=d_mapping, driver_index=driver_index)
 
-    for i in range(moa_driven.length()):
-        s_short = nodeUtils.name(moa_driven[i], b_full=False, b_namespace=False)
-        if s_short in a_src:
-            moa_constraints.append(_constraint(moa_driver[a_src.index(s_short)], moa_driven[i]))
-    
-    animUtils.bake(moa_driven)
-    cmds.delete([nodeUtils.name(moa_constraints[i]) for i in range(moa_constraints.length())])
+    timings = perfUtils.Timings('retarget.hierarchy')
+
+    with timings.phase('constraint'):
+        if driver_index is None:
+            driver_index = SkeletonIndex(mo_driver, d_mapping=d_mapping)
+        #   Constraints are parented under joints, hierarchy is read before create them.
+        a_driven = list()
+        a_constraints = list()
+        for mo_joint in list(apiUtils.iter_children(mo_driven, mfn_type=OpenMaya.MFn.kJoint, b_root=True)):
+            mfn_joint = OpenMaya.MFnDagNode(mo_joint)
+            a_driven.append(mfn_joint.fullPathName())
+            mo_source = driver_index.find(mfn_joint.name())
+            if mo_source is not None:
+                a_constraints.append(_constraint(mo_source, mo_joint))
+
+    if scheduler is not None:
+        scheduler.add(a_driven, s_name=nodeUtils.name(mo_driven), on_done=lambda: cmds.delete(a_constraints))
+    else:
+        with timings.phase('bake'):
+            animUtils.bake(a_driven)
+        with timings.phase('delete'):
+            cmds.delete(a_constraints)
 
+    timings.stop()
 
-def export_fbx(a_nodes=None, s_file_path=None):
+    return timings
+
+
+# ===========================================
+#    Export
+# ===========================================
+
+FBX_EXPORT_PRESET = collections.OrderedDict([
+    ('FBXExportAnimationOnly', '-v true'),
+    ('FBXExportUpAxis', 'y'),
+    ('FBXExportQuaternion', '-v quaternion'),
+    ('FBXExportUseSceneName', '-v true'),
+    ('FBXExportLights', '-v false'),
+    ('FBXExportCameras', '-v false'),
+    ('FBXExportBakeComplexAnimation', '-v true')
+])
+
+_FBX_STATE = {'preset': None}
+
+
+def apply_fbx_preset(d_preset=None, b_force=False):
+
+    """
+    !@Brief Apply FBX export options. Options are applied once per session
+            and applied again only if preset change.
+
+    @type d_preset: dict
+    @param d_preset: FBX mel command and its arguments. Default is FBX_EXPORT_PRESET.
+    @type b_force: bool
+    @param b_force: Apply preset even if already applied.
+
+    @rtype: bool
+    @return: True if preset was applied.
+    """
+
+    if d_preset is None:
+        d_preset = FBX_EXPORT_PRESET
+
+    t_preset = tuple(d_preset.items())
+    if not b_force and _FBX_STATE['preset'] == t_preset:
+        return False
+
+    if not cmds.pluginInfo('fbxmaya', query=True, loaded=True):
+        cmds.loadPlugin('fbxmaya', quiet=True)
+
+    mel.eval('FBXResetExport')
+    for s_command, s_args in t_preset:
+        mel.eval('{0} {1}'.format(s_command, s_args))
+    _FBX_STATE['preset'] = t_preset
+
+    return True
+
+
+def _ask_file_path():
+
+    """
+    !@Brief Ask output file to user. Qt is imported only here.
+
+    @rtype: str
+    @return: File path.
+    """
+
+    if cmds.about(batch=True):
+        raise RuntimeError('No output file given in batch mode !')
+
+    from PySide2 import QtWidgets
+
+    s_file_path, _ = QtWidgets.QFileDialog().getSaveFileName(
+        parent=None,
+        caption="Export As",
+        filter="FBX (*.fbx)"
+    )
+    if not s_file_path:
+        raise RuntimeError('No output file getted !')
+
+    return s_file_path
+
+
+def export_fbx_many(a_exports, d_preset=None):
+
+    """
+    !@Brief Export many node sets to FBX files in one call.
+
+    @type a_exports: list
+    @param a_exports: List of (nodes, file path).
+    @type d_preset: dict
+    @param d_preset: FBX mel command and its arguments. Default is FBX_EXPORT_PRESET.
+
+    @rtype: list(dict)
+    @return: For each export "file", "nodes", "duration" in seconds and "size" in bytes.
+    """
+
+    apply_fbx_preset(d_preset)
+
+    a_records = list()
+    a_selection = cmds.ls(selection=True, long=True)
+    try:
+        with perfUtils.PerfContext('export_fbx', b_undo=None):
+            for a_nodes, s_file_path in a_exports:
+                f_start = time.time()
+                try:
+                    cmds.select(a_nodes, hierarchy=True)
+                    mel.eval('FBXExport -f "{0}" -s 1'.format(s_file_path.replace('\\', '/')))
+                except Exception as e:
+                    raise RuntimeError('Impossible to export node "{0}"\n\t{1}'.format(a_nodes, e))
+                a_records.append({
+                    'file': s_file_path,
+                    'nodes': list(a_nodes),
+                    'duration': time.time() - f_start,
+                    'size': os.path.getsize(s_file_path) if os.path.exists(s_file_path) else 0
+                })
+    finally:
+        if a_selection:
+            cmds.select(a_selection, replace=True)
+        else:
+            cmds.select(clear=True)
+
+    return a_records
+
+
+def export_fbx(a_nodes=None, s_file_path=None, d_preset=None):
 
     """
     !@Brief Export nodes to FBX.
@@ -92,7 +713,12 @@ def export_fbx(a_nodes=None, s_file_path=None):
     @type a_nodes: None / list
     @param a_nodes: List of node to exprot. Is is node get selected.
     @type s_file_path: None / list
-    @param s_file_path: Output file path.
+    @param s_file_path: Output file path. Ask it to user if None (interactive only).
+    @type d_preset: dict
+    @param d_preset: FBX mel command and its arguments. Default is FBX_EXPORT_PRESET.
+
+    @rtype: dict
+    @return: "file", "nodes", "duration" in seconds and "size" in bytes.
     """
 
     if not a_nodes:
@@ -102,29 +728,9 @@ def export_fbx(a_nodes=None, s_file_path=None):
             raise RuntimeError('First argument must be a list not "{0}"'.format(type(a_nodes)))
     
     if not s_file_path:
-        s_file_path, _ = QtWidgets.QFileDialog().getSaveFileName(
-            parent=None,
-            caption="Export As",
-            filter="FBX (*.fbx)"
-        )
-        if not s_file_path:
-            raise RuntimeError('No output file getted !')
-    
-    if not cmds.pluginInfo('fbxmaya', query=True, loaded=True):
-        cmds.loadPlugin('fbxmaya', quiet=True)
-    
-    try:
-        cmds.select(a_nodes, hierarchy=True)
-        mel.eval('FBXResetExport')
-        mel.eval('FBXExportAnimationOnly -v true')
-        mel.eval('FBXExportUpAxis y')
-        mel.eval('FBXExportQuaternion -v quaternion')
-        mel.eval('FBXExportUseSceneName -v true')
-        mel.eval('FBXExportLights -v false')
-        mel.eval('FBXExportCameras -v false')
-        mel.eval('FBXExportBakeComplexAnimation -v true')
-        mel.eval('FBXExport -f "{0}" -s 1'.format(s_file_path))
-    except Exception as e:
-        raise RuntimeError('Impossible to export node "{0}"'.format(a_nodes))
-
-    print ('File exported to "{0}"'.format(s_file_path))
+        s_file_path = _ask_file_path()
+
+    d_record = export_fbx_many([(a_nodes, s_file_path)], d_preset=d_preset)[0]
+    print ('File exported to "{0}" ({1:.2f}s, {2} bytes)'.format(s_file_path, d_record['duration'], d_record['size']))
+
+    return d_record
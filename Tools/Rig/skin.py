@@ -2,62 +2,169 @@
 #   Import Modules
 # ==================================
 
+import collections
+
 from maya import cmds, OpenMaya
 
-from isartdigital.Tools.Core import apiUtils, matrix
+from isartdigital.Tools.Core import apiUtils, matrix, nodeUtils, perfUtils, undoUtils
 
 
 # ==================================
 #   Skin Utils
 # ==================================
 
-def reset_bind_matrix(a_joints=None):
+def _skin_influences(a_joints=None):
+
+    """
+    !@Brief Walk skinCluster matrix connections once.
+
+    @type a_joints: None / set
+    @param a_joints: Full path of joints to keep. All joints if None.
+
+    @rtype: list
+    @return: List of (skinCluster MObject, matrix index, joint MDagPath).
+    """
+
+    a_influences = list()
+    mpa_sources = OpenMaya.MPlugArray()
+    mia_indices = OpenMaya.MIntArray()
+
+    it_skin = OpenMaya.MItDependencyNodes(OpenMaya.MFn.kSkinClusterFilter)
+    while not it_skin.isDone():
+        mo_skin = it_skin.thisNode()
+        mp_matrix = OpenMaya.MFnDependencyNode(mo_skin).findPlug('matrix')
+        mp_matrix.getExistingArrayAttributeIndices(mia_indices)
+        for i in range(mia_indices.length()):
+            mp_matrix.elementByLogicalIndex(mia_indices[i]).connectedTo(mpa_sources, True, False)
+            if mpa_sources.length() == 0 or not mpa_sources[0].node().hasFn(OpenMaya.MFn.kJoint):
+                continue
+            dp_joint = OpenMaya.MDagPath()
+            OpenMaya.MDagPath.getAPathTo(mpa_sources[0].node(), dp_joint)
+            if a_joints is not None and dp_joint.fullPathName() not in a_joints:
+                continue
+            a_influences.append((mo_skin, mia_indices[i], dp_joint))
+        it_skin.next()
+
+    return a_influences
+
+
+def reset_bind_matrix(a_joints=None, b_dry_run=False, f_tolerance=1e-6):
 
     """
     !@Brief Reset joint bindPreMatrix.
+            skinCluster connections are walked once, all inverse world matrices
+            are computed in one batch and written with one modifier (one undo step).
 
     @type a_joints: list / tuple
     @param a_joints: List of joint names.
+    @type b_dry_run: bool
+    @param b_dry_run: If True only report bindPreMatrix that would change.
+    @type f_tolerance: float
+    @param f_tolerance: Tolerance used for compare bindPreMatrix.
+
+    @rtype: dict
+    @return: "changed": list of (skinCluster, index, joint) changed (or that would change),
+             "timings": perfUtils.Timings.
     """
 
+    timings = perfUtils.Timings('reset_bind_matrix')
+
     # Check args
-    if not a_joints:
-        a_joints = cmds.ls(type='joint', long=True)
-    else:
+    set_joints = None
+    if a_joints:
         a_joints = cmds.ls(a_joints, type='joint', long=True)
         if not a_joints:
             raise RuntimeError('Invalid nodes given !')
-    # Reset
-    for s_joint in a_joints:
-        # Retrieve SkinCluster connections
-        a_outputs = cmds.listConnections('{0}.worldMatrix[0]'.format(s_joint), type='skinCluster',
-                                         source=False, destination=True, plugs=True, connections=True)
-        if not a_outputs:
-            continue
-        # Get BindMatrix
-        dp = apiUtils.get_path(s_joint)
-        mm = dp.inclusiveMatrixInverse()
-        a_matrix = [mm(i, j) for i in range(4) for j in range(4)]
-        # Set skinCluster
-        for i in range(0, len(a_outputs), 2):
-            s_skin, s_attr = a_outputs[i + 1].split('.')
-            i_id = int(s_attr.split('[')[-1].split(']')[0])
-            cmds.setAttr('{0}.bindPreMatrix[{1}]'.format(s_skin, i_id), a_matrix, type='matrix')
+        set_joints = set(a_joints)
+
+    # Retrieve SkinCluster connections
+    with timings.phase('connections'):
+        a_influences = _skin_influences(set_joints)
+        d_joints = dict()
+        for _, _, dp_joint in a_influences:
+            d_joints.setdefault(dp_joint.fullPathName(), dp_joint)
+        a_names = list(d_joints)
+
+    # Get BindMatrix
+    with timings.phase('matrices'):
+        a_world = matrix.to_stack([d_joints[s_joint].inclusiveMatrix() for s_joint in a_names])
+        a_inverse = matrix.inverse_many(a_world)
+        d_index = dict((s_joint, i) for i, s_joint in enumerate(a_names))
+
+    # Set skinCluster
+    a_changed = list()
+    mdg_mod = OpenMaya.MDGModifier()
+    with timings.phase('compare'):
+        d_skins = collections.OrderedDict()
+        for mo_skin, i_id, dp_joint in a_influences:
+            s_skin = OpenMaya.MFnDependencyNode(mo_skin).name()
+            d_skins.setdefault(s_skin, (mo_skin, list(), list()))
+            d_skins[s_skin][1].append(i_id)
+            d_skins[s_skin][2].append(dp_joint.fullPathName())
+
+        for s_skin, (mo_skin, a_ids, a_skin_joints) in d_skins.items():
+            mp_bind = OpenMaya.MFnDependencyNode(mo_skin).findPlug('bindPreMatrix')
+            a_current = matrix.read_plug_array(mp_bind, a_ids)[1]
+            a_expected = matrix.take(a_inverse, [d_index[s_joint] for s_joint in a_skin_joints])
+            a_equivalents = matrix.is_equivalent_many(a_current, a_expected, f_tolerance)
+            a_indices = [i for i, b_equivalent in enumerate(a_equivalents) if not b_equivalent]
+            a_changed.extend((s_skin, a_ids[i], a_skin_joints[i]) for i in a_indices)
+            if not b_dry_run and a_indices:
+                matrix.queue_plug_array(mdg_mod, mp_bind, [a_ids[i] for i in a_indices], matrix.take(a_expected, a_indices))
+
+    if not b_dry_run:
         # Set new BindPose
-        mm = dp.inclusiveMatrix()
-        a_matrix = [mm(i, j) for i in range(4) for j in range(4)]
-        cmds.setAttr('{0}.bindPose'.format(s_joint), a_matrix, type='matrix')
+        with timings.phase('write'):
+            for s_joint, mm_world in zip(a_names, matrix.to_mmatrices(a_world)):
+                mp_bind_pose = OpenMaya.MFnDependencyNode(d_joints[s_joint].node()).findPlug('bindPose')
+                mdg_mod.newPlugValue(mp_bind_pose, OpenMaya.MFnMatrixData().create(mm_world))
+            undoUtils.do_it(mdg_mod)
+
+    timings.stop()
+
+    return {'changed': a_changed, 'timings': timings}
+
+
+def _bind_pose(dp_joint):
+
+    """
+    !@Brief Get bindPose of joint.
+
+    @type dp_joint: OpenMaya.MDagPath
+    @param dp_joint: Joint path.
+
+    @rtype: OpenMaya.MMatrix / None
+    @return: BindPose matrix. None if joint doesn't have bindPose.
+    """
+
+    mfn_joint = OpenMaya.MFnDependencyNode(dp_joint.node())
+    if not mfn_joint.hasAttribute('bindPose'):
+        return None
+
+    mo_data = mfn_joint.findPlug('bindPose').asMObject()
+    if mo_data.isNull():
+        return None
+
+    return OpenMaya.MFnMatrixData(mo_data).matrix()
 
 
 def go_to_bindpose(a_joints=None):
 
     """
-    !@Brief Reset joint bindPreMatrix.
+    !@Brief Set joints to bindPose.
+            Hierarchy and bindPose are read once, local matrices are solved
+            in one batch and applied parent first with one modifier (one undo step).
 
     @type a_joints: list / tuple
     @param a_joints: List of joint names.
+
+    @rtype: dict
+    @return: "missing": joints without bindPose, "orphans": joints with parent without bindPose,
+             "timings": perfUtils.Timings.
     """
 
+    timings = perfUtils.Timings('go_to_bindpose')
+
     # Check args
     if not a_joints:
         a_joints = cmds.ls(type='joint', long=True)
@@ -65,23 +172,60 @@ def go_to_bindpose(a_joints=None):
         a_joints = cmds.ls(a_joints, type='joint', long=True)
         if not a_joints:
             raise RuntimeError('Invalid nodes given !')
-    # Set bindPose
-    for s_joint in a_joints:
-        dp_joint = apiUtils.get_path(s_joint)
-        if not cmds.objExists('{0}.bindPose'.format(s_joint)):
-            continue
-        a_bindPose = cmds.getAttr('{0}.bindPose'.format(s_joint))
-        if not a_bindPose:
-            continue
-        mm_bindpose = matrix.float_array_to_mmatrix(a_bindPose)
-        mm_local = mm_bindpose
-        a_parents = cmds.listRelatives(s_joint, parent=True, fullPath=True)
-        if a_parents:
-            if not cmds.objExists('{0}.bindPose'.format(a_parents[0])):
-                continue
-            a_bindPose_parent = cmds.getAttr('{0}.bindPose'.format(a_parents[0]))
-            if not a_bindPose:
+
+    # Build hierarchy, parent first
+    with timings.phase('hierarchy'):
+        a_joints = sorted(set(a_joints), key=lambda s: s.count('|'))
+        d_paths = dict()
+        d_parents = dict()
+        for s_joint, dp_joint in zip(a_joints, apiUtils.get_paths(a_joints)):
+            d_paths[s_joint] = dp_joint
+            dp_parent = OpenMaya.MDagPath(d_paths[s_joint])
+            dp_parent.pop()
+            if dp_parent.length() > 0:
+                d_parents[s_joint] = dp_parent
+
+    # Read bindPose, each joint only once
+    d_bind_poses = dict()
+
+    def _get_bind_pose(dp):
+        s_path = dp.fullPathName()
+        if s_path not in d_bind_poses:
+            d_bind_poses[s_path] = _bind_pose(dp)
+        return d_bind_poses[s_path]
+
+    a_missing = list()
+    a_orphans = list()
+    a_solved = list()
+    a_binds = list()
+    a_parent_binds = list()
+    with timings.phase('read'):
+        for s_joint in a_joints:
+            mm_bindpose = _get_bind_pose(d_paths[s_joint])
+            if mm_bindpose is None:
+                a_missing.append(s_joint)
                 continue
-            mm_bindpose_parent = matrix.float_array_to_mmatrix(a_bindPose_parent)
-            mm_local = mm_bindpose * mm_bindpose_parent.inverse()
-        OpenMaya.MFnTransform(dp_joint).set(OpenMaya.MTransformationMatrix(mm_local))
+            mm_bindpose_parent = OpenMaya.MMatrix()
+            if s_joint in d_parents:
+                mm_bindpose_parent = _get_bind_pose(d_parents[s_joint])
+                if mm_bindpose_parent is None:
+                    a_orphans.append(s_joint)
+                    continue
+            a_solved.append(s_joint)
+            a_binds.append(mm_bindpose)
+            a_parent_binds.append(mm_bindpose_parent)
+
+    # Solve local matrices
+    with timings.phase('solve'):
+        a_locals = matrix.multiply_many(matrix.to_stack(a_binds), matrix.inverse_many(matrix.to_stack(a_parent_binds)))
+
+    # Set bindPose
+    with timings.phase('write'):
+        mdg_mod = OpenMaya.MDGModifier()
+        for s_joint, mm_local in zip(a_solved, matrix.to_mmatrices(a_locals)):
+            nodeUtils.queue_local_matrix(mdg_mod, d_paths[s_joint].node(), mm_local)
+        undoUtils.do_it(mdg_mod)
+
+    timings.stop()
+
+    return {'missing': a_missing, 'orphans': a_orphans, 'timings': timings}
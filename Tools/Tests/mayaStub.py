@@ -0,0 +1,487 @@
+# coding=ascii
+
+"""
+!@Brief Stand-in maya modules used for run Tools.Core modules without maya.
+        Only data needed by tests is modeled, unknown api enums resolve to unique ints.
+        Run on python 2.7 (mayapy 2) and python 3 (mayapy 3):
+
+            python -m unittest discover -s Tools/Tests -t .
+            python -m pytest Tools/Tests
+
+            mayaStub.install()
+            attr = mayaStub.load_core("attr")
+"""
+
+# ===========================================
+#    Import Modules
+# ===========================================
+
+import os
+import sys
+import types
+import logging
+import itertools
+
+try:
+    import importlib.util as importlib_util
+except ImportError:
+    #   Python 2
+    import imp
+    importlib_util = None
+
+
+S_CORE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Core")
+
+_IDS = itertools.count(1)
+
+#   Plugs by name, resolved by api 2.0 MSelectionList.
+_PLUGS = dict()
+
+
+# ===========================================
+#    Enums
+# ===========================================
+
+class _Enum(type):
+
+    """
+    !@Brief Metaclass that give unique int to each unknown constant (MFn.kJoint, MFnData.kString, ...).
+    """
+
+    def __getattr__(cls, s_name):
+        if s_name.startswith("__"):
+            raise AttributeError(s_name)
+        i_value = next(_IDS)
+        setattr(cls, s_name, i_value)
+        return i_value
+
+
+def _enum(s_name, d_members=None):
+
+    """
+    !@Brief Build class with auto constants.
+
+    @rtype: type
+    @return: New class.
+    """
+
+    return _Enum(s_name, (object,), dict(d_members or dict()))
+
+
+class _Module(types.ModuleType):
+
+    """
+    !@Brief Module that build auto constant class for each unknown member.
+    """
+
+    def __getattr__(self, s_name):
+        if s_name.startswith("__"):
+            raise AttributeError(s_name)
+        value = _enum(s_name)
+        setattr(self, s_name, value)
+        return value
+
+
+# ===========================================
+#    OpenMaya
+# ===========================================
+
+class MObject(object):
+
+    """
+    !@Brief Attribute object. fns are MFn types given by hasFn, unit is numeric / unit / typed type.
+    """
+
+    def __init__(self, a_fns=None, unit=None, s_name=None, data=None):
+        self.fns = set(a_fns or list())
+        self.unit = unit
+        self.name = s_name
+        self.data = data
+        self.deleted = False
+
+    def hasFn(self, i_type):
+        return i_type in self.fns
+
+    def isNull(self):
+        return False
+
+
+class MObjectHandle(object):
+
+    def __init__(self, mo_object):
+        self.mo_object = mo_object
+
+    def hashCode(self):
+        return id(self.mo_object)
+
+    def isAlive(self):
+        return self.mo_object.deleted is False
+
+    def isValid(self):
+        return self.mo_object.deleted is False
+
+    def object(self):
+        return self.mo_object
+
+
+def _function_set(s_name, s_method):
+
+    """
+    !@Brief Build function set class (MFnNumericAttribute, ...) that return unit of attribute object.
+
+    @rtype: type
+    @return: New class with auto constants.
+    """
+
+    def __init__(self, mo_attr=None):
+        self.mo_attr = mo_attr
+
+    return _enum(s_name, {"__init__": __init__, s_method: lambda self: self.mo_attr.unit})
+
+
+class _Array(list):
+
+    """
+    !@Brief Maya array (MIntArray, MPlugArray, ...).
+    """
+
+    def length(self):
+        return len(self)
+
+
+class MPlug(object):
+
+    """
+    !@Brief Plug with value, children (compound) or elements by logical index (array).
+    """
+
+    def __init__(self, mo_attr=None, value=None, a_children=None, d_elements=None, s_name="node.attr"):
+        self.mo_attr = mo_attr
+        self.value = value
+        self.children = a_children
+        self.elements = d_elements
+        self.name = s_name
+        self.handles = 0
+        self.mo_node = MObject(s_name=s_name.split(".", 1)[0])
+        _PLUGS[s_name] = self
+
+    def attribute(self):
+        return self.mo_attr
+
+    def node(self):
+        return self.mo_node
+
+    def partialName(self, *args):
+        return self.name.split(".", 1)[1]
+
+    def asMObject(self):
+        return MObject(data=[mp.value for mp in self.children])
+
+    def setMObject(self, mo_data):
+        for mp, value in zip(self.children, mo_data.data):
+            mp.value = value
+
+    def info(self):
+        return self.name
+
+    def isArray(self):
+        return self.elements is not None
+
+    def isCompound(self):
+        return self.children is not None
+
+    def numChildren(self):
+        return len(self.children)
+
+    def child(self, i):
+        return self.children[i]
+
+    def getExistingArrayAttributeIndices(self, mia_indices):
+        mia_indices[:] = sorted(self.elements)
+
+    def elementByLogicalIndex(self, i):
+        return self.elements[i]
+
+    def asMDataHandle(self):
+        self.handles += 1
+        return MDataHandle(self)
+
+    def destructHandle(self, mdh):
+        self.handles -= 1
+
+    def asBool(self):
+        return bool(self.value)
+
+    def asShort(self):
+        return int(self.value)
+
+    def asInt(self):
+        return int(self.value)
+
+    def asFloat(self):
+        return float(self.value)
+
+    def asDouble(self):
+        return float(self.value)
+
+    def setInt(self, i_value):
+        self.value = i_value
+
+    def setDouble(self, f_value):
+        self.value = f_value
+
+
+class MSelectionList(object):
+
+    """
+    !@Brief Selection list. Any name is found, depend node get the name of its item.
+    """
+
+    def __init__(self):
+        self.items = list()
+
+    def add(self, s_name):
+        self.items.append(s_name)
+
+    def length(self):
+        return len(self.items)
+
+    def getDependNode(self, i, mo_node):
+        mo_node.name = self.items[i]
+
+
+class MFnDependencyNode(object):
+
+    def __init__(self, mo_node):
+        self.mo_node = mo_node
+
+    def name(self):
+        return self.mo_node.name
+
+
+class MDataHandle(object):
+
+    def __init__(self, mp_attr):
+        self.plug = mp_attr
+
+    def asBool(self):
+        return self.plug.asBool()
+
+    def asShort(self):
+        return self.plug.asShort()
+
+    def asInt(self):
+        return self.plug.asInt()
+
+    def asFloat(self):
+        return self.plug.asFloat()
+
+    def asDouble(self):
+        return self.plug.asDouble()
+
+    def asVector(self):
+        return tuple(self.plug.value)
+
+    def asFloatVector(self):
+        return tuple(self.plug.value)
+
+
+class MArrayDataHandle(object):
+
+    def __init__(self, mdh):
+        self.plug = mdh.plug
+        self.indices = sorted(mdh.plug.elements)
+        self.current = 0
+
+    def elementCount(self):
+        return len(self.indices)
+
+    def jumpToArrayElement(self, i):
+        self.current = i
+
+    def elementIndex(self):
+        return self.indices[self.current]
+
+    def inputValue(self):
+        return MDataHandle(self.plug.elements[self.indices[self.current]])
+
+
+def _open_maya():
+
+    """
+    !@Brief Build OpenMaya stand-in.
+
+    @rtype: types.ModuleType
+    @return: Module.
+    """
+
+    om = _Module("maya.OpenMaya")
+    om.MObject = MObject
+    om.MObjectHandle = MObjectHandle
+    om.MFnDependencyNode = MFnDependencyNode
+    om.MSelectionList = MSelectionList
+    om.MPlug = MPlug
+    om.MDataHandle = MDataHandle
+    om.MArrayDataHandle = MArrayDataHandle
+    om.MIntArray = type("MIntArray", (_Array,), dict())
+    om.MPlugArray = type("MPlugArray", (_Array,), dict())
+    om.MFnNumericAttribute = _function_set("MFnNumericAttribute", "unitType")
+    om.MFnUnitAttribute = _function_set("MFnUnitAttribute", "unitType")
+    om.MFnTypedAttribute = _function_set("MFnTypedAttribute", "attrType")
+    om.MSceneMessage = _enum("MSceneMessage", {"addCallback": staticmethod(lambda *args: next(_IDS))})
+    om.MNodeMessage = _enum("MNodeMessage", {"addNameChangedCallback": staticmethod(lambda *args: next(_IDS))})
+    om.MDagMessage = _enum("MDagMessage", {"addAllDagChangesCallback": staticmethod(lambda *args: next(_IDS))})
+    om.MDGMessage = _enum("MDGMessage", {
+        "addNodeRemovedCallback": staticmethod(lambda *args: next(_IDS)),
+        "addNodeAddedCallback": staticmethod(lambda *args: next(_IDS))
+    })
+    om.MMessage = _enum("MMessage", {"removeCallback": staticmethod(lambda *args: None)})
+
+    return om
+
+
+class MSelectionList2(object):
+
+    """
+    !@Brief Api 2.0 selection list. Plugs are resolved by name, api 2.0 plug is stand-in MPlug.
+    """
+
+    def __init__(self):
+        self.items = list()
+
+    def add(self, s_name):
+        self.items.append(s_name)
+
+    def getPlug(self, i):
+        return _PLUGS[self.items[i]]
+
+
+class MFnNumericData2(object):
+
+    """
+    !@Brief Api 2.0 numeric data function set.
+    """
+
+    def __init__(self, mo_data=None):
+        self.mo_data = mo_data
+
+    def create(self, i_type):
+        self.mo_data = MObject(unit=i_type, data=list())
+        return self.mo_data
+
+    def getData(self):
+        return list(self.mo_data.data)
+
+    def setData(self, a_values):
+        self.mo_data.data = list(a_values)
+
+
+def _open_maya2():
+
+    """
+    !@Brief Build api 2.0 OpenMaya stand-in.
+
+    @rtype: types.ModuleType
+    @return: Module.
+    """
+
+    om2 = _Module("maya.api.OpenMaya")
+    om2.MSelectionList = MSelectionList2
+    om2.MFnNumericData = MFnNumericData2
+
+    return om2
+
+
+# ===========================================
+#    Install
+# ===========================================
+
+def install():
+
+    """
+    !@Brief Register stand-in maya and pipeline modules in sys.modules.
+            Installed once, modules already loaded by other tests keep same stand-ins.
+
+    @rtype: types.ModuleType
+    @return: OpenMaya stand-in.
+    """
+
+    if getattr(sys.modules.get("maya"), "b_stub", False) is True:
+        return sys.modules["maya.OpenMaya"]
+
+    maya = types.ModuleType("maya")
+    maya.b_stub = True
+    maya.cmds = _Module("maya.cmds")
+    maya.OpenMaya = _open_maya()
+    maya.OpenMayaAnim = _Module("maya.OpenMayaAnim")
+    maya.OpenMayaMPx = _Module("maya.OpenMayaMPx")
+    maya.api = types.ModuleType("maya.api")
+    maya.api.OpenMaya = _open_maya2()
+
+    qd_log = types.ModuleType("CoreScripts.qdHelpers.qdLog")
+    qd_log.QDLog = type("QDLog", (object,), {"create_log": staticmethod(logging.getLogger)})
+
+    qd_attributes = types.ModuleType("CoreScripts.qdHelpers.qdAttributes")
+    qd_attributes.QDAttributeABC = type("QDAttributeABC", (object,), dict())
+    qd_attributes.QDAttributeEnum = type("QDAttributeEnum", (object,), {"__init__": lambda self, *args: None})
+    qd_attributes.QDAttribute = type("QDAttribute", (object,), {"__init__": lambda self, *args: None})
+
+    sys.modules.update({
+        "maya": maya,
+        "maya.cmds": maya.cmds,
+        "maya.OpenMaya": maya.OpenMaya,
+        "maya.OpenMayaAnim": maya.OpenMayaAnim,
+        "maya.OpenMayaMPx": maya.OpenMayaMPx,
+        "maya.api": maya.api,
+        "maya.api.OpenMaya": maya.api.OpenMaya,
+        "qdMatrix": types.ModuleType("qdMatrix"),
+        "CoreScripts": types.ModuleType("CoreScripts"),
+        "CoreScripts.qdHelpers": types.ModuleType("CoreScripts.qdHelpers"),
+        "CoreScripts.qdHelpers.qdLog": qd_log,
+        "CoreScripts.qdHelpers.qdAttributes": qd_attributes
+    })
+
+    if S_CORE not in sys.path:
+        sys.path.insert(0, S_CORE)
+
+    return maya.OpenMaya
+
+
+def load_source(s_name, s_path):
+
+    """
+    !@Brief Load python file as module, on python 2 and 3.
+
+    @type s_name: str
+    @param s_name: Module name.
+    @type s_path: str
+    @param s_path: Python file path.
+
+    @rtype: types.ModuleType
+    @return: Loaded module.
+    """
+
+    if importlib_util is None:
+        return imp.load_source(s_name, s_path)
+
+    spec = importlib_util.spec_from_file_location(s_name, s_path)
+    module = importlib_util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def load_core(s_module):
+
+    """
+    !@Brief Load Tools.Core module on stand-in maya. Module is loaded under a private name
+            so it never shadows installed packages with same name (attr).
+
+    @type s_module: str
+    @param s_module: Module file name without extension.
+
+    @rtype: types.ModuleType
+    @return: Loaded module.
+    """
+
+    return load_source("_stub_{0}".format(s_module), os.path.join(S_CORE, "{0}.py".format(s_module)))
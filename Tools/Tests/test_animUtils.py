@@ -0,0 +1,134 @@
+# coding=ascii
+
+"""
+!@Brief Tests of BakeScheduler bake passes on stand-in maya.
+"""
+
+# ===========================================
+#    Import Modules
+# ===========================================
+
+import sys
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from . import mayaStub
+
+om = mayaStub.install()
+animUtils = mayaStub.load_core("animUtils")
+
+
+# ===========================================
+#    Tests
+# ===========================================
+
+class MergeRangesTest(unittest.TestCase):
+
+    def test_merge(self):
+        merge_ranges = getattr(animUtils, "_merge_ranges")
+
+        self.assertEqual(merge_ranges([(20, 30), (0, 10), (5, 12)]), ((0, 12), (20, 30)))
+        self.assertEqual(merge_ranges([(0, 10), (11, 20)]), ((0, 20),))
+        self.assertEqual(merge_ranges([(0, 10), (0, 4)]), ((0, 10),))
+
+
+class ReduceTest(unittest.TestCase):
+
+    def _curves(self):
+        a_random = numpy.random.RandomState(0)
+        a_times = numpy.cumsum(a_random.uniform(0.5, 2.0, 80))
+        a_values = numpy.cumsum(a_random.normal(0.0, 1.0, (4, 80)), axis=1)
+        a_values[1] = numpy.sin(a_times * 0.2)
+        a_values[2] = a_times * 0.5 + 1.0
+        return a_times, a_values
+
+    def test_list_bound(self):
+        reduce_list = getattr(animUtils, "_reduce_list")
+        a_times = [0.0, 1.0, 2.0, 3.0, 4.0, 6.0]
+        a_values = [0.0, 1.0, 2.0, 2.5, 0.0, 0.0]
+
+        a_keep = reduce_list(a_times, a_values, 0.1)
+
+        self.assertEqual(a_keep, [True, False, True, True, True, True])
+        self.assertEqual(reduce_list(a_times, a_values, 10.0), [True, False, False, False, False, True])
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_mask_bound(self):
+        reduce_mask = getattr(animUtils, "_reduce_mask")
+        a_times, a_values = self._curves()
+        a_tolerances = numpy.array([0.5, 0.01, 0.01, 0.0])
+
+        a_keep = reduce_mask(a_times, a_values, a_tolerances)
+
+        self.assertTrue(a_keep[:, [0, -1]].all())
+        self.assertEqual(a_keep[2].sum(), 2)
+        self.assertTrue(a_keep[3].all())
+        for a_row, a_row_keep, f_tolerance in zip(a_values, a_keep, a_tolerances):
+            a_linear = numpy.interp(a_times, a_times[a_row_keep], a_row[a_row_keep])
+            self.assertLessEqual(numpy.abs(a_linear - a_row).max(), f_tolerance + 1e-12)
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_mask_list(self):
+        reduce_mask = getattr(animUtils, "_reduce_mask")
+        reduce_list = getattr(animUtils, "_reduce_list")
+        a_times, a_values = self._curves()
+        a_tolerances = numpy.array([0.5, 0.01, 0.01, 0.2])
+
+        a_keep = reduce_mask(a_times, a_values, a_tolerances)
+
+        for a_row, a_row_keep, f_tolerance in zip(a_values, a_keep, a_tolerances):
+            self.assertEqual(a_row_keep.tolist(), reduce_list(a_times.tolist(), a_row.tolist(), f_tolerance))
+
+
+class BakeSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.a_bakes = list()
+        cmds = sys.modules["maya.cmds"]
+        self.d_commands = dict((s, getattr(cmds, s)) for s in ("bakeResults", "undoInfo", "autoSave", "about", "refresh"))
+        cmds.bakeResults = lambda a_items, **kwargs: self.a_bakes.append((sorted(a_items), kwargs["time"]))
+        cmds.undoInfo = lambda **kwargs: None
+        cmds.autoSave = lambda **kwargs: False
+        cmds.about = lambda **kwargs: True
+        cmds.refresh = lambda **kwargs: None
+
+    def tearDown(self):
+        cmds = sys.modules["maya.cmds"]
+        for s_command, command in self.d_commands.items():
+            setattr(cmds, s_command, command)
+
+    def _scheduler(self, a_jobs):
+        scheduler = animUtils.BakeScheduler()
+        scheduler.jobs = [animUtils.BakeJob(s_name, a_nodes, f_start, f_end) for s_name, a_nodes, f_start, f_end in a_jobs]
+        return scheduler
+
+    def test_bake_once(self):
+        scheduler = self._scheduler([("a", ["n1", "n2"], 0, 10), ("b", ["n2", "n3"], 5, 20), ("c", ["n3"], 5, 20)])
+
+        scheduler.run(s_evaluation=None)
+
+        self.assertEqual(sorted(self.a_bakes), [(["n1"], (0, 10)), (["n2"], (0, 20)), (["n3"], (5, 20))])
+
+    def test_disjoint_union(self):
+        scheduler = self._scheduler([("a", ["n1"], 0, 10), ("b", ["n1"], 30, 40)])
+
+        scheduler.run(s_evaluation=None)
+
+        self.assertEqual(self.a_bakes, [(["n1"], (0, 10)), (["n1"], (30, 40))])
+
+    def test_progress(self):
+        scheduler = self._scheduler([("a", ["n1", "n2"], 0, 10), ("b", ["n2"], 5, 20), ("c", list(), 0, 3)])
+        d_progress = dict()
+
+        results = scheduler.run(progress=lambda job, f_progress: d_progress.__setitem__(job.name, f_progress), s_evaluation=None)
+
+        self.assertEqual(d_progress, {"a": 1.0, "b": 1.0, "c": 1.0})
+        self.assertEqual([s_names for _, _, s_names in results.ranges], [["a", "c"], ["a"], ["a", "b"], ["b"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
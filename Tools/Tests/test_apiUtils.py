@@ -0,0 +1,84 @@
+# coding=ascii
+
+"""
+!@Brief Tests of apiUtils name resolver cache on stand-in maya.
+"""
+
+# ===========================================
+#    Import Modules
+# ===========================================
+
+import unittest
+
+from . import mayaStub
+
+om = mayaStub.install()
+apiUtils = mayaStub.load_core("apiUtils")
+
+try:
+    basestring
+except NameError:
+    #   Python 3
+    apiUtils.basestring = str
+
+
+# ===========================================
+#    Tests
+# ===========================================
+
+class ResolverCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        apiUtils.clear_resolver_cache(b_remove_callbacks=True, b_reset_stats=True)
+
+    def test_hits(self):
+        a_objects = apiUtils.get_objects(["a", "b", "a"])
+        self.assertEqual([mo.name for mo in a_objects], ["a", "b", "a"])
+        self.assertEqual(apiUtils.resolver_stats(), {"hits": 0, "misses": 2, "size": 2})
+
+        self.assertIs(apiUtils.get_objects(["b"])[0], a_objects[1])
+        self.assertEqual(apiUtils.resolver_stats(), {"hits": 1, "misses": 2, "size": 2})
+
+    def test_callbacks_registered_once(self):
+        apiUtils.get_objects(["a"])
+        i_callbacks = len(apiUtils._RESOLVER_CALLBACKS)
+        self.assertGreater(i_callbacks, 0)
+
+        apiUtils.get_objects(["b"])
+        self.assertEqual(len(apiUtils._RESOLVER_CALLBACKS), i_callbacks)
+
+        apiUtils.clear_resolver_cache(b_remove_callbacks=True)
+        self.assertEqual(len(apiUtils._RESOLVER_CALLBACKS), 0)
+
+    def test_names_changed(self):
+        mo_node = apiUtils.get_objects(["a"])[0]
+
+        getattr(apiUtils, "__on_names_changed")()
+
+        self.assertEqual(apiUtils.resolver_stats()["size"], 0)
+        self.assertIsNot(apiUtils.get_objects(["a"])[0], mo_node)
+
+    def test_deleted_node(self):
+        mo_node = apiUtils.get_objects(["a"])[0]
+        mo_node.deleted = True
+
+        self.assertIsNot(apiUtils.get_objects(["a"])[0], mo_node)
+        self.assertEqual(apiUtils.resolver_stats(), {"hits": 0, "misses": 2, "size": 1})
+
+    def test_clear(self):
+        apiUtils.get_objects(["a", "b"])
+        apiUtils.get_objects(["a"])
+
+        apiUtils.clear_resolver_cache()
+        self.assertEqual(apiUtils.resolver_stats(), {"hits": 1, "misses": 2, "size": 0})
+
+        apiUtils.clear_resolver_cache(b_reset_stats=True)
+        self.assertEqual(apiUtils.resolver_stats(), {"hits": 0, "misses": 0, "size": 0})
+
+    def test_invalid_name(self):
+        with self.assertRaises(RuntimeError):
+            apiUtils.get_objects([1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,211 @@
+# coding=ascii
+
+"""
+!@Brief Tests of attr bulk getters (get_array, get_many) on stand-in maya.
+"""
+
+# ===========================================
+#    Import Modules
+# ===========================================
+
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from . import mayaStub
+
+om = mayaStub.install()
+attr = mayaStub.load_core("attr")
+
+
+# ===========================================
+#    Helpers
+# ===========================================
+
+def _numeric(i_type, value):
+
+    """
+    !@Brief Build plug of numeric attribute.
+
+    @rtype: mayaStub.MPlug
+    @return: Plug.
+    """
+
+    mo_attr = om.MObject([om.MFn.kNumericAttribute], unit=i_type)
+
+    return om.MPlug(mo_attr, value=value)
+
+
+def _array(d_elements):
+
+    """
+    !@Brief Build array plug from {logical index: element plug}.
+
+    @rtype: mayaStub.MPlug
+    @return: Plug.
+    """
+
+    return om.MPlug(om.MObject(), d_elements=d_elements)
+
+
+# ===========================================
+#    Tests
+# ===========================================
+
+class GetArrayTest(unittest.TestCase):
+
+    def setUp(self):
+        attr.clear_descriptor_cache()
+
+    def test_handle_reader(self):
+        mo_attr = om.MObject([om.MFn.kNumericAttribute], unit=om.MFnNumericData.kDouble)
+        mp_array = _array({0: om.MPlug(mo_attr, 1.5), 2: om.MPlug(mo_attr, 2.5), 5: om.MPlug(mo_attr, 3.5)})
+
+        a_indices, a_values = attr.get_array(mp_array, b_indices=True)
+
+        self.assertEqual(a_indices, [0, 2, 5])
+        self.assertEqual(list(a_values), [1.5, 2.5, 3.5])
+        self.assertEqual(mp_array.handles, 0)
+
+    def test_handle_reader_vector(self):
+        mo_attr = om.MObject([om.MFn.kNumericAttribute], unit=om.MFnNumericData.k3Double)
+        mp_array = _array({0: om.MPlug(mo_attr, (1.0, 2.0, 3.0)), 1: om.MPlug(mo_attr, (4.0, 5.0, 6.0))})
+
+        a_values = attr.get_array(mp_array)
+
+        self.assertEqual([list(a_row) for a_row in a_values], [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+
+    def test_plug_reader_compound(self):
+        def _element(a_values):
+            return om.MPlug(om.MObject(), a_children=[_numeric(om.MFnNumericData.kDouble, f) for f in a_values])
+
+        mp_array = _array({1: _element([1.0, 2.0]), 3: _element([3.0, 4.0])})
+
+        a_indices, a_values = attr.get_array(mp_array, b_indices=True)
+
+        self.assertEqual(a_indices, [1, 3])
+        self.assertEqual([list(a_row) for a_row in a_values], [[1.0, 2.0], [3.0, 4.0]])
+        self.assertEqual(mp_array.handles, 0)
+
+    def test_empty(self):
+        self.assertEqual(len(attr.get_array(_array(dict()))), 0)
+
+    def test_invalid_argument(self):
+        with self.assertRaises(TypeError):
+            attr.get_array("node.attr")
+        with self.assertRaises(TypeError):
+            attr.get_array(_numeric(om.MFnNumericData.kDouble, 1.0))
+
+
+class GetManyTest(unittest.TestCase):
+
+    def setUp(self):
+        attr.clear_descriptor_cache()
+
+    def tearDown(self):
+        attr.numpy = numpy
+
+    def test_scalars(self):
+        a_plugs = [
+            _numeric(om.MFnNumericData.kDouble, 1.25),
+            _numeric(om.MFnNumericData.kInt, 3),
+            _numeric(om.MFnNumericData.kBoolean, True)
+        ]
+
+        a_values = attr.get_many(a_plugs)
+
+        self.assertEqual(list(a_values), [1.25, 3.0, 1.0])
+        if numpy is not None:
+            self.assertIsInstance(a_values, numpy.ndarray)
+            self.assertTrue(a_values.flags["C_CONTIGUOUS"])
+
+    def test_reader_cached(self):
+        mo_attr = om.MObject([om.MFn.kNumericAttribute], unit=om.MFnNumericData.kDouble)
+
+        attr.get_many([om.MPlug(mo_attr, 1.0)])
+        descriptor = attr._descriptor(mo_attr)
+        reader = descriptor.reader
+        self.assertIsNotNone(reader)
+
+        self.assertEqual(list(attr.get_many([om.MPlug(mo_attr, 2.0), om.MPlug(mo_attr, 3.0)])), [2.0, 3.0])
+        self.assertIs(attr._descriptor(mo_attr).reader, reader)
+
+    def test_plug_array(self):
+        mpa_plugs = om.MPlugArray([_numeric(om.MFnNumericData.kDouble, 1.0), _numeric(om.MFnNumericData.kDouble, 2.0)])
+
+        self.assertEqual(list(attr.get_many(mpa_plugs)), [1.0, 2.0])
+
+    def test_without_numpy(self):
+        attr.numpy = None
+
+        a_values = attr.get_many([_numeric(om.MFnNumericData.kDouble, 1.0), _numeric(om.MFnNumericData.kDouble, 2.0)])
+
+        self.assertEqual(a_values, [1.0, 2.0])
+
+    def test_without_numpy_array(self):
+        attr.numpy = None
+        mo_attr = om.MObject([om.MFn.kNumericAttribute], unit=om.MFnNumericData.kDouble)
+
+        self.assertEqual(attr.get_array(_array({0: om.MPlug(mo_attr, 1.0)})), [1.0])
+
+    def test_not_homogeneous(self):
+        mo_attr = om.MObject([om.MFn.kNumericAttribute], unit=om.MFnNumericData.kDouble)
+        mp_array = _array({0: om.MPlug(mo_attr, 1.0), 1: om.MPlug(mo_attr, 2.0)})
+
+        a_values = attr.get_many([mp_array, _numeric(om.MFnNumericData.kDouble, 3.0)])
+
+        self.assertIsInstance(a_values, list)
+        self.assertEqual(list(a_values[0]), [1.0, 2.0])
+        self.assertEqual(a_values[1], 3.0)
+
+    def test_invalid_argument(self):
+        with self.assertRaises(TypeError):
+            attr.get_many("node.attr")
+        with self.assertRaises(TypeError):
+            attr.get_many(["node.attr"])
+
+
+class NumericDataTest(unittest.TestCase):
+
+    def setUp(self):
+        attr.clear_descriptor_cache()
+
+    def _plug(self, i_type, a_values, s_name="node.numeric"):
+        mo_attr = om.MObject([om.MFn.kNumericAttribute], unit=i_type)
+        a_children = [om.MPlug(om.MObject(), value=value, s_name="{0}{1}".format(s_name, i)) for i, value in enumerate(a_values)]
+        return om.MPlug(mo_attr, a_children=a_children, s_name=s_name)
+
+    def test_get(self):
+        get_numeric = getattr(attr, "__get_numeric")
+
+        self.assertEqual(get_numeric(self._plug(om.MFnNumericData.k3Double, [1.0, 2.0, 3.0], "node.translate"), om.MFnNumericData.k3Double), (1.0, 2.0, 3.0))
+        self.assertEqual(get_numeric(self._plug(om.MFnNumericData.k2Int, [1, 2], "node.range"), om.MFnNumericData.k2Int), (1, 2))
+
+    def test_api2_plug_cached(self):
+        get_numeric = getattr(attr, "__get_numeric")
+        mp_attr = self._plug(om.MFnNumericData.k3Double, [1.0, 2.0, 3.0])
+
+        get_numeric(mp_attr, om.MFnNumericData.k3Double)
+        self.assertEqual(len(attr._API2_PLUGS), 1)
+        get_numeric(mp_attr, om.MFnNumericData.k3Double)
+        self.assertEqual(len(attr._API2_PLUGS), 1)
+
+        attr.clear_descriptor_cache()
+        self.assertEqual(len(attr._API2_PLUGS), 0)
+
+    def test_set(self):
+        set_numeric = getattr(attr, "__set_numeric")
+        mp_attr = self._plug(om.MFnNumericData.k4Double, [0.0] * 4)
+
+        set_numeric(mp_attr, (1, 2.5, 3, 4), om.MFnNumericData.k4Double)
+
+        self.assertEqual([mp.value for mp in mp_attr.children], [1.0, 2.5, 3.0, 4.0])
+        with self.assertRaises(TypeError):
+            set_numeric(mp_attr, (1.0, 2.0), om.MFnNumericData.k4Double)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+# coding=ascii
+
+"""
+!@Brief Tests of batch retarget scheduler with stub runner. No maya needed.
+"""
+
+# ===========================================
+#    Import Modules
+# ===========================================
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import unittest
+import subprocess
+
+from . import mayaStub
+
+
+S_MODULE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Rig", "batchRetarget.py")
+
+batchRetarget = mayaStub.load_source("_test_batchRetarget", S_MODULE)
+
+
+# ===========================================
+#    Helpers
+# ===========================================
+
+def _job(s_source):
+
+    """
+    !@Brief Build job of one clip.
+
+    @rtype: batchRetarget.Job
+    @return: Job.
+    """
+
+    return batchRetarget.Job(s_source, s_source.replace(".fbx", "_rt.fbx"), "rig.ma", "SRC:Hips", "Hips")
+
+
+# ===========================================
+#    Tests
+# ===========================================
+
+class ManifestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.s_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.s_dir)
+
+    def _write(self, d_manifest):
+        s_path = os.path.join(self.s_dir, "manifest.json")
+        with open(s_path, "w") as f:
+            json.dump(d_manifest, f)
+        return s_path
+
+    def test_defaults(self):
+        s_path = self._write({
+            "rig": "rig.ma", "driver_root": "SRC:Hips", "driven_root": "Hips",
+            "mapping": {"Spine": "spine_01"}, "clips": ["/clips/walk.fbx"]
+        })
+
+        a_jobs = batchRetarget.load_manifest(s_path)
+
+        self.assertEqual(len(a_jobs), 1)
+        self.assertEqual(a_jobs[0].source, "/clips/walk.fbx")
+        self.assertEqual(a_jobs[0].output, os.path.join(self.s_dir, "walk.fbx"))
+        self.assertEqual(a_jobs[0].mapping, {"Spine": "spine_01"})
+        self.assertTrue(a_jobs[0].b_constraint)
+
+    def test_clip_override(self):
+        s_path = self._write({
+            "rig": "rig.ma", "driver_root": "SRC:Hips", "driven_root": "Hips", "output_dir": "/export",
+            "clips": ["/clips/walk.fbx", {"source": "/clips/run.fbx", "output": "/out/run_rt.fbx", "rig": "other.ma", "b_constraint": False}]
+        })
+
+        a_jobs = batchRetarget.load_manifest(s_path)
+
+        self.assertEqual(a_jobs[0].output, os.path.join("/export", "walk.fbx"))
+        self.assertEqual(a_jobs[1].output, "/out/run_rt.fbx")
+        self.assertEqual(a_jobs[1].rig, "other.ma")
+        self.assertFalse(a_jobs[1].b_constraint)
+
+    def test_missing_key(self):
+        s_path = self._write({"rig": "rig.ma", "driver_root": "SRC:Hips", "clips": []})
+
+        with self.assertRaises(RuntimeError):
+            batchRetarget.load_manifest(s_path)
+
+    def test_job_round_trip(self):
+        job = _job("/clips/walk.fbx")
+
+        self.assertEqual(batchRetarget.Job.from_dict(job.to_dict()).to_dict(), job.to_dict())
+
+
+class RunTest(unittest.TestCase):
+
+    def test_succeeded(self):
+        a_jobs = [_job("/clips/clip_{0}.fbx".format(i)) for i in range(6)]
+
+        d_summary = batchRetarget.run(a_jobs, runner=batchRetarget.stub_runner(), i_workers=3, i_retries=0)
+
+        self.assertEqual((d_summary["succeeded"], d_summary["failed"]), (6, 0))
+        self.assertEqual([d["source"] for d in d_summary["jobs"]], [job.source for job in a_jobs])
+        self.assertEqual(d_summary["jobs"][0]["worker"], {"output": a_jobs[0].output, "stub": True})
+
+    def test_retry(self):
+        runner = batchRetarget.stub_runner(d_failures={"/clips/a.fbx": 1, "/clips/b.fbx": 3})
+
+        d_summary = batchRetarget.run([_job("/clips/a.fbx"), _job("/clips/b.fbx")], runner=runner, i_workers=2, i_retries=2)
+        d_a, d_b = d_summary["jobs"]
+
+        self.assertEqual((d_a["status"], d_a["attempts"], len(d_a["errors"])), ("succeeded", 2, 1))
+        self.assertEqual((d_b["status"], d_b["attempts"], len(d_b["errors"])), ("failed", 3, 3))
+        self.assertEqual((d_summary["succeeded"], d_summary["failed"]), (1, 1))
+
+    def test_workers_parallel(self):
+        a_jobs = [_job("/clips/clip_{0}.fbx".format(i)) for i in range(4)]
+
+        d_summary = batchRetarget.run(a_jobs, runner=batchRetarget.stub_runner(f_duration=0.2), i_workers=4, i_retries=0)
+
+        self.assertEqual(d_summary["workers"], 4)
+        self.assertLess(d_summary["duration"], 0.7)
+
+    def test_report(self):
+        s_dir = tempfile.mkdtemp()
+        try:
+            s_report = os.path.join(s_dir, "report.json")
+            batchRetarget.run([_job("/clips/a.fbx")], runner=batchRetarget.stub_runner(), i_workers=1, s_report=s_report)
+            with open(s_report, "r") as f:
+                d_report = json.load(f)
+        finally:
+            shutil.rmtree(s_dir)
+
+        self.assertEqual(d_report["succeeded"], 1)
+        self.assertEqual(d_report["jobs"][0]["source"], "/clips/a.fbx")
+
+
+class CommunicateTest(unittest.TestCase):
+
+    def _process(self, s_code):
+        return subprocess.Popen([sys.executable, "-c", s_code], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+    def test_large_output(self):
+        #   More than pipe buffer before result line, process blocks if pipe is not drained
+        process = self._process("import sys; sys.stdout.write('x' * 1000000 + '\\nBATCH_RESULT:{}\\n')")
+
+        s_output = getattr(batchRetarget, "_communicate")(process, f_timeout=30.0)
+
+        self.assertEqual(process.returncode, 0)
+        self.assertEqual(s_output.splitlines()[-1], "BATCH_RESULT:{}")
+
+    def test_timeout(self):
+        process = self._process("import time; time.sleep(30)")
+
+        with self.assertRaises(RuntimeError):
+            getattr(batchRetarget, "_communicate")(process, f_timeout=0.2)
+        self.assertIsNotNone(process.poll())
+
+
+if __name__ == "__main__":
+    unittest.main()
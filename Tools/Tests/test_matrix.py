@@ -0,0 +1,100 @@
+# coding=ascii
+
+"""
+!@Brief Tests of matrix stack numpy conversions on stand-in maya.
+"""
+
+# ===========================================
+#    Import Modules
+# ===========================================
+
+import math
+import unittest
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from . import mayaStub
+
+om = mayaStub.install()
+matrix = mayaStub.load_core("matrix")
+
+
+# ===========================================
+#    Tests
+# ===========================================
+
+@unittest.skipIf(numpy is None, "numpy not installed")
+class StackTest(unittest.TestCase):
+
+    def test_to_stack_view(self):
+        a_flat = numpy.arange(32, dtype=numpy.float64).reshape(2, 16)
+
+        a_stack = matrix.to_stack(a_flat)
+
+        self.assertEqual(a_stack.shape, (2, 4, 4))
+        self.assertTrue(numpy.shares_memory(a_stack, a_flat))
+
+    def test_to_stack_rows(self):
+        a_rows = [[1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0], [1.0, 2.0, 3.0, 1.0]]
+
+        a_stack = matrix.to_stack([a_rows, a_rows])
+        a_flat = matrix.to_stack([[f for a_row in a_rows for f in a_row]])
+
+        self.assertEqual(a_stack.shape, (2, 4, 4))
+        self.assertTrue(numpy.array_equal(a_flat[0], a_stack[0]))
+        self.assertEqual(matrix.translation_many(a_stack).tolist(), [[1.0, 2.0, 3.0], [1.0, 2.0, 3.0]])
+
+    def test_remove_scale(self):
+        a_stack = matrix.euler_to_matrix([(0.3, -0.2, 1.1)], a_translates=[(1.0, 2.0, 3.0)])
+        a_scaled = a_stack.copy()
+        a_scaled[:, :3, :3] *= numpy.array([2.0, 0.5, 3.0])[None, :, None]
+
+        a_result = matrix.remove_scale_many(a_scaled)
+
+        self.assertTrue(numpy.allclose(a_result, a_stack))
+        self.assertFalse(numpy.allclose(a_scaled, a_stack))
+
+
+@unittest.skipIf(numpy is None, "numpy not installed")
+class EulerTest(unittest.TestCase):
+
+    def test_axis(self):
+        #   Row vector: rotate 90 degrees on X send Y axis to Z
+        a_stack = matrix.euler_to_matrix([(math.pi * 0.5, 0.0, 0.0)])
+
+        self.assertTrue(numpy.allclose(a_stack[0, 1, :3], [0.0, 0.0, 1.0]))
+        self.assertTrue(numpy.allclose(a_stack[0, 2, :3], [0.0, -1.0, 0.0]))
+
+    def test_order(self):
+        #   xyz rotate X first: X * Y * Z with row vectors
+        f_x, f_y = 0.4, 0.7
+        a_x = matrix.euler_to_matrix([(f_x, 0.0, 0.0)])
+        a_y = matrix.euler_to_matrix([(0.0, f_y, 0.0)])
+
+        self.assertTrue(numpy.allclose(matrix.euler_to_matrix([(f_x, f_y, 0.0)], a_orders=0), matrix.multiply_many(a_x, a_y)))
+        self.assertTrue(numpy.allclose(matrix.euler_to_matrix([(f_x, f_y, 0.0)], a_orders=4), matrix.multiply_many(a_y, a_x)))
+
+    def test_round_trip(self):
+        a_random = numpy.random.RandomState(0)
+        a_eulers = a_random.uniform(-1.4, 1.4, (60, 3))
+        a_orders = numpy.arange(60) % 6
+
+        a_stack = matrix.euler_to_matrix(a_eulers, a_orders=a_orders, a_translates=a_random.uniform(-5.0, 5.0, (60, 3)))
+
+        self.assertTrue(numpy.allclose(matrix.matrix_to_euler(a_stack, a_orders=a_orders), a_eulers))
+
+    def test_gimbal(self):
+        a_eulers = numpy.array([(0.3, math.pi * 0.5, 0.2), (0.3, -math.pi * 0.5, 0.2)])
+
+        for i_order in range(6):
+            a_stack = matrix.euler_to_matrix(a_eulers, a_orders=i_order)
+            a_result = matrix.matrix_to_euler(a_stack, a_orders=i_order)
+
+            self.assertTrue(numpy.allclose(matrix.euler_to_matrix(a_result, a_orders=i_order), a_stack))
+
+
+if __name__ == "__main__":
+    unittest.main()